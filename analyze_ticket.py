@@ -78,6 +78,185 @@ Examples:
         help='URLs to Confluence documentation pages (space-separated)'
     )
 
+    parser.add_argument(
+        '--follow-links',
+        action='store_true',
+        help="Also fetch every ticket in the main ticket's issue links"
+    )
+
+    parser.add_argument(
+        '--discover',
+        action='store_true',
+        help='Also fetch the MRs, Confluence pages and Jira tickets referenced by the main ticket'
+    )
+
+    parser.add_argument(
+        '--find-mrs',
+        action='store_true',
+        help='Also fetch the GitLab MRs that mention the ticket key'
+    )
+
+    parser.add_argument(
+        '--crawl-depth',
+        type=int,
+        metavar='N',
+        help='Crawl the Jira link graph up to N links away from the main ticket'
+    )
+
+    parser.add_argument(
+        '--crawl-max-nodes',
+        type=int,
+        metavar='N',
+        help='Maximum number of tickets collected by the link graph crawl'
+    )
+
+    parser.add_argument(
+        '--crawl-link-types',
+        metavar='TYPES',
+        help='Comma-separated link types to follow while crawling'
+    )
+
+    parser.add_argument(
+        '--children',
+        action='store_true',
+        help='Include all child issues of the main ticket (epic issues and their subtasks)'
+    )
+
+    parser.add_argument(
+        '--children-depth',
+        type=int,
+        metavar='N',
+        help='Child levels to expand with --children'
+    )
+
+    parser.add_argument(
+        '--max-children',
+        type=int,
+        metavar='N',
+        help='Maximum number of child issues included with --children'
+    )
+
+    parser.add_argument(
+        '--from-store',
+        action='store_true',
+        help='Read Jira tickets from the local issue store when present'
+    )
+
+    parser.add_argument(
+        '--similar',
+        type=int,
+        metavar='K',
+        help='Add the K most similar tickets from the local issue store'
+    )
+
+    parser.add_argument(
+        '--comments-since',
+        metavar='DATE',
+        help='Only include Jira comments created on or after this date'
+    )
+
+    parser.add_argument(
+        '--max-comments',
+        type=int,
+        metavar='N',
+        help='Only include the newest N comments of each Jira ticket'
+    )
+
+    parser.add_argument(
+        '--lazy-diffs',
+        action='store_true',
+        help='Download only the MR file diffs included in the prompt'
+    )
+
+    parser.add_argument(
+        '--git-mirror',
+        action='store_true',
+        help='Compute MR diffs from local bare git mirrors'
+    )
+
+    parser.add_argument(
+        '--file-context',
+        type=int,
+        metavar='N',
+        help='Add up to N lines of file context around each MR diff hunk'
+    )
+
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Re-analyze previously analyzed MRs incrementally'
+    )
+
+    parser.add_argument(
+        '--pipeline',
+        action='store_true',
+        help="Include each MR's head pipeline status, tests and failing job logs"
+    )
+
+    parser.add_argument(
+        '--lean',
+        action='store_true',
+        help='Request only the Jira fields used in the analysis'
+    )
+
+    parser.add_argument(
+        '--jira-fields',
+        nargs='+',
+        metavar='FIELD_SET',
+        help='Named Jira field sets to add to the lean projection (implies --lean)'
+    )
+
+    parser.add_argument(
+        '--full-data',
+        action='store_true',
+        help='Keep the raw Jira issue as full_data in lean mode'
+    )
+
+    parser.add_argument(
+        '--concurrent',
+        action='store_true',
+        help='Fetch tickets, merge requests and pages in parallel'
+    )
+
+    parser.add_argument(
+        '--max-workers',
+        type=int,
+        help='Maximum number of parallel fetches with --concurrent'
+    )
+
+    parser.add_argument(
+        '--async',
+        dest='use_async',
+        action='store_true',
+        help='Fetch all sources concurrently with the asyncio clients'
+    )
+
+    cache_mode = parser.add_mutually_exclusive_group()
+
+    cache_mode.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Bypass the on-disk response cache'
+    )
+
+    cache_mode.add_argument(
+        '--revalidate',
+        action='store_true',
+        help='Check every cached response with a cheap freshness probe before reusing it'
+    )
+
+    cache_mode.add_argument(
+        '--refresh-cache',
+        action='store_true',
+        help='Re-download everything and overwrite the cached responses'
+    )
+
+    parser.add_argument(
+        '--cache-stats',
+        action='store_true',
+        help='Print cache hit/miss statistics after fetching'
+    )
+
     parser.add_argument(
         '--format',
         choices=['text', 'json'],
@@ -133,6 +312,90 @@ def main():
     if args.confluence:
         cmd.extend(["--confluence"] + args.confluence)
 
+    if args.follow_links:
+        cmd.append("--follow-links")
+
+    if args.discover:
+        cmd.append("--discover")
+
+    if args.find_mrs:
+        cmd.append("--find-mrs")
+
+    if args.crawl_depth is not None:
+        cmd.extend(["--crawl-depth", str(args.crawl_depth)])
+
+    if args.crawl_max_nodes is not None:
+        cmd.extend(["--crawl-max-nodes", str(args.crawl_max_nodes)])
+
+    if args.crawl_link_types:
+        cmd.extend(["--crawl-link-types", args.crawl_link_types])
+
+    if args.children:
+        cmd.append("--children")
+
+    if args.children_depth is not None:
+        cmd.extend(["--children-depth", str(args.children_depth)])
+
+    if args.max_children is not None:
+        cmd.extend(["--max-children", str(args.max_children)])
+
+    if args.from_store:
+        cmd.append("--from-store")
+
+    if args.similar:
+        cmd.extend(["--similar", str(args.similar)])
+
+    if args.comments_since:
+        cmd.extend(["--comments-since", args.comments_since])
+
+    if args.max_comments is not None:
+        cmd.extend(["--max-comments", str(args.max_comments)])
+
+    if args.lazy_diffs:
+        cmd.append("--lazy-diffs")
+
+    if args.git_mirror:
+        cmd.append("--git-mirror")
+
+    if args.file_context:
+        cmd.extend(["--file-context", str(args.file_context)])
+
+    if args.incremental:
+        cmd.append("--incremental")
+
+    if args.pipeline:
+        cmd.append("--pipeline")
+
+    if args.lean:
+        cmd.append("--lean")
+
+    if args.jira_fields:
+        cmd.extend(["--jira-fields"] + args.jira_fields)
+
+    if args.full_data:
+        cmd.append("--full-data")
+
+    if args.concurrent:
+        cmd.append("--concurrent")
+
+    if args.max_workers:
+        cmd.extend(["--max-workers", str(args.max_workers)])
+
+    if args.use_async:
+        cmd.append("--async")
+
+    if args.no_cache:
+        cmd.append("--no-cache")
+
+    if args.revalidate:
+        cmd.append("--revalidate")
+
+    if args.refresh_cache:
+        cmd.append("--refresh-cache")
+
+    if args.cache_stats:
+        cmd.append("--cache-stats")
+
     # Execute the analysis
     try:
         result = subprocess.run(cmd, check=True)
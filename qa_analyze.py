@@ -10,11 +10,23 @@ Usage:
 """
 
 import argparse
+import os
 import sys
 import json
 from typing import List
 from src.config import Config
-from src.analyzer import QAAnalyzer
+from src.analyzer import QAAnalyzer, MAX_RENDERED_MR_FILES
+from src.jira_client import JiraClient
+from src.gitlab_client import GitLabClient
+from src.confluence_client import ConfluenceClient
+from src.git_mirror import GitMirror
+from src.blob_cache import BlobCache
+from src.mr_state import MergeRequestStateStore
+from src.pipeline_cache import PipelineCache
+from src.http_transport import HTTPTransport
+from src.response_cache import ResponseCache
+from src.issue_store import IssueStore
+from src.ticket_similarity import TicketSimilarity
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -46,8 +58,7 @@ Examples:
 
     parser.add_argument(
         '--jira',
-        required=True,
-        help='URL to the main Jira ticket'
+        help='URL to the main Jira ticket (required unless inspecting the cache)'
     )
 
     parser.add_argument(
@@ -68,6 +79,164 @@ Examples:
         help='URLs to Confluence documentation pages (space-separated)'
     )
 
+    parser.add_argument(
+        '--follow-links',
+        action='store_true',
+        help="Also fetch every ticket in the main ticket's issue links (one batched search)"
+    )
+
+    parser.add_argument(
+        '--discover',
+        action='store_true',
+        help='Also fetch the MRs, Confluence pages and Jira tickets referenced by the main ticket'
+    )
+
+    parser.add_argument(
+        '--find-mrs',
+        action='store_true',
+        help='Also fetch the GitLab merge requests that mention the ticket key (searches GITLAB_GROUPS)'
+    )
+
+    parser.add_argument(
+        '--crawl-depth',
+        type=int,
+        default=0,
+        metavar='N',
+        help='Crawl the Jira link graph up to N links away from the main ticket (default: off)'
+    )
+
+    parser.add_argument(
+        '--crawl-max-nodes',
+        type=int,
+        default=50,
+        metavar='N',
+        help='Maximum number of tickets collected by the link graph crawl (default: 50)'
+    )
+
+    parser.add_argument(
+        '--crawl-link-types',
+        metavar='TYPES',
+        help='Comma-separated link types to follow while crawling (e.g. "blocks,relates to")'
+    )
+
+    parser.add_argument(
+        '--children',
+        action='store_true',
+        help='Include all child issues of the main ticket (epic issues and their subtasks)'
+    )
+
+    parser.add_argument(
+        '--children-depth',
+        type=int,
+        default=2,
+        metavar='N',
+        help='Child levels to expand with --children: 1 for children only, 2 to add subtasks (default: 2)'
+    )
+
+    parser.add_argument(
+        '--max-children',
+        type=int,
+        default=200,
+        metavar='N',
+        help='Maximum number of child issues included with --children (default: 200)'
+    )
+
+    parser.add_argument(
+        '--from-store',
+        action='store_true',
+        help='Read Jira tickets and comments from the local issue store (see sync_issues.py) when present'
+    )
+
+    parser.add_argument(
+        '--similar',
+        type=int,
+        default=0,
+        metavar='K',
+        help='Add the K most similar tickets from the local issue store to the prompt'
+    )
+
+    parser.add_argument(
+        '--comments-since',
+        metavar='DATE',
+        help='Only include Jira comments created on or after this ISO date/time (e.g. 2024-01-31)'
+    )
+
+    parser.add_argument(
+        '--max-comments',
+        type=int,
+        metavar='N',
+        help='Only include the newest N comments of each Jira ticket'
+    )
+
+    parser.add_argument(
+        '--lazy-diffs',
+        action='store_true',
+        help='Download only the MR file diffs included in the prompt, page by page'
+    )
+
+    parser.add_argument(
+        '--git-mirror',
+        action='store_true',
+        help='Compute MR diffs from local bare git mirrors (see GIT_MIRROR_* settings)'
+    )
+
+    parser.add_argument(
+        '--file-context',
+        type=int,
+        metavar='N',
+        help='Add up to N lines of surrounding file context (the enclosing block) around each MR diff hunk'
+    )
+
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Re-analyze previously analyzed MRs incrementally and mark what changed since then'
+    )
+
+    parser.add_argument(
+        '--pipeline',
+        action='store_true',
+        help="Include each MR's head pipeline: job results, test report and the log tails of failing jobs"
+    )
+
+    parser.add_argument(
+        '--lean',
+        action='store_true',
+        help='Request only the Jira fields used in the analysis and drop raw full_data'
+    )
+
+    parser.add_argument(
+        '--jira-fields',
+        nargs='+',
+        metavar='FIELD_SET',
+        help='Named Jira field sets to add to the lean projection (implies --lean)'
+    )
+
+    parser.add_argument(
+        '--full-data',
+        action='store_true',
+        help='Keep the raw Jira issue as full_data in lean mode'
+    )
+
+    parser.add_argument(
+        '--concurrent',
+        action='store_true',
+        help='Fetch tickets, merge requests and pages in parallel'
+    )
+
+    parser.add_argument(
+        '--max-workers',
+        type=int,
+        help='Maximum number of parallel fetches with --concurrent (default: FETCH_MAX_WORKERS or 8)'
+    )
+
+    parser.add_argument(
+        '--async',
+        dest='use_async',
+        action='store_true',
+        help='Fetch all sources concurrently with the asyncio clients (basic fetches only, no response cache)'
+    )
+
     parser.add_argument(
         '--output',
         '-o',
@@ -81,13 +250,96 @@ Examples:
         help='Output format: text for Claude prompt, json for raw data (default: text)'
     )
 
-    return parser.parse_args()
+    cache_group = parser.add_argument_group('response cache')
+    cache_mode = cache_group.add_mutually_exclusive_group()
+
+    cache_mode.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Bypass the on-disk response cache (neither read nor write)'
+    )
+
+    cache_mode.add_argument(
+        '--revalidate',
+        action='store_true',
+        help='Check every cached response with a cheap freshness probe before reusing it'
+    )
+
+    cache_mode.add_argument(
+        '--refresh-cache',
+        action='store_true',
+        help='Re-download everything and overwrite the cached responses'
+    )
+
+    cache_group.add_argument(
+        '--cache-stats',
+        action='store_true',
+        help='Print cache hit/miss statistics after fetching'
+    )
+
+    cache_group.add_argument(
+        '--cache-info',
+        action='store_true',
+        help='Print a summary of the response cache and exit'
+    )
+
+    cache_group.add_argument(
+        '--clear-cache',
+        action='store_true',
+        help='Delete all cached responses and exit'
+    )
+
+    args = parser.parse_args()
+    if not args.jira and not (args.cache_info or args.clear_cache):
+        parser.error('the following arguments are required: --jira')
+    if args.use_async:
+        # The asyncio clients only implement the basic fetches
+        unsupported = [flag for flag, enabled in (
+            ('--follow-links', args.follow_links),
+            ('--discover', args.discover),
+            ('--from-store', args.from_store),
+            ('--comments-since', args.comments_since),
+            ('--max-comments', args.max_comments),
+            ('--lazy-diffs', args.lazy_diffs),
+            ('--git-mirror', args.git_mirror),
+            ('--file-context', args.file_context),
+            ('--incremental', args.incremental),
+            ('--pipeline', args.pipeline),
+            ('--lean', args.lean),
+            ('--jira-fields', args.jira_fields),
+            ('--revalidate', args.revalidate),
+            ('--refresh-cache', args.refresh_cache)
+        ) if enabled]
+        if unsupported:
+            parser.error(f"--async cannot be combined with {', '.join(unsupported)}")
+    return args
+
+
+def print_cache_info(cache: ResponseCache):
+    """Print a summary of the response cache contents."""
+    info = cache.info()
+    print(f"Cache file: {info['path']}")
+    print(f"Entries: {info['entries']}")
+    print(f"Size: {info['bytes'] / 1024 / 1024:.1f} MB of {info['max_bytes'] / 1024 / 1024:.0f} MB")
+    for source, ttl in info['ttls'].items():
+        stats = info['sources'].get(source, {'entries': 0, 'bytes': 0, 'fresh': 0})
+        print(f"  {source}: {stats['entries']} entries ({stats['fresh']} fresh), "
+              f"{stats['bytes'] / 1024:.0f} KB, TTL {ttl}s")
 
 
 def main():
     """Main execution function."""
     args = parse_arguments()
 
+    if args.cache_info or args.clear_cache:
+        cache = ResponseCache()
+        if args.clear_cache:
+            cache.clear()
+            print(f"Cleared response cache: {cache.path}")
+        if args.cache_info:
+            print_cache_info(cache)
+        return
+
     # Validate configuration
     is_valid, missing = Config.validate()
     if not is_valid:
@@ -110,8 +362,50 @@ def main():
 
     print("\n" + "=" * 80)
 
-    # Initialize analyzer
-    analyzer = QAAnalyzer()
+    # Initialize analyzer with a cached, pooled transport
+    cache = None if args.no_cache else ResponseCache()
+    if args.refresh_cache:
+        cache_mode = ResponseCache.MODE_REFRESH
+    elif args.revalidate:
+        cache_mode = ResponseCache.MODE_REVALIDATE
+    else:
+        cache_mode = ResponseCache.MODE_USE
+    transport = HTTPTransport(cache=cache, cache_mode=cache_mode)
+    try:
+        jira_client = JiraClient(
+            transport=transport,
+            lean=args.lean,
+            field_sets=args.jira_fields,
+            include_full_data=True if args.full_data else None,
+            comments_since=args.comments_since,
+            max_comments=args.max_comments,
+            store=IssueStore() if args.from_store else None
+        )
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+    gitlab_client = GitLabClient(
+        transport=transport,
+        max_diff_files=MAX_RENDERED_MR_FILES if args.lazy_diffs else None,
+        mirror=GitMirror() if args.git_mirror else None,
+        blob_cache=BlobCache() if args.file_context and not args.no_cache else None,
+        context_lines=args.file_context,
+        context_files=MAX_RENDERED_MR_FILES,
+        project_index_path=None if args.no_cache else os.path.join(Config.QA_CACHE_DIR, 'gitlab_projects.json'),
+        state_store=MergeRequestStateStore() if args.incremental else None,
+        pipelines=args.pipeline,
+        pipeline_cache=PipelineCache() if args.pipeline and not args.no_cache else None
+    )
+    confluence_client = ConfluenceClient(
+        transport=transport,
+        page_index_path=None if args.no_cache else os.path.join(Config.QA_CACHE_DIR, 'confluence_pages.json')
+    )
+    analyzer = QAAnalyzer(
+        transport=transport,
+        jira_client=jira_client,
+        gitlab_client=gitlab_client,
+        confluence_client=confluence_client
+    )
 
     # Fetch all data
     try:
@@ -119,15 +413,40 @@ def main():
             jira_ticket_url=args.jira,
             linked_ticket_urls=args.linked,
             merge_request_urls=args.mr,
-            confluence_urls=args.confluence
+            confluence_urls=args.confluence,
+            concurrent=args.concurrent,
+            max_workers=args.max_workers,
+            use_async=args.use_async,
+            follow_links=args.follow_links,
+            link_graph={
+                'max_depth': args.crawl_depth,
+                'max_nodes': args.crawl_max_nodes,
+                'link_types': args.crawl_link_types.split(',') if args.crawl_link_types else None
+            } if args.crawl_depth > 0 else None,
+            children={
+                'max_depth': args.children_depth,
+                'max_children': args.max_children
+            } if args.children else None,
+            discover=args.discover,
+            find_mrs=args.find_mrs
         )
     except Exception as e:
         print(f"\nERROR: Failed to fetch data: {e}", file=sys.stderr)
         sys.exit(1)
 
+    if args.similar > 0 and data['main_ticket']:
+        similar = analyzer.find_similar_tickets(
+            data, TicketSimilarity(jira_client.store or IssueStore()), args.similar
+        )
+        print(f"Similar tickets from the issue store: {', '.join(t['ticket_key'] for t in similar) or 'none'}")
+
     print("=" * 80)
     print("\nData fetching completed!\n")
 
+    if args.cache_stats:
+        print(cache.format_stats() if cache else "Cache: disabled (--no-cache)")
+        print()
+
     # Format output based on requested format
     if args.format == 'json':
         output = json.dumps(data, indent=2, default=str)
@@ -1,85 +1,652 @@
 """
 QA Analysis orchestrator that fetches and analyzes data from Jira, GitLab, and Confluence.
 """
-from typing import Dict, List, Any
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple, TYPE_CHECKING
+from src.config import Config
+from src.discovery import DiscoveredReferences, MAX_DISCOVERED_TICKETS
+from src.http_transport import HTTPTransport
 from src.jira_client import JiraClient
-from src.gitlab_client import GitLabClient
+from src.gitlab_client import GitLabClient, patch_id, commit_fingerprint
 from src.confluence_client import ConfluenceClient
+from src.storage_format import storage_to_markdown
+
+if TYPE_CHECKING:
+    from src.async_transport import AsyncHTTPTransport
+    from src.ticket_similarity import TicketSimilarity
+
+
+# Number of changed files, and characters of each diff, rendered per merge request
+MAX_RENDERED_MR_FILES = 10
+MAX_RENDERED_DIFF_CHARS = 1000
 
 
 class QAAnalyzer:
     """Main analyzer class for QA ticket analysis."""
 
-    def __init__(self):
-        self.jira_client = JiraClient()
-        self.gitlab_client = GitLabClient()
-        self.confluence_client = ConfluenceClient()
+    def __init__(
+        self,
+        transport: Optional[HTTPTransport] = None,
+        async_transport: Optional['AsyncHTTPTransport'] = None,
+        jira_client: Optional[JiraClient] = None,
+        gitlab_client: Optional[GitLabClient] = None,
+        confluence_client: Optional[ConfluenceClient] = None
+    ):
+        """
+        Initialize the analyzer.
+
+        Args:
+            transport: Shared HTTP transport reused by all clients (created if omitted)
+            async_transport: Shared async transport for fetch_all_data_async
+                (a per-call transport is used if omitted)
+            jira_client: Preconfigured Jira client, e.g. in lean field mode
+                (created on the shared transport if omitted)
+            gitlab_client: Preconfigured GitLab client, e.g. with lazy diffs
+                (created on the shared transport if omitted)
+            confluence_client: Preconfigured Confluence client, e.g. with a persistent
+                page index (created on the shared transport if omitted)
+        """
+        self.transport = transport or HTTPTransport()
+        self.async_transport = async_transport
+        self.jira_client = jira_client or JiraClient(transport=self.transport)
+        self.gitlab_client = gitlab_client or GitLabClient(transport=self.transport)
+        self.confluence_client = confluence_client or ConfluenceClient(transport=self.transport)
 
     def fetch_all_data(
         self,
         jira_ticket_url: str,
         linked_ticket_urls: List[str] = None,
         merge_request_urls: List[str] = None,
-        confluence_urls: List[str] = None
+        confluence_urls: List[str] = None,
+        concurrent: bool = False,
+        max_workers: Optional[int] = None,
+        use_async: bool = False,
+        follow_links: bool = False,
+        link_graph: Optional[Dict[str, Any]] = None,
+        children: Optional[Dict[str, Any]] = None,
+        discover: bool = False,
+        find_mrs: bool = False
     ) -> Dict[str, Any]:
         """
         Fetch all data from Jira, GitLab, and Confluence.
 
+        Linked tickets are fetched with one batched JQL search rather than one
+        request per ticket.
+
         Args:
             jira_ticket_url: URL to main Jira ticket
             linked_ticket_urls: List of URLs to linked Jira tickets
             merge_request_urls: List of URLs to GitLab merge requests
             confluence_urls: List of URLs to Confluence pages
+            concurrent: Fetch independent requests in parallel across and within sources
+            max_workers: Maximum number of parallel fetches (default: Config.FETCH_MAX_WORKERS)
+            use_async: Run fetch_all_data_async in a new event loop instead (the link graph
+                crawl and children expansion then run afterwards; follow_links and discover
+                are not supported)
+            follow_links: Also fetch every ticket in the main ticket's issue links
+            link_graph: Crawl the main ticket's link graph, passing these keyword
+                arguments to JiraClient.crawl_link_graph (max_depth, max_nodes, link_types...)
+            children: Expand the main ticket's child issues and subtasks, passing these
+                keyword arguments to JiraClient.get_children_analysis_data (max_depth, max_children)
+            discover: Also fetch the merge requests, Confluence pages and Jira tickets referenced
+                by the main ticket's text, remote links and development panel
+            find_mrs: Also fetch the merge requests that mention the main ticket's key,
+                found with a GitLab search across GITLAB_GROUPS
 
         Returns:
             Dictionary containing all fetched data organized by source
         """
+        if find_mrs:
+            merge_request_urls = list(merge_request_urls or []) + self._find_merge_request_urls(
+                jira_ticket_url, merge_request_urls or [], concurrent
+            )
+
+        if use_async:
+            if follow_links or discover:
+                raise ValueError("follow_links and discover are not supported with use_async")
+            data = asyncio.run(self.fetch_all_data_async(
+                jira_ticket_url, linked_ticket_urls, merge_request_urls, confluence_urls
+            ))
+            data.update(link_graph=None, children=None, discovered=None)
+            # Crawls start from the main ticket, so they run once it is fetched
+            if link_graph is not None:
+                data['link_graph'] = self._crawl_link_graph(data['main_ticket'], link_graph, concurrent)
+            if children is not None:
+                data['children'] = self._expand_children(data['main_ticket'], children, concurrent)
+            return data
+
         data = {
             'main_ticket': None,
             'linked_tickets': [],
             'merge_requests': [],
-            'documentation': []
+            'documentation': [],
+            'link_graph': None,
+            'children': None,
+            'discovered': None
         }
 
+        sources = [
+            ('merge_requests', 'merge request', list(merge_request_urls or []),
+             self.gitlab_client.get_merge_request_analysis_data),
+            ('documentation', 'Confluence page', list(confluence_urls or []),
+             self.confluence_client.get_page_analysis_data)
+        ]
+
+        if concurrent:
+            self._fetch_all_data_concurrently(
+                data, jira_ticket_url, linked_ticket_urls or [], sources, max_workers, follow_links, discover
+            )
+            if link_graph is not None:
+                data['link_graph'] = self._crawl_link_graph(data['main_ticket'], link_graph, True)
+            if children is not None:
+                data['children'] = self._expand_children(data['main_ticket'], children, True)
+            return data
+
         # Fetch main Jira ticket
         print(f"Fetching main Jira ticket: {jira_ticket_url}")
         data['main_ticket'] = self.jira_client.get_ticket_analysis_data(jira_ticket_url)
 
-        # Fetch linked tickets
-        if linked_ticket_urls:
-            for url in linked_ticket_urls:
-                print(f"Fetching linked ticket: {url}")
+        # Fetch linked tickets in one batch
+        linked_urls = list(linked_ticket_urls or [])
+        if follow_links:
+            linked_urls += self._issue_link_urls(data['main_ticket'], linked_urls)
+        data['linked_tickets'] = self._fetch_linked_tickets(linked_urls)
+
+        # Discover referenced merge requests, pages and tickets
+        if discover:
+            ticket_key = data['main_ticket']['ticket_key']
+            discovered = {'merge_requests': [], 'documentation': [], 'jira_keys': []}
+            references = self._iter_discovered_references(
+                ticket_key,
+                lambda: self.jira_client.get_ticket(ticket_key),
+                lambda: data['main_ticket'],
+                self._run_now
+            )
+            for section, reference in references:
+                if not self._is_known_reference(section, reference, data, sources):
+                    print(f"Discovered reference: {reference}")
+                    discovered[section].append(reference)
+            for section, label, urls, fetch in sources:
+                urls.extend(discovered[section])
+            tickets = self._fetch_discovered_tickets(discovered['jira_keys'])
+            discovered['jira_keys'] = [t['ticket_key'] for t in tickets if 'ticket_key' in t]
+            data['linked_tickets'] += tickets
+            data['discovered'] = discovered
+
+        # Fetch merge requests and Confluence documentation
+        for section, label, urls, fetch in sources:
+            for url in urls:
+                print(f"Fetching {label}: {url}")
                 try:
-                    ticket_data = self.jira_client.get_ticket_analysis_data(url)
-                    data['linked_tickets'].append(ticket_data)
+                    data[section].append(fetch(url))
                 except Exception as e:
-                    print(f"Error fetching linked ticket {url}: {e}")
-                    data['linked_tickets'].append({'error': str(e), 'url': url})
+                    print(f"Error fetching {label} {url}: {e}")
+                    data[section].append({'error': str(e), 'url': url})
 
-        # Fetch merge requests
-        if merge_request_urls:
-            for url in merge_request_urls:
-                print(f"Fetching merge request: {url}")
-                try:
-                    mr_data = self.gitlab_client.get_merge_request_analysis_data(url)
-                    data['merge_requests'].append(mr_data)
-                except Exception as e:
-                    print(f"Error fetching merge request {url}: {e}")
-                    data['merge_requests'].append({'error': str(e), 'url': url})
+        if link_graph is not None:
+            data['link_graph'] = self._crawl_link_graph(data['main_ticket'], link_graph)
+        if children is not None:
+            data['children'] = self._expand_children(data['main_ticket'], children)
+
+        return data
+
+    def _find_merge_request_urls(
+        self,
+        jira_ticket_url: str,
+        known_urls: List[str],
+        concurrent: bool = False
+    ) -> List[str]:
+        """
+        Search GitLab for merge requests mentioning the ticket's key.
+
+        Args:
+            jira_ticket_url: URL to main Jira ticket
+            known_urls: Merge request URLs already requested
+            concurrent: Search groups in parallel
+
+        Returns:
+            URLs of the merge requests found that are not already requested
+        """
+        ticket_key = self.jira_client.extract_ticket_key_from_url(jira_ticket_url)
+        if not ticket_key:
+            return []
+        print(f"Searching merge requests mentioning {ticket_key}")
+        try:
+            found = self.gitlab_client.find_merge_requests(ticket_key, concurrent=concurrent)
+        except Exception as e:
+            print(f"Error searching merge requests for {ticket_key}: {e}")
+            return []
+        known = {self.gitlab_client.extract_mr_info_from_url(url) for url in known_urls}
+        urls = []
+        for mr in found:
+            if (mr['project_path'], mr['iid']) not in known:
+                print(f"Found merge request: {mr['url']}")
+                urls.append(mr['url'])
+        return urls
+
+    def _crawl_link_graph(
+        self,
+        main_ticket: Dict[str, Any],
+        options: Dict[str, Any],
+        concurrent: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Crawl the main ticket's link graph, reporting failures instead of raising.
+
+        Args:
+            main_ticket: Analysis data of the main ticket
+            options: Keyword arguments for JiraClient.crawl_link_graph
+            concurrent: Fetch each level's batches in parallel
+
+        Returns:
+            Link graph dictionary, or an {'error': ...} entry
+        """
+        print(f"Crawling link graph of {main_ticket['ticket_key']}")
+        try:
+            graph = self.jira_client.crawl_link_graph(
+                main_ticket['ticket_key'], concurrent=concurrent, **options
+            )
+        except Exception as e:
+            print(f"Error crawling link graph of {main_ticket['ticket_key']}: {e}")
+            return {'error': str(e)}
+        print(f"Link graph: {len(graph['nodes'])} tickets, {len(graph['edges'])} links"
+              + (" (truncated)" if graph['truncated'] else ""))
+        return graph
+
+    def _expand_children(
+        self,
+        main_ticket: Dict[str, Any],
+        options: Dict[str, Any],
+        concurrent: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Fetch the main ticket's child issues, reporting failures instead of raising.
+
+        Args:
+            main_ticket: Analysis data of the main ticket
+            options: Keyword arguments for JiraClient.get_children_analysis_data
+            concurrent: Fetch searches and comments in parallel
+
+        Returns:
+            Children dictionary, or an {'error': ...} entry
+        """
+        print(f"Fetching child issues of {main_ticket['ticket_key']}")
+        try:
+            expansion = self.jira_client.get_children_analysis_data(
+                main_ticket['ticket_key'], concurrent=concurrent, **options
+            )
+        except Exception as e:
+            print(f"Error fetching child issues of {main_ticket['ticket_key']}: {e}")
+            return {'error': str(e)}
+        print(f"Child issues: {len(expansion['children'])}"
+              + (" (truncated)" if expansion['truncated'] else ""))
+        return expansion
+
+    @staticmethod
+    def _run_now(fn: Callable, *args: Any) -> Future:
+        """Call a function immediately and wrap its outcome in a completed future."""
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _iter_discovered_references(
+        self,
+        ticket_key: str,
+        get_issue: Callable[[], Dict[str, Any]],
+        get_main_ticket: Callable[[], Dict[str, Any]],
+        submit: Callable[..., Future]
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        Discover the main ticket's references stage by stage, yielding each new one as soon as it is known.
+
+        The description is scanned as soon as the issue arrives, while its
+        remote links and development panel are requested; comments are
+        scanned once the full ticket data is available.
 
-        # Fetch Confluence documentation
-        if confluence_urls:
-            for url in confluence_urls:
-                print(f"Fetching Confluence page: {url}")
+        Args:
+            ticket_key: Main ticket key
+            get_issue: Returns the raw issue (may block until it is fetched)
+            get_main_ticket: Returns the main ticket analysis data (may block)
+            submit: Schedules a call and returns its future (executor.submit or _run_now)
+
+        Yields:
+            ('merge_requests' | 'documentation' | 'jira_keys', URL or key) pairs
+        """
+        found = DiscoveredReferences()
+        yielded = {'merge_requests': 0, 'documentation': 0, 'jira_keys': 0}
+
+        def new_references():
+            for section, items in (('merge_requests', found.merge_requests),
+                                   ('documentation', found.confluence_pages),
+                                   ('jira_keys', found.jira_keys)):
+                while yielded[section] < len(items):
+                    yielded[section] += 1
+                    yield section, items[yielded[section] - 1]
+
+        issue = get_issue()
+        side_channels = [
+            ('remote links', submit(lambda: [link['url'] for link in self.jira_client.get_remote_links(ticket_key)])),
+            ('development panel', submit(self.jira_client.get_development_merge_requests, issue['id']))
+        ]
+        fields = issue.get('fields', {})
+        found.scan([fields.get('summary') or '', fields.get('description') or ''])
+        yield from new_references()
+
+        found.scan(comment.get('body', '') for comment in get_main_ticket()['comments'])
+        yield from new_references()
+
+        for label, future in side_channels:
+            try:
+                urls = future.result()
+            except Exception as e:
+                print(f"Could not read {label} of {ticket_key}: {e}")
+                continue
+            for url in urls:
+                found.add_url(url)
+            yield from new_references()
+
+    def _is_known_reference(
+        self,
+        section: str,
+        reference: str,
+        data: Dict[str, Any],
+        sources: List[tuple]
+    ) -> bool:
+        """Check whether a discovered reference is the main ticket or already requested."""
+        if section == 'jira_keys':
+            known = {data['main_ticket']['ticket_key'].upper()}
+            known.update(t['ticket_key'].upper() for t in data['linked_tickets'] if 'ticket_key' in t)
+            return reference.upper() in known
+        if section == 'merge_requests':
+            normalize = self.gitlab_client.extract_mr_info_from_url
+        else:
+            normalize = lambda url: self.confluence_client.extract_page_id_from_url(url) or url
+        urls = next(urls for name, _, urls, _ in sources if name == section)
+        return normalize(reference) in {normalize(url) for url in urls}
+
+    def _fetch_discovered_tickets(self, ticket_keys: List[str], concurrent: bool = False) -> List[Dict[str, Any]]:
+        """
+        Fetch the existing tickets among discovered Jira keys.
+
+        Keys that are not Jira issues (e.g. "UTF-8") are dropped silently.
+
+        Args:
+            ticket_keys: Discovered Jira keys
+            concurrent: Fetch the tickets' comments in parallel
+
+        Returns:
+            List of ticket analysis data
+        """
+        if not ticket_keys:
+            return []
+        try:
+            found = self.jira_client.get_tickets(ticket_keys[:MAX_DISCOVERED_TICKETS])
+        except Exception as e:
+            print(f"Error fetching discovered tickets: {e}")
+            return []
+        urls = [f"{self.jira_client.base_url}/browse/{key}" for key in ticket_keys if key.upper() in found]
+        return self._fetch_linked_tickets(urls[:MAX_DISCOVERED_TICKETS], concurrent)
+
+    def _issue_link_urls(self, main_ticket: Dict[str, Any], known_urls: List[str]) -> List[str]:
+        """
+        Build browse URLs for the main ticket's issue links that were not passed explicitly.
+
+        Args:
+            main_ticket: Analysis data of the main ticket
+            known_urls: Linked ticket URLs already requested
+
+        Returns:
+            List of additional ticket URLs
+        """
+        known_keys = {
+            (self.jira_client.extract_ticket_key_from_url(url) or '').upper() for url in known_urls
+        }
+        known_keys.add(main_ticket['ticket_key'].upper())
+
+        urls = []
+        for link in main_ticket['linked_tickets']:
+            if link['key'].upper() not in known_keys:
+                known_keys.add(link['key'].upper())
+                urls.append(f"{self.jira_client.base_url}/browse/{link['key']}")
+        return urls
+
+    def _fetch_linked_tickets(self, urls: List[str], concurrent: bool = False) -> List[Dict[str, Any]]:
+        """
+        Fetch linked tickets with one batched search, keeping per-URL error entries.
+
+        Args:
+            urls: Linked ticket URLs
+            concurrent: Fetch the tickets' comments in parallel
+
+        Returns:
+            List of ticket analysis data or error entries, in input order
+        """
+        if not urls:
+            return []
+        for url in urls:
+            print(f"Fetching linked ticket: {url}")
+        try:
+            tickets = self.jira_client.get_tickets_analysis_data(urls, concurrent=concurrent)
+        except Exception as e:
+            tickets = [{'error': str(e), 'url': url} for url in urls]
+        for ticket in tickets:
+            if 'error' in ticket:
+                print(f"Error fetching linked ticket {ticket['url']}: {ticket['error']}")
+        return tickets
+
+    def _fetch_all_data_concurrently(
+        self,
+        data: Dict[str, Any],
+        jira_ticket_url: str,
+        linked_ticket_urls: List[str],
+        sources: List[tuple],
+        max_workers: Optional[int] = None,
+        follow_links: bool = False,
+        discover: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Fetch the main ticket and every source URL in parallel.
+
+        Results are stored in the same order as the input URLs, and failures
+        of non-main sources become per-URL error entries as in serial mode.
+
+        Args:
+            data: Empty result dictionary to fill
+            jira_ticket_url: URL to main Jira ticket
+            linked_ticket_urls: URLs to linked Jira tickets (fetched as one batch)
+            sources: List of (section, label, urls, fetch_function) tuples
+            max_workers: Maximum number of parallel fetches
+            follow_links: Also fetch every ticket in the main ticket's issue links
+            discover: Fetch referenced merge requests, pages and tickets as soon
+                as each part of the main ticket reveals them
+
+        Returns:
+            Dictionary containing all fetched data organized by source
+        """
+        with ThreadPoolExecutor(max_workers=max_workers or Config.FETCH_MAX_WORKERS) as executor:
+            print(f"Fetching main Jira ticket: {jira_ticket_url}")
+            ticket_key = self.jira_client.extract_ticket_key_from_url(jira_ticket_url)
+            if discover and ticket_key:
+                # Submitted first; the ticket fetch below then reuses the memoized issue
+                issue_future = executor.submit(self.jira_client.get_ticket, ticket_key)
+            main_future = executor.submit(
+                self.jira_client.get_ticket_analysis_data, jira_ticket_url, True
+            )
+            linked_future = executor.submit(self._fetch_linked_tickets, linked_ticket_urls, True)
+
+            pending = []
+            for section, label, urls, fetch in sources:
+                for url in urls:
+                    print(f"Fetching {label}: {url}")
+                    pending.append((section, label, url, executor.submit(fetch, url, True)))
+
+            if discover and ticket_key:
+                discovered = {'merge_requests': [], 'documentation': [], 'jira_keys': []}
+                fetchers = {section: (label, fetch) for section, label, _, fetch in sources}
+
+                def get_main_ticket():
+                    data['main_ticket'] = main_future.result()
+                    return data['main_ticket']
+
+                references = self._iter_discovered_references(
+                    ticket_key, issue_future.result, get_main_ticket, executor.submit
+                )
+                for section, reference in references:
+                    if section == 'jira_keys':
+                        discovered[section].append(reference)
+                        continue
+                    if self._is_known_reference(section, reference, data, sources):
+                        continue
+                    label, fetch = fetchers[section]
+                    print(f"Fetching discovered {label}: {reference}")
+                    discovered[section].append(reference)
+                    next(urls for name, _, urls, _ in sources if name == section).append(reference)
+                    pending.append((section, label, reference, executor.submit(fetch, reference, True)))
+                data['discovered'] = discovered
+
+            data['main_ticket'] = main_future.result()
+            data['linked_tickets'] = linked_future.result()
+            if follow_links:
+                data['linked_tickets'] += self._fetch_linked_tickets(
+                    self._issue_link_urls(data['main_ticket'], linked_ticket_urls), True
+                )
+            if discover and ticket_key:
+                tickets = self._fetch_discovered_tickets([
+                    key for key in discovered['jira_keys']
+                    if not self._is_known_reference('jira_keys', key, data, sources)
+                ], True)
+                discovered['jira_keys'] = [t['ticket_key'] for t in tickets if 'ticket_key' in t]
+                data['linked_tickets'] += tickets
+
+            for section, label, url, future in pending:
                 try:
-                    page_data = self.confluence_client.get_page_analysis_data(url)
-                    data['documentation'].append(page_data)
+                    data[section].append(future.result())
                 except Exception as e:
-                    print(f"Error fetching Confluence page {url}: {e}")
-                    data['documentation'].append({'error': str(e), 'url': url})
+                    print(f"Error fetching {label} {url}: {e}")
+                    data[section].append({'error': str(e), 'url': url})
+
+        return data
+
+    async def fetch_all_data_async(
+        self,
+        jira_ticket_url: str,
+        linked_ticket_urls: List[str] = None,
+        merge_request_urls: List[str] = None,
+        confluence_urls: List[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch all data from Jira, GitLab, and Confluence with asyncio.
+
+        Every URL is fetched concurrently on the running event loop. The
+        result has the same shape, ordering and per-URL error entries as
+        fetch_all_data.
+
+        Args:
+            jira_ticket_url: URL to main Jira ticket
+            linked_ticket_urls: List of URLs to linked Jira tickets
+            merge_request_urls: List of URLs to GitLab merge requests
+            confluence_urls: List of URLs to Confluence pages
+
+        Returns:
+            Dictionary containing all fetched data organized by source
+        """
+        from src.async_transport import AsyncHTTPTransport
+        from src.async_clients import AsyncJiraClient, AsyncGitLabClient, AsyncConfluenceClient
+
+        transport = self.async_transport or AsyncHTTPTransport()
+        jira_client = AsyncJiraClient(transport=transport)
+        gitlab_client = AsyncGitLabClient(transport=transport)
+        confluence_client = AsyncConfluenceClient(transport=transport, resolver=self.confluence_client)
+
+        sources = [
+            ('linked_tickets', 'linked ticket', linked_ticket_urls or [],
+             jira_client.get_ticket_analysis_data),
+            ('merge_requests', 'merge request', merge_request_urls or [],
+             gitlab_client.get_merge_request_analysis_data),
+            ('documentation', 'Confluence page', confluence_urls or [],
+             confluence_client.get_page_analysis_data)
+        ]
+
+        data = {
+            'main_ticket': None,
+            'linked_tickets': [],
+            'merge_requests': [],
+            'documentation': []
+        }
+
+        try:
+            print(f"Fetching main Jira ticket: {jira_ticket_url}")
+            pending = []
+            for section, label, urls, fetch in sources:
+                for url in urls:
+                    print(f"Fetching {label}: {url}")
+                    pending.append((section, label, url, fetch(url)))
+
+            main_ticket, *results = await asyncio.gather(
+                jira_client.get_ticket_analysis_data(jira_ticket_url),
+                *(coroutine for _, _, _, coroutine in pending),
+                return_exceptions=True
+            )
+            if isinstance(main_ticket, BaseException):
+                raise main_ticket
+            data['main_ticket'] = main_ticket
+
+            for (section, label, url, _), result in zip(pending, results):
+                if isinstance(result, Exception):
+                    print(f"Error fetching {label} {url}: {result}")
+                    data[section].append({'error': str(result), 'url': url})
+                elif isinstance(result, BaseException):
+                    raise result
+                else:
+                    data[section].append(result)
+        finally:
+            if self.async_transport is None:
+                await transport.close()
 
         return data
 
+    def find_similar_tickets(
+        self,
+        data: Dict[str, Any],
+        index: 'TicketSimilarity',
+        top_k: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Add the stored tickets most similar to the main ticket to the fetched data.
+
+        The main ticket and the tickets already linked to it are left out.
+
+        Args:
+            data: Fetched data from fetch_all_data (updated in place)
+            index: TF-IDF index over the local issue store
+            top_k: Number of similar tickets to add
+
+        Returns:
+            List of similar ticket summaries, most similar first
+        """
+        ticket = data['main_ticket']
+        body = '\n'.join([ticket['description'] or ''] + [c.get('body', '') for c in ticket['comments']])
+        exclude = [ticket['ticket_key']] + [link['key'] for link in ticket['linked_tickets']]
+        exclude += [linked['ticket_key'] for linked in data['linked_tickets'] if 'ticket_key' in linked]
+
+        similar = []
+        for match in index.similar_to_text(ticket['summary'], body, top_k, exclude=exclude):
+            fields = (index.store.get_issue(match['ticket_key']) or {}).get('fields', {})
+            similar.append({
+                'ticket_key': match['ticket_key'],
+                'score': match['score'],
+                'summary': fields.get('summary', ''),
+                'status': (fields.get('status') or {}).get('name', ''),
+                'issue_type': (fields.get('issuetype') or {}).get('name', ''),
+                'description': (fields.get('description') or '')[:500]
+            })
+        data['similar_tickets'] = similar
+        return similar
+
     def format_data_for_analysis(self, data: Dict[str, Any]) -> str:
         """
         Format fetched data into a comprehensive text summary for Claude analysis.
@@ -106,6 +673,8 @@ class QAAnalyzer:
             output.append(f"Priority: {ticket['priority']}")
             output.append(f"Assignee: {ticket['assignee']}")
             output.append(f"Reporter: {ticket['reporter']}")
+            for name, value in ticket.get('extra_fields', {}).items():
+                output.append(f"{name}: {self._format_field_value(value)}")
             output.append(f"\nDescription:\n{ticket['description']}")
 
             if ticket['comments']:
@@ -122,6 +691,59 @@ class QAAnalyzer:
                 for link in ticket['linked_tickets']:
                     output.append(f"- {link['key']}: {link['summary']} ({link['type']}, Status: {link['status']})")
 
+        # Link Graph Section
+        if data.get('link_graph'):
+            output.append("\n" + "=" * 80)
+            output.append("JIRA LINK GRAPH")
+            output.append("=" * 80)
+            output.extend(self._format_link_graph(data['link_graph']))
+
+        # Child Issues Section
+        if data.get('children'):
+            output.append("\n" + "=" * 80)
+            output.append("CHILD ISSUES")
+            output.append("=" * 80)
+
+            expansion = data['children']
+            if 'error' in expansion:
+                output.append(f"\nError fetching child issues: {expansion['error']}")
+            else:
+                output.append(f"\n{len(expansion['children'])} child issues of {expansion['ticket_key']}"
+                              + (" (truncated at limit)" if expansion['truncated'] else ""))
+            for ticket in expansion.get('children', []):
+                if 'error' in ticket:
+                    output.append(f"\nError fetching {ticket['ticket_key']}: {ticket['error']}")
+                    continue
+
+                output.append(f"\n--- {ticket['ticket_key']} (child of {ticket['parent']}) ---")
+                output.append(f"Summary: {ticket['summary']}")
+                output.append(f"Type: {ticket['issue_type']}")
+                output.append(f"Status: {ticket['status']}")
+                output.append(f"Assignee: {ticket['assignee']}")
+                output.append(f"\nDescription:\n{ticket['description']}")
+
+                if ticket['comments']:
+                    output.append(f"\nComments ({len(ticket['comments'])}):")
+                    for i, comment in enumerate(ticket['comments'], 1):
+                        author = comment.get('author', {}).get('displayName', 'Unknown')
+                        body = comment.get('body', '')
+                        output.append(f"\nComment #{i} by {author}:")
+                        output.append(body)
+
+        # Similar Tickets Section
+        if data.get('similar_tickets'):
+            output.append("\n" + "=" * 80)
+            output.append("SIMILAR PAST TICKETS")
+            output.append("=" * 80)
+
+            for ticket in data['similar_tickets']:
+                output.append(f"\n--- {ticket['ticket_key']} (similarity {ticket['score']:.2f}) ---")
+                output.append(f"Summary: {ticket['summary']}")
+                output.append(f"Type: {ticket['issue_type']}")
+                output.append(f"Status: {ticket['status']}")
+                if ticket['description']:
+                    output.append(f"Description (excerpt):\n{ticket['description']}")
+
         # Linked Tickets Section
         if data['linked_tickets']:
             output.append("\n" + "=" * 80)
@@ -153,7 +775,8 @@ class QAAnalyzer:
             output.append("GITLAB MERGE REQUESTS")
             output.append("=" * 80)
 
-            for mr in data['merge_requests']:
+            duplicates = self._find_duplicate_changes(data['merge_requests'])
+            for index, mr in enumerate(data['merge_requests']):
                 if 'error' in mr:
                     output.append(f"\nError fetching {mr.get('url', 'unknown')}: {mr['error']}")
                     continue
@@ -163,25 +786,66 @@ class QAAnalyzer:
                 output.append(f"Author: {mr['author']}")
                 output.append(f"Branch: {mr['source_branch']} → {mr['target_branch']}")
                 output.append(f"Files Changed: {mr['files_changed']}")
+                if mr.get('diff_stats'):
+                    output.append(f"Lines: +{mr['diff_stats']['additions']} -{mr['diff_stats']['deletions']}")
+
+                since = mr.get('since_last_analysis') or {}
+                new_commits = set(since.get('new_commits', []))
+                changed_files = set(since.get('changed_files', []))
+                new_notes = set(since.get('new_notes', []))
+                if since:
+                    output.append(
+                        f"Since last analysis: {len(new_commits)} new commits, {len(changed_files)} files changed, "
+                        f"{len(new_notes)} new or edited comments"
+                    )
                 output.append(f"\nDescription:\n{mr['description']}")
 
                 output.append(f"\n--- Commits ({len(mr['commits'])}) ---")
                 for commit in mr['commits']:
-                    output.append(f"- {commit.get('short_id', '')}: {commit.get('title', '')}")
+                    marker = '[new] ' if commit.get('id') in new_commits else ''
+                    also = duplicates.get((index, 'commit', commit.get('id')))
+                    suffix = f" (also in MR {also})" if also else ''
+                    output.append(f"- {marker}{commit.get('short_id', '')}: {commit.get('title', '')}{suffix}")
 
                 output.append(f"\n--- Code Changes ---")
-                for change in mr['changes'][:10]:  # Limit to first 10 files
-                    output.append(f"\nFile: {change.get('new_path', change.get('old_path', 'unknown'))}")
+                rendered = mr['changes'][:MAX_RENDERED_MR_FILES]
+                for change in rendered:
+                    path = change.get('new_path', change.get('old_path', 'unknown'))
+                    marker = ' [changed since last analysis]' if path in changed_files else ''
+                    also = duplicates.get((index, 'file', path))
+                    if also:
+                        output.append(f"\nFile: {path}{marker} (also in MR {also}, diff shown there)")
+                        continue
+                    output.append(f"\nFile: {path}{marker}")
                     output.append(f"Status: {change.get('new_file', False) and 'New' or change.get('deleted_file', False) and 'Deleted' or 'Modified'}")
 
                     diff = change.get('diff', '')
-                    if len(diff) > 1000:
-                        output.append(f"Diff (truncated): {diff[:1000]}... [truncated]")
+                    if len(diff) > MAX_RENDERED_DIFF_CHARS:
+                        output.append(f"Diff (truncated): {diff[:MAX_RENDERED_DIFF_CHARS]}... [truncated]")
                     else:
                         output.append(f"Diff: {diff}")
 
-                if len(mr['changes']) > 10:
-                    output.append(f"\n... and {len(mr['changes']) - 10} more files")
+                    for window in change.get('context', []):
+                        output.append(f"Context (lines {window['start']}-{window['end']}):\n{window['text']}")
+
+                remaining = max(mr['files_changed'], len(mr['changes'])) - len(rendered)
+                if remaining > 0:
+                    output.append(f"\n... and {remaining} more files")
+
+                if since.get('interdiff'):
+                    output.append(
+                        f"\n--- Changes Since Last Analysis "
+                        f"({since['previous_head_sha'][:8]}..{mr['full_data'].get('sha', '')[:8]}) ---"
+                    )
+                    for change in since['interdiff'][:MAX_RENDERED_MR_FILES]:
+                        diff = change.get('diff', '')
+                        if len(diff) > MAX_RENDERED_DIFF_CHARS:
+                            diff = f"{diff[:MAX_RENDERED_DIFF_CHARS]}... [truncated]"
+                        output.append(f"\nFile: {change.get('new_path', change.get('old_path', 'unknown'))}")
+                        output.append(f"Diff: {diff}")
+
+                if mr.get('pipeline'):
+                    output.extend(self._format_pipeline(mr['pipeline']))
 
                 if mr['discussions']:
                     output.append(f"\n--- Discussions/Comments ({len(mr['discussions'])}) ---")
@@ -189,7 +853,8 @@ class QAAnalyzer:
                         for note in discussion.get('notes', []):
                             author = note.get('author', {}).get('name', 'Unknown')
                             body = note.get('body', '')
-                            output.append(f"\n{author}: {body}")
+                            marker = '[new] ' if note.get('id') in new_notes else ''
+                            output.append(f"\n{marker}{author}: {body}")
 
         # Documentation Section
         if data['documentation']:
@@ -211,7 +876,145 @@ class QAAnalyzer:
                 if page['comments']:
                     output.append(f"\n--- Comments ({len(page['comments'])}) ---")
                     for comment in page['comments']:
-                        body = comment.get('body', {}).get('view', {}).get('value', '')
+                        body = storage_to_markdown(comment.get('body', {}).get('view', {}).get('value', ''))
                         output.append(f"\n{body}")
 
         return "\n".join(output)
+
+    @staticmethod
+    def _format_pipeline(summary: Dict[str, Any]) -> List[str]:
+        """
+        Format an MR's head pipeline summary.
+
+        Args:
+            summary: Pipeline summary (see GitLabClient.get_pipeline_summary)
+
+        Returns:
+            Output lines
+        """
+        pipeline = summary['pipeline']
+        jobs = summary['jobs']
+        failed_jobs = [job for job in jobs if job['status'] == 'failed']
+        lines = [
+            f"\n--- Pipeline #{pipeline['id']}: {pipeline['status']} ---",
+            f"Commit: {(pipeline.get('sha') or '')[:8]} on {pipeline.get('ref', '')}",
+            f"Jobs: {len(jobs)} ({len(failed_jobs)} failed)"
+        ]
+        report = summary.get('test_report')
+        if report:
+            lines.append(
+                f"Tests: {report['total']} total, {report['success']} passed, {report['failed']} failed, "
+                f"{report['error']} errors, {report['skipped']} skipped"
+            )
+            for case in report['failed_cases']:
+                name = f"{case['classname']}.{case['name']}" if case['classname'] else case['name']
+                lines.append(f"- [{case['status']}] {case['suite']}: {name}")
+            unlisted = report['failed'] + report['error'] - len(report['failed_cases'])
+            if unlisted > 0:
+                lines.append(f"... and {unlisted} more failing tests")
+
+        for job in failed_jobs:
+            allowed = ' (allowed to fail)' if job['allow_failure'] else ''
+            reason = f" - {job['failure_reason']}" if job.get('failure_reason') else ''
+            lines.append(f"\nFailed job: {job['stage']}/{job['name']}{allowed}{reason}")
+            if job.get('log_tail'):
+                lines.append(f"Log (last lines):\n{job['log_tail']}")
+            elif job.get('log_error'):
+                lines.append(f"Log unavailable: {job['log_error']}")
+        return lines
+
+    @staticmethod
+    def _find_duplicate_changes(merge_requests: List[Dict[str, Any]]) -> Dict[Tuple[int, str, str], str]:
+        """
+        Find commits and file diffs that repeat an earlier merge request's.
+
+        Backports and cherry-picks to release branches carry the same
+        commits and near-identical diffs; files are matched by patch ID and
+        commits by author, date and message, so each is rendered once. Only
+        the files that are rendered (the first MAX_RENDERED_MR_FILES) are
+        matched, so a reference always points at a diff that was shown.
+
+        This only deduplicates the prompt. Merge requests are fetched
+        independently (and in parallel), so the duplicates are only known
+        afterwards. Their extra cost is small where it matters: git mirror
+        diffs are computed locally, and with the blob cache a repeated file's
+        context contents are not downloaded again.
+
+        Args:
+            merge_requests: Merge request analysis entries, in render order
+
+        Returns:
+            Mapping of (MR index, 'commit' or 'file', commit ID or path) to the
+            reference of the first MR with the same change
+        """
+        first_seen = {}
+        duplicates = {}
+        for index, mr in enumerate(merge_requests):
+            if 'error' in mr:
+                continue
+            full_data = mr.get('full_data') or {}
+            reference = (full_data.get('references') or {}).get('full') or full_data.get('web_url') or mr['title']
+            fingerprints = [
+                ('commit', commit.get('id'), f"commit:{commit_fingerprint(commit)}") for commit in mr['commits']
+            ] + [
+                ('file', change.get('new_path'), f"file:{patch_id(change.get('new_path', ''), change.get('diff', ''))}")
+                for change in mr['changes'][:MAX_RENDERED_MR_FILES]
+                if patch_id(change.get('new_path', ''), change.get('diff', ''))
+            ]
+            for kind, name, fingerprint in fingerprints:
+                seen_index, seen_reference = first_seen.setdefault(fingerprint, (index, reference))
+                if seen_index != index:
+                    duplicates[(index, kind, name)] = seen_reference
+        return duplicates
+
+    @staticmethod
+    def _format_link_graph(graph: Dict[str, Any]) -> List[str]:
+        """
+        Render a crawled link graph as one line per ticket, grouped by depth.
+
+        Args:
+            graph: Result of JiraClient.crawl_link_graph
+
+        Returns:
+            List of output lines
+        """
+        if 'error' in graph:
+            return [f"\nError crawling link graph: {graph['error']}"]
+
+        outgoing = {}
+        for edge in graph['edges']:
+            outgoing.setdefault(edge['from'], []).append(f"{edge['type']} {edge['to']}")
+
+        depth_count = max(node['depth'] for node in graph['nodes'].values()) + 1
+        lines = [f"\n{len(graph['nodes'])} tickets, {len(graph['edges'])} links, {depth_count - 1} levels deep"
+                 + (" (truncated at node limit)" if graph['truncated'] else "")]
+        for depth in range(depth_count):
+            lines.append(f"\nDepth {depth}:")
+            for node in graph['nodes'].values():
+                if node['depth'] != depth:
+                    continue
+                line = f"- {node['key']} [{node['issue_type']}, {node['status']}, {node['priority']}] {node['summary']}"
+                if node['key'] in outgoing:
+                    line += f" -> {'; '.join(outgoing[node['key']])}"
+                lines.append(line)
+        return lines
+
+    @staticmethod
+    def _format_field_value(value: Any) -> str:
+        """
+        Render a raw Jira field value (string, object or list) as short text.
+
+        Args:
+            value: Field value from the Jira REST API
+
+        Returns:
+            Human-readable representation
+        """
+        if isinstance(value, list):
+            return ', '.join(QAAnalyzer._format_field_value(item) for item in value)
+        if isinstance(value, dict):
+            for key in ('name', 'value', 'displayName', 'key'):
+                if key in value:
+                    return str(value[key])
+            return str(value)
+        return str(value)
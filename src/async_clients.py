@@ -0,0 +1,362 @@
+"""
+Asyncio counterparts of the Jira, GitLab and Confluence clients.
+
+URL parsing and response shaping are shared with the synchronous clients,
+but fetching is implemented separately and covers only the basic requests:
+the response cache, lean Jira fields, the issue store, incremental MR
+updates, pipelines, file context, git mirrors and lazy diffs are not
+available here.
+"""
+import asyncio
+import aiohttp
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import quote
+from src.config import Config
+from src.async_transport import AsyncHTTPTransport
+from src.jira_client import JiraClient
+from src.gitlab_client import GitLabClient
+from src.confluence_client import ConfluenceClient
+
+
+class AsyncJiraClient:
+    """Async client for interacting with Jira API."""
+
+    extract_ticket_key_from_url = JiraClient.extract_ticket_key_from_url
+
+    def __init__(self, transport: Optional[AsyncHTTPTransport] = None):
+        """
+        Initialize the client.
+
+        Args:
+            transport: Shared async HTTP transport (a new one is created if omitted)
+        """
+        self.transport = transport or AsyncHTTPTransport()
+        self.base_url = Config.JIRA_URL.rstrip('/')
+        self.auth = aiohttp.BasicAuth(Config.JIRA_EMAIL, Config.JIRA_API_TOKEN)
+        self.headers = {
+            'Accept': 'application/json',
+            'Content-Type': 'application/json'
+        }
+
+    async def get_ticket(self, ticket_key: str) -> Dict[str, Any]:
+        """
+        Fetch a Jira ticket by its key.
+
+        Args:
+            ticket_key: Jira ticket key (e.g., PROJ-123)
+
+        Returns:
+            Dictionary containing ticket information
+        """
+        url = f"{self.base_url}/rest/api/2/issue/{ticket_key}"
+        return await self.transport.get_json(url, auth=self.auth, headers=self.headers)
+
+    async def get_ticket_comments(self, ticket_key: str) -> List[Dict[str, Any]]:
+        """
+        Fetch all comments for a Jira ticket, page by page.
+
+        Args:
+            ticket_key: Jira ticket key
+
+        Returns:
+            List of comment dictionaries, oldest first
+        """
+        url = f"{self.base_url}/rest/api/2/issue/{ticket_key}/comment"
+        first = await self.transport.get_json(
+            url, auth=self.auth, headers=self.headers, params={'startAt': 0, 'maxResults': 100}
+        )
+        comments = first.get('comments', [])
+        total = first.get('total', len(comments))
+        if not comments or len(comments) >= total:
+            return comments
+
+        # Fetch the remaining pages in parallel once the total is known
+        pages = await asyncio.gather(*(
+            self.transport.get_json(
+                url, auth=self.auth, headers=self.headers,
+                params={'startAt': offset, 'maxResults': len(comments)}
+            )
+            for offset in range(len(comments), total, len(comments))
+        ))
+        for page in pages:
+            comments.extend(page.get('comments', []))
+        return comments
+
+    async def get_linked_tickets(
+        self,
+        ticket_key: str,
+        ticket: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch all linked tickets for a Jira ticket.
+
+        Args:
+            ticket_key: Jira ticket key
+            ticket: Already-fetched issue to read links from (skips the lookup)
+
+        Returns:
+            List of linked ticket information
+        """
+        if ticket is None:
+            ticket = await self.get_ticket(ticket_key)
+        return JiraClient.parse_linked_tickets(ticket)
+
+    async def get_ticket_analysis_data(self, ticket_url: str) -> Dict[str, Any]:
+        """
+        Get comprehensive ticket data for analysis.
+
+        Args:
+            ticket_url: URL to Jira ticket
+
+        Returns:
+            Dictionary with ticket, comments, and linked tickets data
+        """
+        ticket_key = self.extract_ticket_key_from_url(ticket_url)
+        if not ticket_key:
+            raise ValueError(f"Could not extract ticket key from URL: {ticket_url}")
+
+        ticket, comments = await asyncio.gather(
+            self.get_ticket(ticket_key),
+            self.get_ticket_comments(ticket_key)
+        )
+        linked_tickets = JiraClient.parse_linked_tickets(ticket)
+
+        return JiraClient.build_ticket_analysis_data(ticket_key, ticket, comments, linked_tickets)
+
+
+class AsyncGitLabClient:
+    """Async client for interacting with GitLab API."""
+
+    extract_mr_info_from_url = GitLabClient.extract_mr_info_from_url
+
+    def __init__(self, transport: Optional[AsyncHTTPTransport] = None):
+        """
+        Initialize the client.
+
+        Args:
+            transport: Shared async HTTP transport (a new one is created if omitted)
+        """
+        self.transport = transport or AsyncHTTPTransport()
+        self.base_url = Config.GITLAB_URL.rstrip('/')
+        self.token = Config.GITLAB_PERSONAL_ACCESS_TOKEN
+        self.headers = {
+            'PRIVATE-TOKEN': self.token,
+            'Content-Type': 'application/json'
+        }
+
+    async def _get_mr_resource(self, project_path: str, mr_iid: str, resource: str = '') -> Any:
+        """
+        Fetch an MR endpoint or one of its sub-resources.
+
+        Args:
+            project_path: GitLab project path
+            mr_iid: Merge request IID
+            resource: Optional sub-resource (e.g., 'changes', 'commits')
+
+        Returns:
+            Decoded JSON response
+        """
+        encoded_project = quote(project_path, safe='')
+        url = f"{self.base_url}/api/v4/projects/{encoded_project}/merge_requests/{mr_iid}"
+        if resource:
+            url += f"/{resource}"
+        return await self.transport.get_json(url, headers=self.headers)
+
+    async def _get_mr_pages(self, project_path: str, mr_iid: str, resource: str) -> List[Dict[str, Any]]:
+        """
+        Fetch every page of a paginated MR sub-resource.
+
+        Pages are followed like GitLabClient.iter_pages: when the first page
+        reports ``X-Total-Pages``, the remaining pages are fetched in
+        parallel; otherwise the ``Link: rel="next"`` header (which also
+        covers keyset pagination) or ``X-Next-Page`` is followed.
+
+        Args:
+            project_path: GitLab project path
+            mr_iid: Merge request IID
+            resource: Sub-resource (e.g., 'discussions', 'commits')
+
+        Returns:
+            All items in API order
+        """
+        encoded_project = quote(project_path, safe='')
+        url = f"{self.base_url}/api/v4/projects/{encoded_project}/merge_requests/{mr_iid}/{resource}"
+        params = {'per_page': 100}
+        items, headers, next_url = await self.transport.request_page(
+            'GET', url, headers=self.headers, params=dict(params, page=1)
+        )
+        items = list(items)
+
+        total_pages = int(headers.get('X-Total-Pages') or 0)
+        if total_pages > 1:
+            pages = await asyncio.gather(*(
+                self.transport.get_json(url, headers=self.headers, params=dict(params, page=page))
+                for page in range(2, total_pages + 1)
+            ))
+            for page in pages:
+                items.extend(page)
+            return items
+
+        while True:
+            next_page = headers.get('X-Next-Page')
+            if next_url:
+                batch, headers, next_url = await self.transport.request_page('GET', next_url, headers=self.headers)
+            elif next_page:
+                batch, headers, next_url = await self.transport.request_page(
+                    'GET', url, headers=self.headers, params=dict(params, page=int(next_page))
+                )
+            else:
+                return items
+            items.extend(batch)
+
+    async def get_merge_request(self, project_path: str, mr_iid: str) -> Dict[str, Any]:
+        """Fetch merge request details."""
+        return await self._get_mr_resource(project_path, mr_iid)
+
+    async def get_merge_request_changes(self, project_path: str, mr_iid: str) -> Dict[str, Any]:
+        """Fetch merge request file changes."""
+        return await self._get_mr_resource(project_path, mr_iid, 'changes')
+
+    async def get_merge_request_discussions(self, project_path: str, mr_iid: str) -> List[Dict[str, Any]]:
+        """Fetch all merge request discussions/comments."""
+        return await self._get_mr_pages(project_path, mr_iid, 'discussions')
+
+    async def get_merge_request_commits(self, project_path: str, mr_iid: str) -> List[Dict[str, Any]]:
+        """Fetch all merge request commits."""
+        return await self._get_mr_pages(project_path, mr_iid, 'commits')
+
+    async def get_merge_request_analysis_data(self, mr_url: str) -> Dict[str, Any]:
+        """
+        Get comprehensive MR data for analysis.
+
+        Args:
+            mr_url: URL to GitLab merge request
+
+        Returns:
+            Dictionary with MR details, changes, discussions, and commits
+        """
+        mr_info = self.extract_mr_info_from_url(mr_url)
+        if not mr_info:
+            raise ValueError(f"Could not extract MR info from URL: {mr_url}")
+
+        project_path, mr_iid = mr_info
+
+        mr, changes, discussions, commits = await asyncio.gather(
+            self.get_merge_request(project_path, mr_iid),
+            self.get_merge_request_changes(project_path, mr_iid),
+            self.get_merge_request_discussions(project_path, mr_iid),
+            self.get_merge_request_commits(project_path, mr_iid)
+        )
+
+        return GitLabClient.build_merge_request_analysis_data(mr, changes, discussions, commits)
+
+
+class AsyncConfluenceClient:
+    """Async client for interacting with Confluence API."""
+
+    extract_page_id_from_url = ConfluenceClient.extract_page_id_from_url
+
+    def __init__(
+        self,
+        transport: Optional[AsyncHTTPTransport] = None,
+        resolver: Optional[ConfluenceClient] = None
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            transport: Shared async HTTP transport (a new one is created if omitted)
+            resolver: Synchronous client used to resolve display, tiny and short
+                URLs through its page index (only pageId URLs work without it)
+        """
+        self.transport = transport or AsyncHTTPTransport()
+        self.resolver = resolver
+        self.base_url = Config.CONFLUENCE_URL.rstrip('/')
+        self.auth = aiohttp.BasicAuth(Config.CONFLUENCE_EMAIL, Config.CONFLUENCE_API_TOKEN)
+        self.headers = {
+            'Accept': 'application/json',
+            'Content-Type': 'application/json'
+        }
+
+    async def get_page(self, page_id: str) -> Dict[str, Any]:
+        """
+        Fetch Confluence page by ID.
+
+        Args:
+            page_id: Confluence page ID
+
+        Returns:
+            Dictionary containing page information
+        """
+        url = f"{self.base_url}/rest/api/content/{page_id}"
+        params = {
+            'expand': 'body.storage,version,space,history'
+        }
+        return await self.transport.get_json(url, auth=self.auth, headers=self.headers, params=params)
+
+    async def get_page_comments(self, page_id: str) -> List[Dict[str, Any]]:
+        """
+        Fetch comments for a Confluence page.
+
+        Args:
+            page_id: Confluence page ID
+
+        Returns:
+            List of comment dictionaries
+        """
+        url = f"{self.base_url}/rest/api/content/{page_id}/child/comment"
+        params = {
+            'expand': 'body.view,version,history'
+        }
+        data = await self.transport.get_json(url, auth=self.auth, headers=self.headers, params=params)
+        return data.get('results', [])
+
+    async def get_page_analysis_data(self, page_url: str) -> Dict[str, Any]:
+        """
+        Get comprehensive page data for analysis.
+
+        Args:
+            page_url: URL to Confluence page
+
+        Returns:
+            Dictionary with page content and metadata
+        """
+        page_id, indexed = await self._resolve_page_id(page_url)
+        if not page_id:
+            raise ValueError(f"Could not find the Confluence page of URL: {page_url}")
+
+        fetch = lambda page_id: asyncio.gather(self.get_page(page_id), self.get_page_comments(page_id))
+        try:
+            page, comments = await fetch(page_id)
+        except aiohttp.ClientResponseError as e:
+            if not indexed or e.status != 404:
+                raise
+            page = comments = None
+
+        if indexed and (page is None or indexed[0] == 'titles' and ConfluenceClient._page_key(page) != indexed[1]):
+            # The indexed page was renamed, moved or deleted since: look the URL up again
+            await asyncio.to_thread(self.resolver._update_page_index, forget=[indexed])
+            page_id, _ = await self._resolve_page_id(page_url)
+            if not page_id:
+                raise ValueError(f"Could not find the Confluence page of URL: {page_url}")
+            if page is None or str(page.get('id')) != page_id:
+                page, comments = await fetch(page_id)
+        if self.resolver:
+            await asyncio.to_thread(self.resolver.remember_page, page)
+
+        return ConfluenceClient.build_page_analysis_data(page_id, page, comments)
+
+    async def _resolve_page_id(self, url: str) -> Tuple[Optional[str], Optional[Tuple[str, str]]]:
+        """
+        Find the page ID of a URL, resolving non-ID URLs with the synchronous resolver.
+
+        The lookups touch the page index file and may search or follow
+        redirects over HTTP, so they run in a worker thread.
+
+        Returns:
+            Tuple of (page ID or None, page index entry it came from or None)
+        """
+        page_id = self.extract_page_id_from_url(url)
+        if page_id or not self.resolver:
+            return page_id, None
+        return await asyncio.to_thread(self.resolver._resolve_page_id, url)
@@ -0,0 +1,138 @@
+"""
+Asyncio HTTP transport built on aiohttp for the async API clients.
+"""
+import asyncio
+import json
+import aiohttp
+from typing import Any, Mapping, Optional, Tuple
+from src.config import Config
+
+
+RETRY_STATUSES = (429, 502, 503, 504)
+
+
+class AsyncHTTPTransport:
+    """
+    Pooled aiohttp transport shared by the async Jira, GitLab and Confluence clients.
+
+    The underlying ``aiohttp.ClientSession`` is created lazily inside the
+    running event loop, keeps connections alive and bounds the number of
+    in-flight requests per host.
+    """
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        backoff_factor: Optional[float] = None,
+        max_per_host: Optional[int] = None
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            pool_size: Maximum number of pooled connections in total
+            timeout: Default request timeout in seconds
+            max_retries: Number of retries for connection errors and retryable statuses
+            backoff_factor: Exponential backoff factor between retries
+            max_per_host: Maximum number of in-flight requests per host
+        """
+        self.pool_size = pool_size if pool_size is not None else Config.HTTP_POOL_SIZE
+        self.timeout = timeout if timeout is not None else Config.HTTP_TIMEOUT
+        self.max_retries = max_retries if max_retries is not None else Config.HTTP_MAX_RETRIES
+        self.backoff_factor = backoff_factor if backoff_factor is not None else Config.HTTP_BACKOFF_FACTOR
+        self.max_per_host = max_per_host if max_per_host is not None else Config.HTTP_MAX_PER_HOST
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Get (or lazily create) the aiohttp session for the running loop.
+
+        Returns:
+            Shared client session
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=max(self.pool_size, self.max_per_host),
+                limit_per_host=max(1, self.max_per_host)
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    async def request_json(self, method: str, url: str, **kwargs: Any) -> Any:
+        """
+        Send an HTTP request and decode the JSON response.
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            url: Request URL
+            **kwargs: Extra arguments passed to aiohttp (auth, headers, params, json...)
+
+        Returns:
+            Decoded JSON body, or an empty dictionary for empty responses
+
+        Raises:
+            aiohttp.ClientResponseError: If the response status is an error
+        """
+        data, _, _ = await self.request_page(method, url, **kwargs)
+        return data
+
+    async def request_page(self, method: str, url: str, **kwargs: Any) -> Tuple[Any, Mapping[str, str], Optional[str]]:
+        """
+        Send an HTTP request and return the JSON body with its pagination headers.
+
+        GET requests are retried with exponential backoff on connection
+        errors and on 429/502/503/504 responses.
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            url: Request URL
+            **kwargs: Extra arguments passed to aiohttp (auth, headers, params, json...)
+
+        Returns:
+            Tuple of (decoded JSON body, response headers, URL of the Link rel="next" page or None)
+
+        Raises:
+            aiohttp.ClientResponseError: If the response status is an error
+        """
+        session = self._get_session()
+        retries = self.max_retries if method == 'GET' else 0
+
+        for attempt in range(retries + 1):
+            try:
+                async with session.request(method, url, **kwargs) as response:
+                    if response.status in RETRY_STATUSES and attempt < retries:
+                        await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+                        continue
+                    response.raise_for_status()
+                    text = await response.text()
+                    next_link = response.links.get('next')
+                    return (
+                        json.loads(text) if text else {},
+                        response.headers,
+                        str(next_link['url']) if next_link else None
+                    )
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= retries:
+                    raise
+                await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+
+    async def get_json(self, url: str, **kwargs: Any) -> Any:
+        """Send a GET request and decode the JSON response."""
+        return await self.request_json('GET', url, **kwargs)
+
+    async def close(self):
+        """Close the underlying session and its pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self) -> 'AsyncHTTPTransport':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -0,0 +1,162 @@
+"""
+Content-addressed cache of repository file contents keyed by git blob SHA.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+from src.config import Config
+from src import sqlite_util
+
+
+class BlobCache:
+    """
+    SQLite-backed store of git blobs and of the blob each file has at a commit.
+
+    A blob SHA names its contents and a (project, commit, path) entry always
+    points to the same blob, so nothing here ever goes stale: entries are
+    shared across MRs and runs and only evicted, least recently used first,
+    when the total size exceeds the cap.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None):
+        """
+        Initialize the cache, creating the database if needed.
+
+        Args:
+            path: SQLite database path (default: <QA_CACHE_DIR>/blobs.sqlite3)
+            max_bytes: Total blob size cap in bytes (default: BLOB_CACHE_MAX_MB)
+        """
+        self.path = path or os.path.join(Config.QA_CACHE_DIR, 'blobs.sqlite3')
+        self.max_bytes = max_bytes if max_bytes is not None else Config.BLOB_CACHE_MAX_MB * 1024 * 1024
+        self.stats = {'hits': 0, 'misses': 0}
+        self._lock = threading.Lock()
+
+        self._conn = sqlite_util.connect(self.path)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS blobs (
+                sha TEXT PRIMARY KEY,
+                content BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS blobs_accessed ON blobs (accessed_at);
+            CREATE TABLE IF NOT EXISTS tree_entries (
+                project TEXT NOT NULL,
+                commit_sha TEXT NOT NULL,
+                path TEXT NOT NULL,
+                blob_sha TEXT NOT NULL,
+                PRIMARY KEY (project, commit_sha, path)
+            );
+            """
+        )
+
+    @staticmethod
+    def blob_sha(content: bytes, length: int = 40) -> str:
+        """
+        Compute the git object name of a blob.
+
+        Args:
+            content: Blob contents
+            length: SHA length of the repository (40 for SHA-1, 64 for SHA-256)
+
+        Returns:
+            Hex object name
+        """
+        digest = hashlib.sha256() if length == 64 else hashlib.sha1()
+        digest.update(f"blob {len(content)}\0".encode('ascii'))
+        digest.update(content)
+        return digest.hexdigest()
+
+    def get(self, sha: str) -> Optional[bytes]:
+        """
+        Look up a blob and mark it as recently used.
+
+        Args:
+            sha: Blob SHA
+
+        Returns:
+            Blob contents, or None if not cached
+        """
+        with self._lock:
+            row = self._conn.execute('SELECT content FROM blobs WHERE sha = ?', (sha,)).fetchone()
+            self.stats['hits' if row else 'misses'] += 1
+            if row is None:
+                return None
+            self._conn.execute('UPDATE blobs SET accessed_at = ? WHERE sha = ?', (time.time(), sha))
+        return bytes(row[0])
+
+    def put(self, sha: str, content: bytes) -> bool:
+        """
+        Store a blob after checking that its contents match its SHA.
+
+        Args:
+            sha: Blob SHA
+            content: Blob contents
+
+        Returns:
+            Whether the blob was stored
+        """
+        if self.blob_sha(content, len(sha)) != sha or len(content) > self.max_bytes:
+            return False
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO blobs (sha, content, size, accessed_at) VALUES (?, ?, ?, ?)',
+                (sha, sqlite3.Binary(content), len(content), time.time())
+            )
+            self._evict()
+        return True
+
+    def get_entry(self, project: str, commit_sha: str, path: str) -> Optional[str]:
+        """
+        Look up the blob SHA a file has at a commit.
+
+        Args:
+            project: Project path or ID
+            commit_sha: Full commit SHA
+            path: File path
+
+        Returns:
+            Blob SHA, or None if unknown
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT blob_sha FROM tree_entries WHERE project = ? AND commit_sha = ? AND path = ?',
+                (project, commit_sha, path)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put_entry(self, project: str, commit_sha: str, path: str, blob_sha: str):
+        """
+        Remember the blob SHA a file has at a commit.
+
+        Args:
+            project: Project path or ID
+            commit_sha: Full commit SHA
+            path: File path
+            blob_sha: Blob SHA
+        """
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO tree_entries (project, commit_sha, path, blob_sha) VALUES (?, ?, ?, ?)',
+                (project, commit_sha, path, blob_sha)
+            )
+
+    def _evict(self):
+        """Delete least recently used blobs until the total size fits the cap."""
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for sha, size in self._conn.execute('SELECT sha, size FROM blobs ORDER BY accessed_at ASC').fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute('DELETE FROM blobs WHERE sha = ?', (sha,))
+            total -= size
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
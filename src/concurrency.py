@@ -0,0 +1,83 @@
+"""
+Helpers for running independent fetches concurrently.
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+from src.config import Config
+
+
+def run_concurrently(
+    tasks: Dict[str, Callable[[], Any]],
+    max_workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Run independent callables in a thread pool and collect their results.
+
+    Args:
+        tasks: Mapping of task name to zero-argument callable
+        max_workers: Maximum number of worker threads (default: Config.FETCH_MAX_WORKERS)
+
+    Returns:
+        Mapping of task name to result, in the same order as ``tasks``
+
+    Raises:
+        The first exception raised by any task, after all tasks have finished
+    """
+    if not tasks:
+        return {}
+    workers = min(max_workers or Config.FETCH_MAX_WORKERS, len(tasks))
+    if workers <= 1:
+        return {name: task() for name, task in tasks.items()}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {name: executor.submit(task) for name, task in tasks.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+
+def map_ordered(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_workers: Optional[int] = None
+) -> Iterator[Any]:
+    """
+    Lazily yield ``func(item)`` for each item, in input order, computing ahead in a thread pool.
+
+    At most ``2 * max_workers`` results are in flight or buffered at a time,
+    so long page sequences can be streamed without holding them all. Closing
+    the iterator early cancels the fetches that have not started yet.
+
+    Args:
+        func: Single-argument callable (e.g. fetch one page)
+        items: Arguments to call ``func`` with
+        max_workers: Maximum number of worker threads (default: Config.FETCH_MAX_WORKERS);
+            1 calls ``func`` serially in the consuming thread
+
+    Yields:
+        Results in the same order as ``items``
+
+    Raises:
+        The exception raised by ``func`` for the first failing item, when it is reached
+    """
+    workers = max_workers or Config.FETCH_MAX_WORKERS
+    if workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    items = iter(items)
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= 2 * workers:
+                break
+        while pending:
+            result = pending.popleft().result()
+            for item in items:
+                pending.append(executor.submit(func, item))
+                break
+            yield result
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -22,6 +22,15 @@ class Config:
     GITLAB_PERSONAL_ACCESS_TOKEN: str = os.getenv('GITLAB_PERSONAL_ACCESS_TOKEN', '')
     GITLAB_FEED_TOKEN: str = os.getenv('GITLAB_FEED_TOKEN', '')
 
+    # Comma-separated GitLab groups searched by --find-mrs (empty: every visible MR)
+    GITLAB_GROUPS: str = os.getenv('GITLAB_GROUPS', '')
+
+    # Days of recently updated MRs listed by --find-mrs to match source branches (0: off)
+    GITLAB_BRANCH_LOOKBACK_DAYS: int = int(os.getenv('GITLAB_BRANCH_LOOKBACK_DAYS', '90'))
+
+    # Bytes of each failing CI job's log fetched by --pipeline, in KiB
+    GITLAB_JOB_LOG_TAIL_KB: int = int(os.getenv('GITLAB_JOB_LOG_TAIL_KB', '8'))
+
     # Confluence Configuration
     CONFLUENCE_URL: str = os.getenv('CONFLUENCE_URL', '')
     CONFLUENCE_EMAIL: str = os.getenv('CONFLUENCE_EMAIL', '')
@@ -32,6 +41,90 @@ class Config:
     TESTRAIL_EMAIL: str = os.getenv('TESTRAIL_EMAIL', '')
     TESTRAIL_API_KEY: str = os.getenv('TESTRAIL_API_KEY', '')
 
+    # Named Jira field sets for lean fetches, e.g. "qa:customfield_10010,labels;release:fixVersions"
+    JIRA_FIELD_SETS: str = os.getenv('JIRA_FIELD_SETS', '')
+
+    # Name of the classic "Epic Link" field used to find epic children (empty: parent only)
+    JIRA_EPIC_LINK_FIELD: str = os.getenv('JIRA_EPIC_LINK_FIELD', 'Epic Link')
+
+    # Development panel integration queried for linked merge requests (empty: skip dev-status)
+    JIRA_DEV_STATUS_APPLICATION: str = os.getenv('JIRA_DEV_STATUS_APPLICATION', 'GitLab')
+
+    # HTTP Transport Configuration
+    HTTP_POOL_SIZE: int = int(os.getenv('HTTP_POOL_SIZE', '10'))
+    HTTP_TIMEOUT: float = float(os.getenv('HTTP_TIMEOUT', '30'))
+    HTTP_MAX_RETRIES: int = int(os.getenv('HTTP_MAX_RETRIES', '3'))
+    HTTP_BACKOFF_FACTOR: float = float(os.getenv('HTTP_BACKOFF_FACTOR', '0.5'))
+    HTTP_MAX_PER_HOST: int = int(os.getenv('HTTP_MAX_PER_HOST', '6'))
+
+    # Concurrent Fetch Configuration
+    FETCH_MAX_WORKERS: int = int(os.getenv('FETCH_MAX_WORKERS', '8'))
+
+    # Response Cache Configuration
+    QA_CACHE_DIR: str = os.path.expanduser(os.getenv('QA_CACHE_DIR', '~/.cache/qa-analysis'))
+    CACHE_MAX_MB: int = int(os.getenv('CACHE_MAX_MB', '512'))
+    CACHE_TTL_JIRA: int = int(os.getenv('CACHE_TTL_JIRA', '900'))
+    CACHE_TTL_GITLAB: int = int(os.getenv('CACHE_TTL_GITLAB', '900'))
+    CACHE_TTL_CONFLUENCE: int = int(os.getenv('CACHE_TTL_CONFLUENCE', '3600'))
+    CACHE_TTL_TESTRAIL: int = int(os.getenv('CACHE_TTL_TESTRAIL', '300'))
+
+    # Local Jira issue store (default: <QA_CACHE_DIR>/issues.sqlite3)
+    ISSUE_STORE_PATH: str = os.path.expanduser(os.getenv('ISSUE_STORE_PATH', ''))
+    ISSUE_SYNC_OVERLAP_MINUTES: int = int(os.getenv('ISSUE_SYNC_OVERLAP_MINUTES', '5'))
+
+    # Content-addressed cache of repository files used for --file-context
+    BLOB_CACHE_MAX_MB: int = int(os.getenv('BLOB_CACHE_MAX_MB', '256'))
+
+    # Local git mirrors for computing MR diffs (--git-mirror)
+    GIT_MIRROR_DIR: str = os.path.expanduser(os.getenv('GIT_MIRROR_DIR', ''))
+    GIT_MIRROR_URL: str = os.getenv('GIT_MIRROR_URL', '')
+    GIT_MIRROR_PROJECTS: str = os.getenv('GIT_MIRROR_PROJECTS', '')
+
+    @classmethod
+    def jira_field_sets(cls) -> dict[str, list[str]]:
+        """
+        Parse the named Jira field sets defined in JIRA_FIELD_SETS.
+
+        Returns:
+            Mapping of field set name to list of field IDs
+        """
+        field_sets = {}
+        for entry in cls.JIRA_FIELD_SETS.split(';'):
+            name, _, fields = entry.partition(':')
+            if name.strip() and fields.strip():
+                field_sets[name.strip()] = [f.strip() for f in fields.split(',') if f.strip()]
+        return field_sets
+
+    @classmethod
+    def cache_ttls(cls) -> dict[str, int]:
+        """
+        Get the response cache TTL for each source.
+
+        Returns:
+            Mapping of source name to TTL in seconds
+        """
+        return {
+            'jira': cls.CACHE_TTL_JIRA,
+            'gitlab': cls.CACHE_TTL_GITLAB,
+            'confluence': cls.CACHE_TTL_CONFLUENCE,
+            'testrail': cls.CACHE_TTL_TESTRAIL
+        }
+
+    @classmethod
+    def source_urls(cls) -> dict[str, str]:
+        """
+        Get the configured base URL of each source.
+
+        Returns:
+            Mapping of source name to base URL (without trailing slash)
+        """
+        return {
+            'jira': cls.JIRA_URL.rstrip('/'),
+            'gitlab': cls.GITLAB_URL.rstrip('/'),
+            'confluence': cls.CONFLUENCE_URL.rstrip('/'),
+            'testrail': cls.TESTRAIL_URL.rstrip('/')
+        }
+
     @classmethod
     def validate(cls) -> tuple[bool, list[str]]:
         """
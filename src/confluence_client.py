@@ -1,26 +1,59 @@
 """
 Confluence API client for fetching documentation.
 """
+import base64
+import binascii
+import json
+import os
+import re
+import threading
 import requests
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs, unquote_plus
 from requests.auth import HTTPBasicAuth
 from src.config import Config
+from src.http_transport import HTTPTransport
+from src.concurrency import run_concurrently
+from src.storage_format import storage_to_markdown
 
 
 class ConfluenceClient:
     """Client for interacting with Confluence API."""
 
-    def __init__(self):
+    def __init__(self, transport: Optional[HTTPTransport] = None, page_index_path: Optional[str] = None):
+        """
+        Initialize the client.
+
+        Args:
+            transport: Shared HTTP transport (a new one is created if omitted)
+            page_index_path: JSON file persisting the (space, title) -> page ID and
+                short URL -> page ID index across runs (default: kept in memory only)
+        """
+        self.transport = transport or HTTPTransport()
         self.base_url = Config.CONFLUENCE_URL.rstrip('/')
         self.auth = HTTPBasicAuth(Config.CONFLUENCE_EMAIL, Config.CONFLUENCE_API_TOKEN)
         self.headers = {
             'Accept': 'application/json',
             'Content-Type': 'application/json'
         }
+        self.page_index_path = page_index_path
+        self._page_index: Dict[str, Dict[str, str]] = {'titles': {}, 'urls': {}}
+        self._index_lock = threading.Lock()
+        if page_index_path and os.path.exists(page_index_path):
+            try:
+                with open(page_index_path, encoding='utf-8') as f:
+                    index = json.load(f)
+                self._page_index = {name: dict(index.get(name) or {}) for name in ('titles', 'urls')}
+            except (OSError, ValueError, AttributeError, TypeError):
+                pass  # unreadable index; rebuilt as pages are resolved
 
     def extract_page_id_from_url(self, url: str) -> Optional[str]:
         """
-        Extract page ID from Confluence URL.
+        Extract page ID from Confluence URL, for URLs that contain it.
+
+        Handles ``pageId=`` URLs, ``/spaces/SPACE/pages/ID/...`` URLs and tiny
+        links (``/x/CODE``, which encode the ID). Display URLs need a lookup,
+        see resolve_page_id.
 
         Args:
             url: Confluence page URL
@@ -29,19 +62,205 @@ class ConfluenceClient:
             Page ID or None if not found
         """
         # Handle URLs like https://intranet.paysera.net/pages/viewpage.action?pageId=123456
-        # or https://intranet.paysera.net/display/SPACE/Page+Title
+        match = re.search(r'[?&]pageId=(\d+)', url) or re.search(r'/spaces/[^/]+/pages/(\d+)', url)
+        if match:
+            return match.group(1)
+        match = re.search(r'/x/([A-Za-z0-9_-]+)', url)
+        if match:
+            return ConfluenceClient.decode_tiny_link(match.group(1))
+        return None
+
+    @staticmethod
+    def decode_tiny_link(code: str) -> Optional[str]:
+        """
+        Decode the page ID from a tiny link code.
+
+        The code is the page ID as a little-endian 64-bit integer in base64,
+        with "/" and "+" replaced by "-" and "_" and the trailing "A"s (zero
+        bits) and padding removed.
+
+        Args:
+            code: Tiny link code, e.g. "AgAB" from https://wiki.example.com/x/AgAB
+
+        Returns:
+            Page ID, or None if the code is not valid
+        """
+        data = code.replace('-', '/').replace('_', '+')
+        data += 'A' * (-len(data) % 4)
         try:
-            if 'pageId=' in url:
-                page_id = url.split('pageId=')[1].split('&')[0]
-                return page_id
-            elif '/display/' in url:
-                # For display URLs, we need to search by title or use a different approach
-                # This is a simplified version - may need enhancement
-                return None
-        except Exception:
-            pass
+            raw = base64.b64decode(data, validate=True)
+        except (ValueError, binascii.Error):
+            return None
+        page_id = int.from_bytes(raw[:8], 'little')
+        return str(page_id) if page_id else None
+
+    @staticmethod
+    def parse_display_url(url: str) -> Optional[Tuple[str, str]]:
+        """
+        Extract the space key and title from a display URL.
+
+        Handles ``/display/SPACE/Page+Title`` (and blog posts,
+        ``/display/SPACE/2024/01/31/Post+Title``) and
+        ``viewpage.action?spaceKey=SPACE&title=Page+Title``.
+
+        Args:
+            url: Confluence page URL
+
+        Returns:
+            Tuple of (space_key, title) or None; blog post titles keep their date prefix
+        """
+        parts = urlsplit(url)
+        match = re.search(r'/display/([^/]+)/(.+?)/?$', parts.path)
+        if match:
+            return unquote_plus(match.group(1)), unquote_plus(match.group(2))
+        query = parse_qs(parts.query)
+        if 'spaceKey' in query and 'title' in query:
+            return query['spaceKey'][0], query['title'][0]
         return None
 
+    def resolve_page_id(self, url: str) -> Optional[str]:
+        """
+        Find the page ID of any Confluence page URL.
+
+        IDs in the URL are used directly. Display URLs are looked up in the
+        (space, title) index, and searched by title only when missing from
+        it. Other URLs (short links, display URLs of renamed pages) are
+        resolved by following their redirects once, and remembered.
+
+        Args:
+            url: Confluence page URL
+
+        Returns:
+            Page ID or None if the URL does not lead to a page
+        """
+        return self._resolve_page_id(url)[0]
+
+    def _resolve_page_id(self, url: str) -> Tuple[Optional[str], Optional[Tuple[str, str]]]:
+        """
+        Find the page ID of a URL.
+
+        Returns:
+            Tuple of (page ID or None, page index entry it came from as
+            ('titles', key) or ('urls', url), or None if it was not indexed)
+        """
+        page_id = self.extract_page_id_from_url(url)
+        if page_id:
+            return page_id, None
+
+        key = self.parse_display_url(url)
+        if key:
+            title_key = self._title_key(*key)
+            if title_key in self._page_index['titles']:
+                return self._page_index['titles'][title_key], ('titles', title_key)
+        # Checked before searching, as display URLs of renamed pages are remembered here
+        if url in self._page_index['urls']:
+            return self._page_index['urls'][url], ('urls', url)
+
+        if key:
+            page_id = self._search_page_id(*key)
+            if page_id:
+                self._update_page_index(titles={title_key: page_id})
+                return page_id, None
+        page_id = self._follow_redirects(url)
+        if page_id:
+            self._update_page_index(urls={url: page_id})
+        return page_id, None
+
+    @staticmethod
+    def _title_key(space_key: str, title: str) -> str:
+        """Build the page index key of a space and title."""
+        return f"{space_key}/{title}"
+
+    @classmethod
+    def _page_key(cls, page: Dict[str, Any]) -> Optional[str]:
+        """Build the page index key of a fetched page, or None if its space or title is missing."""
+        space_key = (page.get('space') or {}).get('key')
+        title = page.get('title')
+        if not space_key or not title:
+            return None
+        if page.get('type') == 'blogpost':
+            # Blog post display URLs carry the posting day
+            day = (page.get('history') or {}).get('createdDate', '')[:10].replace('-', '/')
+            title = f"{day}/{title}"
+        return cls._title_key(space_key, title)
+
+    def _search_page_id(self, space_key: str, title: str) -> Optional[str]:
+        """Look up the ID of a page (or dated blog post) by space and title."""
+        params = {'spaceKey': space_key, 'title': title}
+        blog_post = re.match(r'(\d{4})/(\d{2})/(\d{2})/(.+)$', title)
+        if blog_post:
+            year, month, day, post_title = blog_post.groups()
+            params = {'spaceKey': space_key, 'title': post_title, 'type': 'blogpost',
+                      'postingDay': f"{year}-{month}-{day}"}
+        response = self.transport.get(
+            f"{self.base_url}/rest/api/content", auth=self.auth, headers=self.headers,
+            params=params, cacheable=False
+        )
+        response.raise_for_status()
+        results = response.json().get('results', [])
+        return str(results[0]['id']) if results else None
+
+    def _follow_redirects(self, url: str) -> Optional[str]:
+        """Resolve a short or outdated URL by the page URL it redirects to."""
+        # Credentials are only sent to Confluence itself
+        auth = self.auth if url.startswith(self.base_url + '/') else None
+        try:
+            response = self.transport.request('HEAD', url, cacheable=False, auth=auth, allow_redirects=True)
+        except requests.exceptions.RequestException:
+            return None
+        if not response.ok or response.url == url:
+            return None
+        page_id = self.extract_page_id_from_url(response.url)
+        key = self.parse_display_url(response.url)
+        if not page_id and key:
+            page_id = self._page_index['titles'].get(self._title_key(*key)) or self._search_page_id(*key)
+        return page_id
+
+    def remember_page(self, page: Dict[str, Any]):
+        """
+        Record a fetched page's current space and title in the page index.
+
+        Index entries of the page under a previous title are dropped, so a
+        renamed page is looked up again by its old title.
+
+        Args:
+            page: Page as returned by the REST API (with the space expanded)
+        """
+        key = self._page_key(page)
+        if not key or not page.get('id'):
+            return
+        page_id = str(page['id'])
+        with self._index_lock:
+            titles = self._page_index['titles']
+            if titles.get(key) == page_id and list(titles.values()).count(page_id) == 1:
+                return
+        self._update_page_index(
+            titles={key: page_id},
+            forget=[('titles', old) for old, known_id in list(self._page_index['titles'].items())
+                    if known_id == page_id and old != key]
+        )
+
+    def _update_page_index(
+        self,
+        titles: Optional[Dict[str, str]] = None,
+        urls: Optional[Dict[str, str]] = None,
+        forget: Iterable[Tuple[str, str]] = ()
+    ):
+        """Add and remove page index entries (forget lists (section, key) pairs) and persist the index."""
+        with self._index_lock:
+            for section, key in forget:
+                self._page_index[section].pop(key, None)
+            self._page_index['titles'].update(titles or {})
+            self._page_index['urls'].update(urls or {})
+            if self.page_index_path:
+                directory = os.path.dirname(self.page_index_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                tmp_path = f"{self.page_index_path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._page_index, f, indent=0, sort_keys=True)
+                os.replace(tmp_path, self.page_index_path)
+
     def get_page(self, page_id: str) -> Dict[str, Any]:
         """
         Fetch Confluence page by ID.
@@ -56,10 +275,39 @@ class ConfluenceClient:
         params = {
             'expand': 'body.storage,version,space,history'
         }
-        response = requests.get(url, auth=self.auth, headers=self.headers, params=params)
+        response = self.transport.get(
+            url, auth=self.auth, headers=self.headers, params=params,
+            version=lambda r: self._page_version(page_id, r)
+        )
         response.raise_for_status()
         return response.json()
 
+    def _page_version(self, page_id: str, response=None) -> Optional[str]:
+        """
+        Get the page's version number, used to revalidate cached responses.
+
+        Called with a downloaded page response, the number is read from it.
+        Otherwise it is probed with an ``expand=version`` request that skips
+        the page body.
+
+        Args:
+            page_id: Confluence page ID
+            response: Optional downloaded page response
+
+        Returns:
+            Page version number as a string, or None if unknown
+        """
+        if response is None:
+            response = self.transport.get(
+                f"{self.base_url}/rest/api/content/{page_id}",
+                auth=self.auth, headers=self.headers,
+                params={'expand': 'version'}, cacheable=False
+            )
+            if not response.ok:
+                return None
+        number = response.json().get('version', {}).get('number')
+        return str(number) if number is not None else None
+
     def get_page_comments(self, page_id: str) -> List[Dict[str, Any]]:
         """
         Fetch comments for a Confluence page.
@@ -74,7 +322,7 @@ class ConfluenceClient:
         params = {
             'expand': 'body.view,version,history'
         }
-        response = requests.get(url, auth=self.auth, headers=self.headers, params=params)
+        response = self.transport.get(url, auth=self.auth, headers=self.headers, params=params)
         response.raise_for_status()
         data = response.json()
         return data.get('results', [])
@@ -96,33 +344,73 @@ class ConfluenceClient:
             'title': title,
             'expand': 'body.storage,version,space,history'
         }
-        response = requests.get(url, auth=self.auth, headers=self.headers, params=params)
+        response = self.transport.get(url, auth=self.auth, headers=self.headers, params=params)
         response.raise_for_status()
         data = response.json()
         results = data.get('results', [])
         return results[0] if results else None
 
-    def get_page_analysis_data(self, page_url: str) -> Dict[str, Any]:
+    def get_page_analysis_data(self, page_url: str, concurrent: bool = False) -> Dict[str, Any]:
         """
         Get comprehensive page data for analysis.
 
         Args:
             page_url: URL to Confluence page
+            concurrent: Fetch the page and its comments in parallel
 
         Returns:
             Dictionary with page content and metadata
         """
-        page_id = self.extract_page_id_from_url(page_url)
+        page_id, indexed = self._resolve_page_id(page_url)
         if not page_id:
-            raise ValueError(f"Could not extract page ID from URL: {page_url}. Please use URLs with pageId parameter.")
+            raise ValueError(f"Could not find the Confluence page of URL: {page_url}")
+
+        fetch = lambda page_id: run_concurrently({
+            'page': lambda: self.get_page(page_id),
+            'comments': lambda: self.get_page_comments(page_id)
+        }, max_workers=None if concurrent else 1)
+        try:
+            results = fetch(page_id)
+        except requests.exceptions.HTTPError as e:
+            if not indexed or e.response is None or e.response.status_code != 404:
+                raise
+            results = None
 
-        page = self.get_page(page_id)
-        comments = self.get_page_comments(page_id)
+        if indexed and (results is None or indexed[0] == 'titles' and self._page_key(results['page']) != indexed[1]):
+            # The indexed page was renamed, moved or deleted since: look the URL up again
+            self._update_page_index(forget=[indexed])
+            page_id, _ = self._resolve_page_id(page_url)
+            if not page_id:
+                raise ValueError(f"Could not find the Confluence page of URL: {page_url}")
+            if results is None or str(results['page'].get('id')) != page_id:
+                results = fetch(page_id)
+        page = results['page']
+        comments = results['comments']
+        self.remember_page(page)
 
+        return self.build_page_analysis_data(page_id, page, comments)
+
+    @staticmethod
+    def build_page_analysis_data(
+        page_id: str,
+        page: Dict[str, Any],
+        comments: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Shape fetched page data into the analysis dictionary.
+
+        Args:
+            page_id: Confluence page ID
+            page: Page as returned by the REST API
+            comments: List of comment dictionaries
+
+        Returns:
+            Dictionary with page content and metadata
+        """
         return {
             'page_id': page_id,
             'title': page.get('title', ''),
-            'content': page.get('body', {}).get('storage', {}).get('value', ''),
+            'content': storage_to_markdown(page.get('body', {}).get('storage', {}).get('value', '')),
             'space': page.get('space', {}).get('name', ''),
             'space_key': page.get('space', {}).get('key', ''),
             'created_by': page.get('history', {}).get('createdBy', {}).get('displayName', ''),
@@ -0,0 +1,95 @@
+"""
+Discovery of GitLab merge requests, Confluence pages and Jira keys referenced by a ticket.
+"""
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterable, List, Pattern
+from src.config import Config
+
+
+# Characters that end a URL inside Jira wiki markup ([title|url], {code}...)
+URL_END = r'\s\[\]|{}<>"\''
+
+# Maximum number of Jira keys mentioned in a ticket that are fetched as linked tickets
+MAX_DISCOVERED_TICKETS = 20
+
+
+@lru_cache(maxsize=8)
+def reference_pattern(gitlab_url: str, confluence_url: str) -> Pattern:
+    """
+    Compile the single multi-pattern matcher for ticket text.
+
+    Alternatives are tried left to right at each position, so URLs are
+    matched before the Jira keys that may appear inside them.
+
+    Args:
+        gitlab_url: GitLab base URL, without trailing slash
+        confluence_url: Confluence base URL, without trailing slash
+
+    Returns:
+        Compiled pattern with 'mr', 'page_id', 'display' and 'jira_key' groups
+    """
+    alternatives = []
+    if gitlab_url:
+        alternatives.append(
+            rf'(?P<mr>{re.escape(gitlab_url)}/[^{URL_END}]+?/-/merge_requests/\d+)'
+        )
+    if confluence_url:
+        alternatives.append(
+            rf'(?P<page_id>{re.escape(confluence_url)}/[^{URL_END}]*?[?&]pageId=\d+)'
+        )
+        alternatives.append(
+            rf'(?P<display>{re.escape(confluence_url)}/display/[^/{URL_END}]+/[^?#{URL_END}]+)'
+        )
+    alternatives.append(r'(?<![\w-])(?P<jira_key>[A-Z][A-Z0-9_]+-[1-9]\d*)(?![\w-])')
+    return re.compile('|'.join(alternatives))
+
+
+@dataclass
+class DiscoveredReferences:
+    """Deduplicated references found for a ticket, in order of first appearance."""
+
+    merge_requests: List[str] = field(default_factory=list)
+    confluence_pages: List[str] = field(default_factory=list)
+    jira_keys: List[str] = field(default_factory=list)
+
+    def add_url(self, url: str) -> bool:
+        """
+        Classify and add a URL found outside the ticket text (remote links, dev-status).
+
+        Args:
+            url: Absolute URL
+
+        Returns:
+            Whether the URL was a new reference
+        """
+        before = self.count()
+        self.scan([url])
+        return self.count() > before
+
+    def scan(self, texts: Iterable[str]):
+        """
+        Add every reference found in the given texts.
+
+        Args:
+            texts: Ticket description, comment bodies, URLs...
+        """
+        pattern = reference_pattern(Config.GITLAB_URL.rstrip('/'), Config.CONFLUENCE_URL.rstrip('/'))
+        for text in texts:
+            for match in pattern.finditer(text or ''):
+                if match.group('jira_key'):
+                    self._append(self.jira_keys, match.group('jira_key'))
+                elif match.group('mr'):
+                    self._append(self.merge_requests, match.group('mr'))
+                else:
+                    self._append(self.confluence_pages, match.group('page_id') or match.group('display'))
+
+    @staticmethod
+    def _append(items: List[str], item: str):
+        if item not in items:
+            items.append(item)
+
+    def count(self) -> int:
+        """Return the total number of references."""
+        return len(self.merge_requests) + len(self.confluence_pages) + len(self.jira_keys)
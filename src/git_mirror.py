@@ -0,0 +1,301 @@
+"""
+Local bare mirror clones of GitLab repositories for computing MR diffs offline.
+"""
+import base64
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+from src.config import Config
+
+
+# Old and new line counts of a unified diff hunk (omitted when 1)
+HUNK_HEADER = re.compile(r'^@@ -\d+(?:,(\d+))? \+\d+(?:,(\d+))? @@')
+
+
+class GitMirrorError(Exception):
+    """Raised when a git command on a mirror fails."""
+
+
+class GitMirror:
+    """
+    Bare ``git clone --mirror`` copies of GitLab projects kept in a cache directory.
+
+    Mirrors are created on first use and updated with incremental fetches
+    only when a requested commit is missing, so repeated analyses of the same
+    MR never touch the network. Diffs are computed locally between the MR's
+    ``diff_refs`` and shaped like the GitLab changes API, without its payload
+    limits.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        remote_url: Optional[str] = None,
+        projects: Optional[List[str]] = None,
+        token: Optional[str] = None
+    ):
+        """
+        Initialize the mirror set.
+
+        Args:
+            cache_dir: Directory holding the bare mirrors (default: GIT_MIRROR_DIR or <QA_CACHE_DIR>/git)
+            remote_url: Base URL or directory the projects are cloned from (default: GIT_MIRROR_URL or GITLAB_URL)
+            projects: Project paths to mirror (default: GIT_MIRROR_PROJECTS; empty means every project)
+            token: GitLab access token for HTTP remotes (default: GITLAB_PERSONAL_ACCESS_TOKEN)
+        """
+        self.cache_dir = cache_dir or Config.GIT_MIRROR_DIR or os.path.join(Config.QA_CACHE_DIR, 'git')
+        self.remote_url = (remote_url or Config.GIT_MIRROR_URL or Config.GITLAB_URL).rstrip('/')
+        if projects is None:
+            projects = [p.strip() for p in Config.GIT_MIRROR_PROJECTS.split(',') if p.strip()]
+        self.projects = set(projects)
+        self.token = token if token is not None else Config.GITLAB_PERSONAL_ACCESS_TOKEN
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def handles(self, project_path: str) -> bool:
+        """Whether MRs of this project are computed from a mirror."""
+        return not self.projects or project_path in self.projects
+
+    def path_for(self, project_path: str) -> str:
+        """Return the bare mirror directory of a project."""
+        return os.path.join(self.cache_dir, f"{project_path}.git")
+
+    def _lock_for(self, project_path: str) -> threading.Lock:
+        """Get the lock serializing clones and fetches of one mirror."""
+        with self._lock:
+            return self._locks.setdefault(project_path, threading.Lock())
+
+    def _git(self, args: List[str], git_dir: Optional[str] = None, remote: bool = False) -> bytes:
+        """
+        Run a git command and return its standard output.
+
+        Args:
+            args: git arguments
+            git_dir: Repository to run in (GIT_DIR)
+            remote: Whether the command talks to the remote (adds the token header)
+
+        Returns:
+            Raw standard output
+
+        Raises:
+            GitMirrorError: If git exits with an error
+        """
+        command = ['git']
+        if git_dir:
+            command += ['--git-dir', git_dir]
+        env = dict(os.environ, GIT_TERMINAL_PROMPT='0')
+        if remote and self.token and self.remote_url.startswith(('http://', 'https://')):
+            # Passed per command through the environment, so the token is neither
+            # written to the mirror's config nor visible in the process list
+            credentials = base64.b64encode(f"oauth2:{self.token}".encode('utf-8')).decode('ascii')
+            index = int(env.get('GIT_CONFIG_COUNT') or 0)
+            env.update({
+                'GIT_CONFIG_COUNT': str(index + 1),
+                f"GIT_CONFIG_KEY_{index}": 'http.extraHeader',
+                f"GIT_CONFIG_VALUE_{index}": f"Authorization: Basic {credentials}"
+            })
+        result = subprocess.run(command + args, capture_output=True, env=env)
+        if result.returncode != 0:
+            raise GitMirrorError(
+                f"git {' '.join(args[:2])} failed: {result.stderr.decode('utf-8', 'replace').strip()}"
+            )
+        return result.stdout
+
+    def _has_commit(self, git_dir: str, sha: str) -> bool:
+        """Check whether a commit is present in a mirror."""
+        try:
+            self._git(['cat-file', '-e', f"{sha}^{{commit}}"], git_dir)
+            return True
+        except GitMirrorError:
+            return False
+
+    def sync(self, project_path: str, shas: List[str] = ()) -> str:
+        """
+        Create or update a project's mirror so that it contains the given commits.
+
+        The mirror is cloned on first use. Afterwards it is fetched only when
+        one of ``shas`` is missing; commits that are no longer reachable from
+        any ref (e.g. after a force push) are then fetched by SHA.
+
+        Args:
+            project_path: GitLab project path
+            shas: Commits that must be present
+
+        Returns:
+            Bare mirror directory
+
+        Raises:
+            GitMirrorError: If cloning or fetching fails or a commit cannot be found
+        """
+        git_dir = self.path_for(project_path)
+        with self._lock_for(project_path):
+            if not os.path.isdir(git_dir):
+                parent = os.path.dirname(git_dir)
+                os.makedirs(parent, exist_ok=True)
+                # Clone next to the final path and move it in place, so an
+                # interrupted clone never leaves a half-written mirror behind
+                tmp_dir = tempfile.mkdtemp(dir=parent, prefix='.clone-')
+                try:
+                    self._git(
+                        ['clone', '--mirror', '--quiet', f"{self.remote_url}/{project_path}.git", tmp_dir],
+                        remote=True
+                    )
+                    os.replace(tmp_dir, git_dir)
+                finally:
+                    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+            missing = [sha for sha in shas if sha and not self._has_commit(git_dir, sha)]
+            if missing:
+                self._git(['fetch', '--prune', '--quiet', 'origin'], git_dir, remote=True)
+                missing = [sha for sha in missing if not self._has_commit(git_dir, sha)]
+            if missing:
+                self._git(['fetch', '--quiet', 'origin'] + missing, git_dir, remote=True)
+        return git_dir
+
+    def diff(self, project_path: str, base_sha: str, head_sha: str) -> List[Dict[str, Any]]:
+        """
+        Compute per-file diffs between two commits.
+
+        Args:
+            project_path: GitLab project path (its mirror must contain both commits)
+            base_sha: Base commit (MR diff_refs.base_sha)
+            head_sha: Head commit (MR diff_refs.head_sha)
+
+        Returns:
+            List of changes shaped like the GitLab changes API (old_path, new_path,
+            new_file, deleted_file, renamed_file, diff)
+        """
+        git_dir = self.path_for(project_path)
+        raw = self._git(['diff', '--raw', '-z', '-M', '--no-abbrev', base_sha, head_sha], git_dir)
+        patches = self._patches(git_dir, base_sha, head_sha)
+
+        changes = []
+        fields = raw.decode('utf-8', 'surrogateescape').split('\0')
+        i = 0
+        while i < len(fields) - 1:
+            status = fields[i].split()[-1]
+            old_path = fields[i + 1]
+            new_path = fields[i + 2] if status[0] in 'RC' else old_path
+            i += 3 if status[0] in 'RC' else 2
+            header = f"a/{old_path} b/{new_path}"
+            # Both listings come in the same order; a patch whose header does not
+            # match (quoted special characters) is computed for its paths alone
+            if len(changes) < len(patches) and patches[len(changes)][0] == header:
+                diff = patches[len(changes)][1]
+            else:
+                single = self._patches(git_dir, base_sha, head_sha, [old_path, new_path])
+                diff = single[0][1] if single else ''
+            changes.append({
+                'old_path': old_path,
+                'new_path': new_path,
+                'new_file': status[0] == 'A',
+                'deleted_file': status[0] == 'D',
+                'renamed_file': status[0] == 'R',
+                'diff': diff
+            })
+        return changes
+
+    def _patches(
+        self,
+        git_dir: str,
+        base_sha: str,
+        head_sha: str,
+        paths: Optional[List[str]] = None
+    ) -> List[Tuple[str, str]]:
+        """
+        Split a unified diff into per-file patches.
+
+        Hunks are consumed by the line counts in their ``@@`` headers, so file
+        contents that look like patch headers (e.g. committed .patch files)
+        never start a new file.
+
+        Args:
+            git_dir: Bare mirror directory
+            base_sha: Base commit
+            head_sha: Head commit
+            paths: Limit the diff to these paths
+
+        Returns:
+            List of (``diff --git`` header without the prefix, hunks) tuples; the
+            hunks are empty for binary files and pure renames or mode changes
+        """
+        output = self._git(
+            ['-c', 'core.quotePath=false', 'diff', '-M', '--no-color', '--no-ext-diff',
+             '--src-prefix=a/', '--dst-prefix=b/', base_sha, head_sha]
+            + (['--'] + paths if paths else []),
+            git_dir
+        ).decode('utf-8', 'replace')
+        lines = output.split('\n')
+        patches = []
+        i = 0
+        while i < len(lines):
+            if not lines[i].startswith('diff --git '):
+                i += 1
+                continue
+            header = lines[i][len('diff --git '):]
+            i += 1
+            # Extended headers (index, mode, rename, ---/+++, Binary files) are dropped
+            while i < len(lines) and not lines[i].startswith(('@@ ', 'diff --git ')):
+                i += 1
+            hunks = []
+            while i < len(lines) and lines[i].startswith('@@ '):
+                match = HUNK_HEADER.match(lines[i])
+                old_count = int(match.group(1) or 1) if match else 0
+                new_count = int(match.group(2) or 1) if match else 0
+                hunks.append(lines[i])
+                i += 1
+                while i < len(lines) and (old_count > 0 or new_count > 0 or lines[i].startswith('\\')):
+                    line = lines[i]
+                    if line.startswith('-'):
+                        old_count -= 1
+                    elif line.startswith('+'):
+                        new_count -= 1
+                    elif not line.startswith('\\'):
+                        old_count -= 1
+                        new_count -= 1
+                    hunks.append(line)
+                    i += 1
+            patches.append((header, '\n'.join(hunks) + '\n' if hunks else ''))
+        return patches
+
+    def diff_stats(self, project_path: str, base_sha: str, head_sha: str) -> Dict[str, int]:
+        """
+        Count changed files and lines between two commits.
+
+        Args:
+            project_path: GitLab project path
+            base_sha: Base commit
+            head_sha: Head commit
+
+        Returns:
+            Dictionary with 'files', 'additions' and 'deletions'
+        """
+        output = self._git(['diff', '--numstat', '-z', '-M', base_sha, head_sha], self.path_for(project_path))
+        stats = {'files': 0, 'additions': 0, 'deletions': 0}
+        for entry in output.decode('utf-8', 'surrogateescape').split('\0'):
+            counts = entry.split('\t')
+            if len(counts) < 3:
+                continue  # path of a rename, which numstat -z lists separately
+            stats['files'] += 1
+            # Binary files are reported as "-"
+            stats['additions'] += int(counts[0]) if counts[0].isdigit() else 0
+            stats['deletions'] += int(counts[1]) if counts[1].isdigit() else 0
+        return stats
+
+    def file_content(self, project_path: str, sha: str, path: str) -> bytes:
+        """
+        Read a file as it is at a commit.
+
+        Args:
+            project_path: GitLab project path
+            sha: Commit SHA
+            path: File path in the repository
+
+        Returns:
+            Raw file contents
+        """
+        return self._git(['cat-file', 'blob', f"{sha}:{path}"], self.path_for(project_path))
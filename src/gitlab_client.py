@@ -1,22 +1,160 @@
 """
 GitLab API client for fetching merge request information.
 """
+import hashlib
+import json
+import os
+import re
+import threading
 import requests
-from typing import Dict, List, Any, Optional
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
 from urllib.parse import quote
 from src.config import Config
+from src.http_transport import HTTPTransport, VersionProbe
+from src.concurrency import run_concurrently, map_ordered
+from src.git_mirror import GitMirror, GitMirrorError
+from src.blob_cache import BlobCache
+from src.mr_state import MergeRequestStateStore
+from src.pipeline_cache import PipelineCache
+
+
+HUNK_HEADER = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@', re.MULTILINE)
+
+# Terminal escape codes and collapsible section markers in CI job logs
+JOB_LOG_MARKUP = re.compile(r'\x1b\[[0-9;]*[A-Za-z]|section_(?:start|end):\d+:[^\r\n]*?\r')
+
+# Maximum number of failing jobs whose log tails are fetched per pipeline
+MAX_FAILED_JOB_LOGS = 5
+
+# Maximum number of failed test cases kept from a pipeline's test report
+MAX_FAILED_TEST_CASES = 20
+
+
+def patch_id(path: str, diff: str) -> Optional[str]:
+    """
+    Fingerprint a file diff like ``git patch-id``.
+
+    Only added and removed lines count, with all whitespace removed, so the
+    same change applied at other line numbers (a cherry-pick or backport)
+    gets the same fingerprint.
+
+    Args:
+        path: File path
+        diff: Unified diff of the file
+
+    Returns:
+        Hex digest, or None for diffs without changed lines (binary files, pure renames)
+    """
+    digest = hashlib.sha1(path.encode('utf-8'))
+    changed = False
+    for line in diff.splitlines():
+        if line[:1] in ('+', '-') and not line.startswith(('+++ ', '--- ')):
+            digest.update(line[0].encode('utf-8') + ''.join(line[1:].split()).encode('utf-8') + b'\n')
+            changed = True
+    return digest.hexdigest() if changed else None
+
+
+def commit_fingerprint(commit: Dict[str, Any]) -> str:
+    """
+    Fingerprint a commit so that its cherry-picks match it.
+
+    Cherry-picks keep the author, authored date and message of the original
+    commit, while their SHAs differ.
+
+    Args:
+        commit: Commit as returned by the REST API
+
+    Returns:
+        Hex digest
+    """
+    key = '\0'.join(str(commit.get(field) or '') for field in ('author_email', 'authored_date', 'message', 'title'))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+@lru_cache(maxsize=1024)
+def parse_mr_url(base_url: str, url: str) -> Optional[Tuple[str, str]]:
+    """
+    Split a merge request URL into project path and IID (memoized).
+
+    Args:
+        base_url: GitLab base URL, without trailing slash
+        url: Merge request URL, e.g. https://gitlab.example.com/group/project/-/merge_requests/123/diffs
+
+    Returns:
+        Tuple of (project_path, mr_iid) or None
+    """
+    match = re.match(r'(.+?)/-/merge_requests/(\d+)(?:[/?#]|$)', url)
+    if not match:
+        return None
+    project_path = match.group(1)
+    if project_path.startswith(base_url + '/'):
+        project_path = project_path[len(base_url) + 1:]
+    return (project_path, match.group(2))
 
 
 class GitLabClient:
     """Client for interacting with GitLab API."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        transport: Optional[HTTPTransport] = None,
+        max_diff_files: Optional[int] = None,
+        mirror: Optional[GitMirror] = None,
+        blob_cache: Optional[BlobCache] = None,
+        context_lines: Optional[int] = None,
+        context_files: int = 10,
+        project_index_path: Optional[str] = None,
+        state_store: Optional[MergeRequestStateStore] = None,
+        pipelines: bool = False,
+        pipeline_cache: Optional[PipelineCache] = None
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            transport: Shared HTTP transport (a new one is created if omitted)
+            max_diff_files: Download only the first N file diffs of each MR from the
+                paginated diffs endpoint instead of every diff from the changes endpoint
+            mirror: Local git mirrors used to compute the diffs of the projects they handle
+            blob_cache: Content-addressed cache for file contents fetched from the API
+            context_lines: Add up to this many lines of post-change file context around
+                each hunk, extended to the enclosing block (default: no context)
+            context_files: Number of changed files per MR that get context
+            project_index_path: JSON file persisting the project path -> ID index
+                across runs (default: kept in memory only)
+            state_store: Record of previous analyses; MRs found in it are updated
+                incrementally instead of fetched again
+            pipelines: Add the head pipeline's jobs, test report and failing job
+                log tails to the analysis data
+            pipeline_cache: Store for the summaries of finished pipelines
+        """
+        self.transport = transport or HTTPTransport()
+        self.max_diff_files = max_diff_files
+        self.mirror = mirror
+        self.blob_cache = blob_cache
+        self.context_lines = context_lines
+        self.context_files = context_files
         self.base_url = Config.GITLAB_URL.rstrip('/')
         self.token = Config.GITLAB_PERSONAL_ACCESS_TOKEN
         self.headers = {
             'PRIVATE-TOKEN': self.token,
             'Content-Type': 'application/json'
         }
+        self.state_store = state_store
+        self.pipelines = pipelines
+        self.pipeline_cache = pipeline_cache
+        self.project_index_path = project_index_path
+        self._project_ids: Dict[str, int] = {}
+        self._project_urls: Dict[str, str] = {}
+        self._index_lock = threading.Lock()
+        if project_index_path and os.path.exists(project_index_path):
+            try:
+                with open(project_index_path, encoding='utf-8') as f:
+                    self._project_ids = {path: int(pid) for path, pid in json.load(f).items()}
+            except (OSError, ValueError, AttributeError):
+                pass  # unreadable index; rebuilt as projects are seen
 
     def extract_mr_info_from_url(self, url: str) -> Optional[tuple[str, str]]:
         """
@@ -29,15 +167,48 @@ class GitLabClient:
             Tuple of (project_path, mr_iid) or None
         """
         # Handle URLs like https://gitlab.paysera.net/project/subproject/-/merge_requests/123
-        try:
-            parts = url.split('/-/merge_requests/')
-            if len(parts) == 2:
-                mr_iid = parts[1].split('?')[0].split('#')[0]
-                project_part = parts[0].replace(self.base_url + '/', '')
-                return (project_part, mr_iid)
-        except Exception:
-            pass
-        return None
+        return parse_mr_url(self.base_url, url)
+
+    def remember_project(self, project_path: str, project_id: Optional[int]):
+        """
+        Record a project's numeric ID, so API URLs use it instead of the encoded path.
+
+        Args:
+            project_path: GitLab project path
+            project_id: Project ID (ignored if None)
+        """
+        if project_id is None:
+            return
+        with self._index_lock:
+            if self._project_ids.get(project_path) == project_id:
+                return
+            self._project_ids[project_path] = project_id
+            self._project_urls.pop(project_path, None)
+            if self.project_index_path:
+                directory = os.path.dirname(self.project_index_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                tmp_path = f"{self.project_index_path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._project_ids, f, indent=0, sort_keys=True)
+                os.replace(tmp_path, self.project_index_path)
+
+    def _project_url(self, project_path: str) -> str:
+        """
+        Build (once per project) the API URL of a project.
+
+        Args:
+            project_path: GitLab project path
+
+        Returns:
+            Project API URL, by numeric ID when known and by encoded path otherwise
+        """
+        url = self._project_urls.get(project_path)
+        if url is None:
+            project_id = self._project_ids.get(project_path)
+            project_ref = str(project_id) if project_id is not None else quote(project_path, safe='')
+            url = self._project_urls[project_path] = f"{self.base_url}/api/v4/projects/{project_ref}"
+        return url
 
     def get_merge_request(self, project_path: str, mr_iid: str) -> Dict[str, Any]:
         """
@@ -50,69 +221,711 @@ class GitLabClient:
         Returns:
             Dictionary containing MR information
         """
-        encoded_project = quote(project_path, safe='')
-        url = f"{self.base_url}/api/v4/projects/{encoded_project}/merge_requests/{mr_iid}"
-        response = requests.get(url, headers=self.headers)
+        url = f"{self._project_url(project_path)}/merge_requests/{mr_iid}"
+        response = self.transport.get(url, headers=self.headers)
         response.raise_for_status()
-        return response.json()
+        mr = response.json()
+        self.remember_project(project_path, mr.get('project_id'))
+        return mr
+
+    @staticmethod
+    def _mr_version(mr: Optional[Dict[str, Any]]):
+        """
+        Build a version probe for MR sub-resources from already-fetched MR details.
 
-    def get_merge_request_changes(self, project_path: str, mr_iid: str) -> Dict[str, Any]:
+        The MR's ``updated_at`` and head ``sha`` change whenever its commits,
+        diffs or discussions do, so cached sub-resources tagged with the same
+        values can be reused without downloading them again.
+
+        Args:
+            mr: MR details, or None if not fetched yet
+
+        Returns:
+            Version callable for HTTPTransport.request, or None
+        """
+        if not mr:
+            return None
+        version = f"{mr.get('updated_at')}|{mr.get('sha')}"
+        return lambda response: version
+
+    def get_merge_request_changes(
+        self,
+        project_path: str,
+        mr_iid: str,
+        mr: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Fetch merge request file changes.
 
         Args:
             project_path: GitLab project path
             mr_iid: Merge request IID
+            mr: Already-fetched MR details, used to revalidate cached data
 
         Returns:
             Dictionary containing MR changes
         """
-        encoded_project = quote(project_path, safe='')
-        url = f"{self.base_url}/api/v4/projects/{encoded_project}/merge_requests/{mr_iid}/changes"
-        response = requests.get(url, headers=self.headers)
+        url = f"{self._project_url(project_path)}/merge_requests/{mr_iid}/changes"
+        response = self.transport.get(url, headers=self.headers, version=self._mr_version(mr))
         response.raise_for_status()
         return response.json()
 
-    def get_merge_request_discussions(self, project_path: str, mr_iid: str) -> List[Dict[str, Any]]:
+    def get_merge_request_diffs(
+        self,
+        project_path: str,
+        mr_iid: str,
+        mr: Optional[Dict[str, Any]] = None,
+        max_files: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
-        Fetch merge request discussions/comments.
+        Fetch merge request file diffs from the paginated diffs endpoint.
+
+        Unlike the changes endpoint, which returns every file's diff in one
+        response, pages are sized to ``max_files`` and requested only until
+        that many files are downloaded. The total file count comes from the
+        ``X-Total`` header. GitLab versions without the diffs endpoint
+        (before 15.7) fall back to the changes endpoint.
 
         Args:
             project_path: GitLab project path
             mr_iid: Merge request IID
+            mr: Already-fetched MR details, used to revalidate cached data
+            max_files: Stop after this many files (default: all files)
 
         Returns:
-            List of discussion dictionaries
+            Dictionary with the downloaded 'changes' and the 'files_total' count
+        """
+        url = f"{self._project_url(project_path)}/merge_requests/{mr_iid}/diffs"
+        per_page = min(max_files, 100) if max_files else 100
+        changes = []
+        files_total = None
+        try:
+            for response in self._iter_page_responses(url, version=self._mr_version(mr), per_page=per_page):
+                if files_total is None and response.headers.get('X-Total'):
+                    files_total = int(response.headers['X-Total'])
+                changes.extend(response.json())
+                if max_files and len(changes) >= max_files:
+                    break
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code != 404:
+                raise
+            changes = self.get_merge_request_changes(project_path, mr_iid, mr=mr).get('changes', [])
+            files_total = len(changes)
+
+        return {
+            'changes': changes[:max_files] if max_files else changes,
+            'files_total': files_total if files_total is not None else len(changes)
+        }
+
+    def get_merge_request_mirror_changes(self, project_path: str, mr: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compute merge request file changes from the project's local git mirror.
+
+        The mirror is fetched only if it lacks the MR's commits; the diff
+        between ``diff_refs.base_sha`` and ``head_sha`` is then computed
+        locally, with no API payload limit.
+
+        Args:
+            project_path: GitLab project path
+            mr: MR details with diff_refs
+
+        Returns:
+            Dictionary with 'changes', 'files_total' and 'diff_stats'
+
+        Raises:
+            GitMirrorError: If the mirror cannot be updated or diffed
+        """
+        diff_refs = mr.get('diff_refs') or {}
+        base_sha, head_sha = diff_refs.get('base_sha'), diff_refs.get('head_sha')
+        if not base_sha or not head_sha:
+            raise GitMirrorError(f"MR !{mr.get('iid')} has no diff_refs")
+        self.mirror.sync(project_path, [base_sha, head_sha])
+        changes = self.mirror.diff(project_path, base_sha, head_sha)
+        return {
+            'changes': changes,
+            'files_total': len(changes),
+            'diff_stats': self.mirror.diff_stats(project_path, base_sha, head_sha)
+        }
+
+    def get_file_content(self, project_path: str, ref: str, path: str) -> bytes:
+        """
+        Fetch a repository file as it is at a commit.
+
+        Projects with a local git mirror are read from it. Otherwise, with a
+        blob cache, the file's blob SHA is looked up (with a HEAD request to the
+        files API, remembered per commit) and the blob is downloaded only if
+        it is not cached yet, so files touched by many MRs are fetched once.
+
+        Args:
+            project_path: GitLab project path
+            ref: Commit SHA (branch names work too but are not cached)
+            path: File path in the repository
+
+        Returns:
+            Raw file contents
+        """
+        if self.mirror is not None and self.mirror.handles(project_path):
+            try:
+                return self.mirror.file_content(project_path, ref, path)
+            except GitMirrorError:
+                pass  # not mirrored yet; use the API
+
+        file_url = f"{self._project_url(project_path)}/repository/files/{quote(path, safe='')}"
+        if self.blob_cache is None:
+            return self._get(f"{file_url}/raw", {'ref': ref}).content
+
+        immutable_ref = re.fullmatch(r'[0-9a-f]{40}|[0-9a-f]{64}', ref) is not None
+        blob_sha = self.blob_cache.get_entry(project_path, ref, path) if immutable_ref else None
+        if blob_sha is None:
+            response = self.transport.request(
+                'HEAD', file_url, cacheable=False, headers=self.headers, params={'ref': ref}
+            )
+            response.raise_for_status()
+            blob_sha = response.headers['X-Gitlab-Blob-Id']
+            if immutable_ref:
+                self.blob_cache.put_entry(project_path, ref, path, blob_sha)
+
+        content = self.blob_cache.get(blob_sha)
+        if content is None:
+            response = self.transport.get(
+                f"{self._project_url(project_path)}/repository/blobs/{blob_sha}/raw",
+                cacheable=False, headers=self.headers
+            )
+            response.raise_for_status()
+            content = response.content
+            self.blob_cache.put(blob_sha, content)
+        return content
+
+    @staticmethod
+    def extract_hunk_context(content: str, diff: str, context_lines: int) -> List[Dict[str, Any]]:
+        """
+        Cut the post-change lines around each hunk out of a file.
+
+        Each hunk's new-side range is widened upwards to the nearest less
+        indented line (the enclosing function or block header) and downwards
+        to where that block ends (including a closing brace), by at most
+        ``context_lines`` in each direction. Overlapping windows are merged.
+
+        Args:
+            content: Post-change file contents
+            diff: Unified diff of the file (GitLab format, starting at the first hunk)
+            context_lines: Maximum number of lines added above and below each hunk
+
+        Returns:
+            List of {'start', 'end', 'text'} windows with 1-based inclusive line numbers
+        """
+        lines = content.splitlines()
+
+        def indent(line: str) -> Optional[int]:
+            return len(line) - len(line.lstrip()) if line.strip() else None
+
+        windows = []
+        for match in HUNK_HEADER.finditer(diff):
+            start = int(match.group(1))
+            count = int(match.group(2)) if match.group(2) is not None else 1
+            start, end = max(start, 1), min(start + max(count, 1) - 1, len(lines))
+            if start > end:
+                continue
+
+            levels = [level for level in map(indent, lines[start - 1:end]) if level is not None]
+            base = min(levels) if levels else 0
+            header_level = base
+            top = start
+            while top > 1 and start - top < context_lines:
+                top -= 1
+                level = indent(lines[top - 1])
+                if level is not None and level < base:
+                    header_level = level
+                    break
+            bottom = end
+            while bottom < len(lines) and bottom - end < context_lines:
+                level = indent(lines[bottom])
+                if level is not None and level <= header_level < base:
+                    # Keep the block's closing brace, stop before the next block
+                    if lines[bottom].strip()[0] in '}])':
+                        bottom += 1
+                    break
+                bottom += 1
+
+            if windows and top <= windows[-1][1] + 1:
+                windows[-1][1] = max(windows[-1][1], bottom)
+            else:
+                windows.append([top, bottom])
+
+        return [
+            {'start': top, 'end': bottom, 'text': '\n'.join(lines[top - 1:bottom])}
+            for top, bottom in windows
+        ]
+
+    def add_file_context(
+        self,
+        project_path: str,
+        mr: Dict[str, Any],
+        changes: List[Dict[str, Any]],
+        concurrent: bool = False
+    ):
+        """
+        Add the surrounding post-change file context to the first changed files.
+
+        Sets 'context' (see extract_hunk_context) on each change that is not
+        a deleted file, or 'context_error' if its contents cannot be fetched.
+
+        Args:
+            project_path: GitLab project path
+            mr: MR details (the head commit is taken from diff_refs)
+            changes: File changes, updated in place
+            concurrent: Fetch the files in parallel
+        """
+        head_sha = (mr.get('diff_refs') or {}).get('head_sha') or mr.get('sha')
+        selected = [
+            change for change in changes[:self.context_files]
+            if change.get('diff') and not change.get('deleted_file')
+        ]
+        results = run_concurrently({
+            change['new_path']: lambda change=change: self._file_context(project_path, head_sha, change)
+            for change in selected
+        }, max_workers=None if concurrent else 1)
+        for change, result in zip(selected, results.values()):
+            change.update(result)
+
+    def _file_context(self, project_path: str, head_sha: str, change: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch one changed file and cut out its hunk context."""
+        try:
+            content = self.get_file_content(project_path, head_sha, change['new_path'])
+        except Exception as e:
+            return {'context_error': str(e)}
+        return {'context': self.extract_hunk_context(
+            content.decode('utf-8', 'replace'), change['diff'], self.context_lines
+        )}
+
+    def get_pipeline_summary(
+        self,
+        project_path: str,
+        mr: Dict[str, Any],
+        concurrent: bool = False
+    ) -> Optional[Dict[str, Any]]:
         """
-        encoded_project = quote(project_path, safe='')
-        url = f"{self.base_url}/api/v4/projects/{encoded_project}/merge_requests/{mr_iid}/discussions"
-        response = requests.get(url, headers=self.headers)
+        Summarize an MR's head pipeline: status, jobs, test report and failing job logs.
+
+        Only the tails of the logs of failed jobs that are not allowed to
+        fail are downloaded. Summaries of finished pipelines are kept in the
+        pipeline cache and reused until a job is retried.
+
+        Args:
+            project_path: GitLab project path
+            mr: MR details (the pipeline is taken from head_pipeline)
+            concurrent: Fetch the jobs, test report and logs in parallel
+
+        Returns:
+            Dictionary with 'pipeline', 'jobs' and 'test_report', or None if the MR has no pipeline
+        """
+        pipeline = mr.get('head_pipeline') or mr.get('pipeline')
+        if not pipeline:
+            return None
+        if self.pipeline_cache:
+            cached = self.pipeline_cache.get(project_path, pipeline)
+            if cached is not None:
+                return cached
+
+        url = f"{self._project_url(project_path)}/pipelines/{pipeline['id']}"
+        pipeline_version = f"{pipeline.get('status')}|{pipeline.get('updated_at')}"
+        version = lambda response: pipeline_version
+        max_workers = None if concurrent else 1
+        results = run_concurrently({
+            'jobs': lambda: list(self.iter_pages(f"{url}/jobs", version=version)),
+            'test_report': lambda: self.get_pipeline_test_report(url, version)
+        }, max_workers=max_workers)
+
+        jobs = [{
+            'id': job['id'],
+            'name': job.get('name', ''),
+            'stage': job.get('stage', ''),
+            'status': job.get('status', ''),
+            'allow_failure': job.get('allow_failure', False),
+            'failure_reason': job.get('failure_reason'),
+            'web_url': job.get('web_url', '')
+        } for job in results['jobs']]
+        failing = [job for job in jobs if job['status'] == 'failed' and not job['allow_failure']]
+        logs = run_concurrently({
+            str(job['id']): lambda job=job: self._job_log_tail(project_path, job['id'])
+            for job in failing[:MAX_FAILED_JOB_LOGS]
+        }, max_workers=max_workers)
+        for job in failing[:MAX_FAILED_JOB_LOGS]:
+            job.update(logs[str(job['id'])])
+
+        summary = {
+            'pipeline': {
+                key: pipeline.get(key)
+                for key in ('id', 'status', 'ref', 'sha', 'web_url', 'created_at', 'updated_at')
+            },
+            'jobs': jobs,
+            'test_report': results['test_report']
+        }
+        if self.pipeline_cache:
+            self.pipeline_cache.put(project_path, summary)
+        return summary
+
+    def get_pipeline_test_report(
+        self,
+        pipeline_url: str,
+        version: Optional[VersionProbe] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a pipeline's test report totals and its failed test cases.
+
+        The small test report summary is fetched first; the full report is
+        only downloaded when it lists failed or errored tests.
+
+        Args:
+            pipeline_url: Pipeline API URL
+            version: Version probe used to revalidate cached responses
+
+        Returns:
+            Dictionary with 'total', 'success', 'failed', 'skipped', 'error',
+            'failed_suites' and 'failed_cases', or None if the pipeline has no test report
+        """
+        response = self.transport.get(f"{pipeline_url}/test_report_summary", headers=self.headers, version=version)
+        if response.status_code == 404:
+            return None
         response.raise_for_status()
-        return response.json()
+        total = response.json().get('total') or {}
+        if not total.get('count'):
+            return None
+        report = {
+            'total': total.get('count', 0),
+            'success': total.get('success', 0),
+            'failed': total.get('failed', 0),
+            'skipped': total.get('skipped', 0),
+            'error': total.get('error', 0),
+            'failed_suites': [],
+            'failed_cases': []
+        }
+        if not report['failed'] and not report['error']:
+            return report
 
-    def get_merge_request_commits(self, project_path: str, mr_iid: str) -> List[Dict[str, Any]]:
+        for suite in self._get(f"{pipeline_url}/test_report", version=version).json().get('test_suites', []):
+            if not suite.get('failed_count') and not suite.get('error_count'):
+                continue
+            report['failed_suites'].append(suite.get('name', ''))
+            for case in suite.get('test_cases', []):
+                if case.get('status') in ('failed', 'error') and len(report['failed_cases']) < MAX_FAILED_TEST_CASES:
+                    report['failed_cases'].append({
+                        'suite': suite.get('name', ''),
+                        'name': case.get('name', ''),
+                        'classname': case.get('classname', ''),
+                        'status': case.get('status'),
+                        'output': (case.get('system_output') or '')[:500]
+                    })
+        return report
+
+    def get_job_log_tail(self, project_path: str, job_id: int, max_bytes: Optional[int] = None) -> str:
+        """
+        Fetch the end of a CI job's log without downloading all of it.
+
+        A suffix byte range is requested. If the server ignores it, the log
+        is streamed and only its last bytes are kept, so memory use stays
+        bounded either way.
+
+        Args:
+            project_path: GitLab project path
+            job_id: Job ID
+            max_bytes: Number of bytes to keep (default: GITLAB_JOB_LOG_TAIL_KB)
+
+        Returns:
+            Log tail as plain text, starting at a line boundary
+        """
+        max_bytes = max_bytes or Config.GITLAB_JOB_LOG_TAIL_KB * 1024
+        # Ranges apply to the encoded body, so ask for it uncompressed
+        headers = dict(self.headers, Range=f"bytes=-{max_bytes}")
+        headers['Accept-Encoding'] = 'identity'
+        response = self.transport.get(
+            f"{self._project_url(project_path)}/jobs/{job_id}/trace",
+            cacheable=False, headers=headers, stream=True
+        )
+        with response:
+            if response.status_code == 416:
+                return ''  # empty log
+            response.raise_for_status()
+            tail = b''
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                tail = (tail + chunk)[-max_bytes:]
+            truncated = (
+                len(tail) >= max_bytes
+                or not response.headers.get('Content-Range', 'bytes 0-').startswith('bytes 0-')
+            )
+
+        text = tail.decode('utf-8', 'replace')
+        if truncated and '\n' in text:
+            text = text[text.index('\n') + 1:]
+        lines = []
+        for line in JOB_LOG_MARKUP.sub('', text).split('\n'):
+            # Progress output redraws a line after carriage returns; keep what was shown last
+            lines.append(line.rstrip('\r').rsplit('\r', 1)[-1])
+        return '\n'.join(lines).strip('\n')
+
+    def _job_log_tail(self, project_path: str, job_id: int) -> Dict[str, Any]:
+        """Fetch one job's log tail for a pipeline summary."""
+        try:
+            return {'log_tail': self.get_job_log_tail(project_path, job_id)}
+        except requests.exceptions.RequestException as e:
+            return {'log_error': str(e)}
+
+    def _get(self, url: str, params: Optional[Dict[str, Any]] = None, version: Optional[VersionProbe] = None):
+        """Send a GET request and raise for error statuses."""
+        response = self.transport.get(url, headers=self.headers, params=params, version=version)
+        response.raise_for_status()
+        return response
+
+    def _iter_page_responses(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        version: Optional[VersionProbe] = None,
+        per_page: int = 100,
+        concurrent: bool = False,
+        max_workers: Optional[int] = None
+    ) -> Iterator[requests.Response]:
+        """
+        Stream the page responses of a paginated GitLab list endpoint.
+
+        When the first page reports ``X-Total-Pages`` and ``concurrent`` is
+        set, the remaining pages are fetched in parallel (bounded look-ahead)
+        and yielded in order. Otherwise the ``Link: rel="next"`` header is
+        followed, which also covers keyset pagination, falling back to
+        ``X-Next-Page``. GitLab omits the totals for very large lists, in
+        which case pages are always followed one by one. Pages are only
+        requested as the caller consumes them.
+
+        Args:
+            url: List endpoint URL
+            params: Extra query parameters
+            version: Version probe used to revalidate cached pages
+            per_page: Items per page (GitLab allows at most 100)
+            concurrent: Fetch pages in parallel once the page count is known
+            max_workers: Maximum number of parallel page fetches (default: Config.FETCH_MAX_WORKERS)
+
+        Yields:
+            Page responses in order
+        """
+        params = dict(params or {}, per_page=per_page)
+        response = self._get(url, dict(params, page=1), version)
+        yield response
+
+        total_pages = int(response.headers.get('X-Total-Pages') or 0)
+        if concurrent and total_pages > 1:
+            yield from map_ordered(
+                lambda page: self._get(url, dict(params, page=page), version),
+                range(2, total_pages + 1), max_workers=max_workers
+            )
+            return
+
+        while True:
+            next_url = response.links.get('next', {}).get('url')
+            next_page = response.headers.get('X-Next-Page')
+            if next_url:
+                response = self._get(next_url, version=version)
+            elif next_page:
+                response = self._get(url, dict(params, page=int(next_page)), version)
+            else:
+                return
+            yield response
+
+    def iter_pages(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        version: Optional[VersionProbe] = None,
+        per_page: int = 100,
+        concurrent: bool = False,
+        max_workers: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every item of a paginated GitLab list endpoint.
+
+        Args:
+            url: List endpoint URL
+            params: Extra query parameters
+            version: Version probe used to revalidate cached pages
+            per_page: Items per page (GitLab allows at most 100)
+            concurrent: Fetch pages in parallel once the page count is known
+            max_workers: Maximum number of parallel page fetches (default: Config.FETCH_MAX_WORKERS)
+
+        Yields:
+            Items in API order
+        """
+        for response in self._iter_page_responses(url, params, version, per_page, concurrent, max_workers):
+            yield from response.json()
+
+    def iter_merge_request_discussions(
+        self,
+        project_path: str,
+        mr_iid: str,
+        mr: Optional[Dict[str, Any]] = None,
+        concurrent: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream all merge request discussions/comments, page by page.
+
+        Args:
+            project_path: GitLab project path
+            mr_iid: Merge request IID
+            mr: Already-fetched MR details, used to revalidate cached pages
+            concurrent: Fetch pages in parallel once the page count is known
+
+        Yields:
+            Discussion dictionaries
+        """
+        url = f"{self._project_url(project_path)}/merge_requests/{mr_iid}/discussions"
+        return self.iter_pages(url, version=self._mr_version(mr), concurrent=concurrent)
+
+    def get_merge_request_discussions(
+        self,
+        project_path: str,
+        mr_iid: str,
+        mr: Optional[Dict[str, Any]] = None,
+        concurrent: bool = False
+    ) -> List[Dict[str, Any]]:
         """
-        Fetch merge request commits.
+        Fetch all merge request discussions/comments.
 
         Args:
             project_path: GitLab project path
             mr_iid: Merge request IID
+            mr: Already-fetched MR details, used to revalidate cached data
+            concurrent: Fetch pages in parallel once the page count is known
+
+        Returns:
+            List of discussion dictionaries
+        """
+        return list(self.iter_merge_request_discussions(project_path, mr_iid, mr=mr, concurrent=concurrent))
+
+    def iter_merge_request_commits(
+        self,
+        project_path: str,
+        mr_iid: str,
+        mr: Optional[Dict[str, Any]] = None,
+        concurrent: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream all merge request commits, page by page.
+
+        Args:
+            project_path: GitLab project path
+            mr_iid: Merge request IID
+            mr: Already-fetched MR details, used to revalidate cached pages
+            concurrent: Fetch pages in parallel once the page count is known
+
+        Yields:
+            Commit dictionaries, newest first
+        """
+        url = f"{self._project_url(project_path)}/merge_requests/{mr_iid}/commits"
+        return self.iter_pages(url, version=self._mr_version(mr), concurrent=concurrent)
+
+    def get_merge_request_commits(
+        self,
+        project_path: str,
+        mr_iid: str,
+        mr: Optional[Dict[str, Any]] = None,
+        concurrent: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch all merge request commits.
+
+        Args:
+            project_path: GitLab project path
+            mr_iid: Merge request IID
+            mr: Already-fetched MR details, used to revalidate cached data
+            concurrent: Fetch pages in parallel once the page count is known
 
         Returns:
             List of commit dictionaries
         """
-        encoded_project = quote(project_path, safe='')
-        url = f"{self.base_url}/api/v4/projects/{encoded_project}/merge_requests/{mr_iid}/commits"
-        response = requests.get(url, headers=self.headers)
-        response.raise_for_status()
-        return response.json()
+        return list(self.iter_merge_request_commits(project_path, mr_iid, mr=mr, concurrent=concurrent))
+
+    def find_merge_requests(
+        self,
+        jira_key: str,
+        groups: Optional[List[str]] = None,
+        concurrent: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the merge requests that mention a Jira key, across GitLab groups.
+
+        Each group's MR list is searched by title and description, all pages
+        of all groups in one sweep. GitLab cannot search source branches, so
+        the same sweep also lists the MRs updated in the last
+        GITLAB_BRANCH_LOOKBACK_DAYS days and matches their source branch
+        locally. GitLab's search also matches partial words, so results are
+        kept only when the key appears as a whole word in the title,
+        description or source branch. Project IDs from the results are added
+        to the project index.
+
+        Args:
+            jira_key: Jira ticket key, e.g. PROJ-123
+            groups: Group paths to search (default: GITLAB_GROUPS; empty searches
+                every MR visible to the token)
+            concurrent: Search groups, and their result pages, in parallel
+
+        Returns:
+            List of {'url', 'project_path', 'iid', 'title', 'state', 'source_branch',
+            'updated_at'} dictionaries, most recently updated first
+        """
+        if groups is None:
+            groups = [g.strip() for g in Config.GITLAB_GROUPS.split(',') if g.strip()]
+        params = {
+            'search': jira_key,
+            'in': 'title,description',
+            'scope': 'all',
+            'state': 'all',
+            'order_by': 'updated_at'
+        }
+        urls = [
+            f"{self.base_url}/api/v4/groups/{quote(group, safe='')}/merge_requests" for group in groups
+        ] or [f"{self.base_url}/api/v4/merge_requests"]
+        tasks = {
+            ('search', url): lambda url=url: list(self.iter_pages(url, params, concurrent=concurrent))
+            for url in urls
+        }
+        if Config.GITLAB_BRANCH_LOOKBACK_DAYS > 0:
+            updated_after = datetime.now(timezone.utc) - timedelta(days=Config.GITLAB_BRANCH_LOOKBACK_DAYS)
+            branch_params = {
+                'scope': 'all',
+                'state': 'all',
+                'order_by': 'updated_at',
+                'updated_after': updated_after.strftime('%Y-%m-%dT%H:%M:%SZ')
+            }
+            tasks.update({
+                ('branch', url): lambda url=url: list(self.iter_pages(url, branch_params, concurrent=concurrent))
+                for url in urls
+            })
+        results = run_concurrently(tasks, max_workers=None if concurrent else 1)
 
-    def get_merge_request_analysis_data(self, mr_url: str) -> Dict[str, Any]:
+        mention = re.compile(rf'(?<![A-Za-z0-9]){re.escape(jira_key)}(?!\d)', re.IGNORECASE)
+        found = {}
+        for mr in (mr for page in results.values() for mr in page):
+            text = ' '.join(mr.get(field) or '' for field in ('title', 'description', 'source_branch'))
+            mr_info = self.extract_mr_info_from_url(mr.get('web_url', ''))
+            if not mr_info or mr['web_url'] in found or not mention.search(text):
+                continue
+            self.remember_project(mr_info[0], mr.get('project_id'))
+            found[mr['web_url']] = {
+                'url': mr['web_url'],
+                'project_path': mr_info[0],
+                'iid': mr_info[1],
+                'title': mr.get('title', ''),
+                'state': mr.get('state', ''),
+                'source_branch': mr.get('source_branch', ''),
+                'updated_at': mr.get('updated_at', '')
+            }
+        return sorted(found.values(), key=lambda mr: mr['updated_at'], reverse=True)
+
+    def get_merge_request_analysis_data(self, mr_url: str, concurrent: bool = False) -> Dict[str, Any]:
         """
         Get comprehensive MR data for analysis.
 
         Args:
             mr_url: URL to GitLab merge request
+            concurrent: Fetch MR details, changes, discussions and commits in parallel
 
         Returns:
             Dictionary with MR details, changes, discussions, and commits
@@ -123,24 +936,273 @@ class GitLabClient:
 
         project_path, mr_iid = mr_info
 
+        previous = self.state_store.get(project_path, mr_iid) if self.state_store else None
+        if previous:
+            data = self.update_merge_request_analysis_data(project_path, mr_iid, previous, concurrent)
+        else:
+            data = self._fetch_merge_request_analysis_data(project_path, mr_iid, concurrent)
+        if self.pipelines:
+            data['pipeline'] = self.get_pipeline_summary(project_path, data['full_data'], concurrent)
+        if self.state_store:
+            self.state_store.save(project_path, mr_iid, data)
+        return data
+
+    def _fetch_merge_request_analysis_data(
+        self,
+        project_path: str,
+        mr_iid: str,
+        concurrent: bool = False,
+        mr: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch all MR data for analysis.
+
+        Args:
+            project_path: GitLab project path
+            mr_iid: Merge request IID
+            concurrent: Fetch MR details, changes, discussions and commits in parallel
+            mr: Already-fetched MR details
+
+        Returns:
+            Dictionary with MR details, changes, discussions, and commits
+        """
+        # With a response cache, the MR details double as the freshness probe
+        # for the larger sub-resources, and a git mirror needs their diff_refs,
+        # so they are fetched first.
+        use_mirror = self.mirror is not None and self.mirror.handles(project_path)
+        if mr is None and (self.transport.cache or use_mirror):
+            mr = self.get_merge_request(project_path, mr_iid)
+
+        results = run_concurrently({
+            'mr': lambda: mr or self.get_merge_request(project_path, mr_iid),
+            'changes': lambda: self._get_changes(project_path, mr_iid, mr),
+            'discussions': lambda: self.get_merge_request_discussions(
+                project_path, mr_iid, mr=mr, concurrent=concurrent
+            ),
+            'commits': lambda: self.get_merge_request_commits(project_path, mr_iid, mr=mr, concurrent=concurrent)
+        }, max_workers=None if concurrent else 1)
+        mr = results['mr']
+        changes = results['changes']
+        discussions = results['discussions']
+        commits = results['commits']
+
+        if self.context_lines:
+            self.add_file_context(project_path, mr, changes.get('changes', []), concurrent)
+
+        return self.build_merge_request_analysis_data(mr, changes, discussions, commits)
+
+    def _get_changes(self, project_path: str, mr_iid: str, mr: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Fetch MR file changes from the git mirror, the diffs API or the changes API.
+
+        Args:
+            project_path: GitLab project path
+            mr_iid: Merge request IID
+            mr: Already-fetched MR details (required for the mirror)
+
+        Returns:
+            Dictionary with 'changes' and 'files_total' (and 'diff_stats' from the mirror)
+        """
+        if mr is not None and self.mirror is not None and self.mirror.handles(project_path):
+            try:
+                return self.get_merge_request_mirror_changes(project_path, mr)
+            except (GitMirrorError, OSError) as e:
+                print(f"Git mirror unavailable for {project_path}, using the API: {e}")
+        if self.max_diff_files:
+            return self.get_merge_request_diffs(project_path, mr_iid, mr=mr, max_files=self.max_diff_files)
+        return self.get_merge_request_changes(project_path, mr_iid, mr=mr)
+
+    def update_merge_request_analysis_data(
+        self,
+        project_path: str,
+        mr_iid: str,
+        previous: Dict[str, Any],
+        concurrent: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Bring a previous MR analysis up to date, fetching only what changed.
+
+        When the MR's ``updated_at`` and head SHA are unchanged, only its
+        details are fetched. After a push, the new commits are listed newest
+        first until the previously analyzed head, and the interdiff between
+        the old and new head comes from the compare API. Files that only
+        the push touched are added from the interdiff; if it touched files
+        already in the MR, their diffs against the base are stale (or the
+        file was reverted out of the MR), so the MR's changes are fetched
+        again. Notes are listed newest first until the last one already
+        seen. The result carries a 'since_last_analysis' entry naming what is
+        new. If the old head is no longer part of the MR (e.g. after a force
+        push) or the push contains a merge commit, which brings target
+        branch changes into the interdiff, everything is fetched again.
+
+        Args:
+            project_path: GitLab project path
+            mr_iid: Merge request IID
+            previous: Last analysis record from the state store
+            concurrent: Fetch commits, interdiff and notes in parallel
+
+        Returns:
+            Dictionary with MR details, changes, discussions, and commits
+        """
         mr = self.get_merge_request(project_path, mr_iid)
-        changes = self.get_merge_request_changes(project_path, mr_iid)
-        discussions = self.get_merge_request_discussions(project_path, mr_iid)
-        commits = self.get_merge_request_commits(project_path, mr_iid)
+        data = previous['data']
+        old_head = previous['head_sha']
+        head_changed = mr.get('sha') != old_head
+        since = {
+            'previous_head_sha': old_head,
+            'previous_analyzed_at': previous['analyzed_at'],
+            'new_commits': [],
+            'interdiff': [],
+            'changed_files': [],
+            'new_notes': []
+        }
+        if not head_changed and mr.get('updated_at') == previous['updated_at']:
+            data = dict(data, full_data=mr, since_last_analysis=since)
+            return data
+
+        tasks = {'notes': lambda: self._get_notes_since(project_path, mr_iid, previous['last_note_at'])}
+        if head_changed:
+            tasks['commits'] = lambda: self._get_commits_since(project_path, mr_iid, old_head)
+            tasks['compare'] = lambda: self._get_compare(project_path, old_head, mr.get('sha'))
+        results = run_concurrently(tasks, max_workers=None if concurrent else 1)
+
+        commits = data['commits']
+        changes = {
+            'changes': data['changes'],
+            'files_total': data['files_changed'],
+            'diff_stats': data.get('diff_stats')
+        }
+        if head_changed:
+            new_commits, found_old_head = results['commits']
+            if not found_old_head or results['compare'] is None:
+                print(f"Previous head of !{mr_iid} is no longer in the MR, fetching it again")
+                return self._fetch_merge_request_analysis_data(project_path, mr_iid, concurrent, mr=mr)
+            pushed = new_commits + results['compare'].get('commits', [])
+            if any(len(commit.get('parent_ids') or []) > 1 for commit in pushed):
+                print(f"New commits of !{mr_iid} include a merge, fetching it again")
+                return self._fetch_merge_request_analysis_data(project_path, mr_iid, concurrent, mr=mr)
+            commits = new_commits + commits
+            interdiff = results['compare'].get('diffs', [])
+            known_paths = {
+                path for change in data['changes'] for path in (change.get('old_path'), change.get('new_path'))
+            }
+            touched = any(
+                change.get('old_path') in known_paths or change.get('new_path') in known_paths
+                for change in interdiff
+            )
+            # A capped file list may be missing touched files, so it is fetched again too
+            if touched or len(data['changes']) < data['files_changed']:
+                changes = self._get_changes(project_path, mr_iid, mr)
+                added = changes.get('changes', [])
+            else:
+                # Untouched by the MR until now, so the interdiff is their diff against the base
+                added = interdiff
+                stats = changes['diff_stats']
+                if stats:
+                    lines = [line for change in added for line in (change.get('diff') or '').split('\n')]
+                    stats = {
+                        'files': stats['files'] + len(added),
+                        'additions': stats['additions'] + sum(line.startswith('+') for line in lines),
+                        'deletions': stats['deletions'] + sum(line.startswith('-') for line in lines)
+                    }
+                changes = {
+                    'changes': changes['changes'] + added,
+                    'files_total': changes['files_total'] + len(added),
+                    'diff_stats': stats
+                }
+            if self.context_lines:
+                self.add_file_context(project_path, mr, added, concurrent)
+            since['new_commits'] = [commit['id'] for commit in new_commits]
+            since['interdiff'] = interdiff
+            since['changed_files'] = [change.get('new_path') for change in interdiff]
+
+        discussions = data['discussions']
+        new_notes = results['notes']
+        if new_notes:
+            updated = {note['id']: note for note in new_notes}
+            discussions = [
+                dict(discussion, notes=[updated.pop(note.get('id'), note) for note in discussion.get('notes', [])])
+                for discussion in discussions
+            ]
+            # Notes not found in a known discussion start (or reply to) a new thread
+            discussions += [
+                {'id': f"note-{note['id']}", 'notes': [note]}
+                for note in reversed(new_notes) if note['id'] in updated
+            ]
+            since['new_notes'] = [note['id'] for note in new_notes]
 
+        data = self.build_merge_request_analysis_data(mr, changes, discussions, commits)
+        data['since_last_analysis'] = since
+        return data
+
+    def _get_commits_since(self, project_path: str, mr_iid: str, old_head: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        List MR commits newer than a previous head, newest first.
+
+        Returns:
+            Tuple of (new commits, whether the previous head was reached)
+        """
+        new_commits = []
+        for commit in self.iter_merge_request_commits(project_path, mr_iid):
+            if commit.get('id') == old_head:
+                return new_commits, True
+            new_commits.append(commit)
+        return new_commits, False
+
+    def _get_compare(self, project_path: str, from_sha: str, to_sha: str) -> Optional[Dict[str, Any]]:
+        """Compare two commits, or return None if either is gone from the repository."""
+        response = self.transport.get(
+            f"{self._project_url(project_path)}/repository/compare",
+            headers=self.headers, params={'from': from_sha, 'to': to_sha}
+        )
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
+
+    def _get_notes_since(self, project_path: str, mr_iid: str, last_note_at: Optional[str]) -> List[Dict[str, Any]]:
+        """List MR notes created or edited after a timestamp, newest first."""
+        url = f"{self._project_url(project_path)}/merge_requests/{mr_iid}/notes"
+        notes = []
+        for note in self.iter_pages(url, {'order_by': 'updated_at', 'sort': 'desc'}):
+            if last_note_at and (note.get('updated_at') or note.get('created_at') or '') <= last_note_at:
+                break
+            notes.append(note)
+        return notes
+
+    @staticmethod
+    def build_merge_request_analysis_data(
+        mr: Dict[str, Any],
+        changes: Dict[str, Any],
+        discussions: Iterable[Dict[str, Any]],
+        commits: Iterable[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Shape fetched MR data into the analysis dictionary.
+
+        Args:
+            mr: Merge request as returned by the REST API
+            changes: MR changes response, or get_merge_request_diffs/mirror_changes result
+            discussions: Discussion dictionaries (a list or a page stream)
+            commits: Commit dictionaries (a list or a page stream)
+
+        Returns:
+            Dictionary with MR details, changes, discussions, and commits
+        """
         return {
             'title': mr.get('title', ''),
             'description': mr.get('description', ''),
             'state': mr.get('state', ''),
-            'author': mr.get('author', {}).get('name', ''),
+            'author': (mr.get('author') or {}).get('name', ''),
             'source_branch': mr.get('source_branch', ''),
             'target_branch': mr.get('target_branch', ''),
             'created_at': mr.get('created_at', ''),
             'updated_at': mr.get('updated_at', ''),
             'merged_at': mr.get('merged_at', ''),
             'changes': changes.get('changes', []),
-            'discussions': discussions,
-            'commits': commits,
-            'files_changed': len(changes.get('changes', [])),
+            'discussions': list(discussions),
+            'commits': list(commits),
+            'files_changed': changes.get('files_total', len(changes.get('changes', []))),
+            'diff_stats': changes.get('diff_stats'),
             'full_data': mr
         }
@@ -0,0 +1,265 @@
+"""
+Shared HTTP transport with pooled keep-alive sessions for all API clients.
+"""
+import threading
+import requests
+from typing import Dict, Any, Callable, Optional
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.util.retry import Retry
+from src.config import Config
+from src.response_cache import ResponseCache, CachedResponse
+
+
+# Callable returning a resource's server-side version (see HTTPTransport.request)
+VersionProbe = Callable[[Optional[requests.Response]], Optional[str]]
+
+
+class HTTPTransport:
+    """
+    Pooled HTTP transport that keeps one keep-alive session per host.
+
+    A single transport can be shared by the Jira, GitLab, Confluence and
+    TestRail clients so that repeated calls to the same host reuse
+    connections instead of opening a new TCP+TLS connection per request.
+    """
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        backoff_factor: Optional[float] = None,
+        max_per_host: Optional[int] = None,
+        cache: Optional[ResponseCache] = None,
+        cache_mode: str = ResponseCache.MODE_USE
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            pool_size: Maximum number of pooled connections per host
+            timeout: Default request timeout in seconds
+            max_retries: Number of retries for connection errors and retryable statuses
+            backoff_factor: Exponential backoff factor between retries
+            max_per_host: Maximum number of in-flight requests per host
+            cache: Optional on-disk response cache for GET requests
+            cache_mode: How to use the cache: 'use', 'refresh' or 'bypass'
+        """
+        self.pool_size = pool_size if pool_size is not None else Config.HTTP_POOL_SIZE
+        self.timeout = timeout if timeout is not None else Config.HTTP_TIMEOUT
+        self.max_retries = max_retries if max_retries is not None else Config.HTTP_MAX_RETRIES
+        self.backoff_factor = backoff_factor if backoff_factor is not None else Config.HTTP_BACKOFF_FACTOR
+        self.max_per_host = max_per_host if max_per_host is not None else Config.HTTP_MAX_PER_HOST
+        self.cache = cache
+        self.cache_mode = cache_mode
+        self._sessions: Dict[str, requests.Session] = {}
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _build_session(self) -> requests.Session:
+        """
+        Create a session with a pooled, retrying adapter.
+
+        Returns:
+            Configured requests session
+        """
+        retry = Retry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+            respect_retry_after_header=True,
+            # Return the last response once retries run out, so callers still
+            # see the status (raise_for_status, 404 fallbacks, error bodies)
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_size,
+            max_retries=retry
+        )
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    @staticmethod
+    def _host_key(url: str) -> str:
+        """Return the scheme://host key used to group sessions and limits."""
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def session_for(self, url: str) -> requests.Session:
+        """
+        Get (or lazily create) the keep-alive session for the URL's host.
+
+        Args:
+            url: Request URL
+
+        Returns:
+            Session bound to the URL's scheme and host
+        """
+        host_key = self._host_key(url)
+        with self._lock:
+            session = self._sessions.get(host_key)
+            if session is None:
+                session = self._build_session()
+                self._sessions[host_key] = session
+            return session
+
+    def _limit_for(self, url: str) -> threading.BoundedSemaphore:
+        """Get the per-host semaphore bounding concurrent requests."""
+        host_key = self._host_key(url)
+        with self._lock:
+            limit = self._host_limits.get(host_key)
+            if limit is None:
+                limit = threading.BoundedSemaphore(max(1, self.max_per_host))
+                self._host_limits[host_key] = limit
+            return limit
+
+    def _send(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send a request on the network, bounded by the per-host limit."""
+        kwargs.setdefault('timeout', self.timeout)
+        session = self.session_for(url)
+        with self._limit_for(url):
+            return session.request(method, url, **kwargs)
+
+    @staticmethod
+    def source_for(url: str) -> Optional[str]:
+        """
+        Identify which configured source (jira, gitlab, ...) a URL belongs to.
+
+        Args:
+            url: Request URL
+
+        Returns:
+            Source name, or None for unknown hosts
+        """
+        for source, base_url in Config.source_urls().items():
+            if base_url and url.startswith(base_url):
+                return source
+        return None
+
+    @staticmethod
+    def response_from_cache(entry: CachedResponse) -> requests.Response:
+        """
+        Rebuild a requests Response from a cached entry.
+
+        Args:
+            entry: Cached response
+
+        Returns:
+            Response object equivalent to the original one
+        """
+        response = requests.Response()
+        response.status_code = entry.status
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response._content = entry.body
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = entry.url
+        response.reason = 'OK'
+        response.from_cache = True
+        return response
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        version: Optional[VersionProbe] = None,
+        cacheable: bool = True,
+        **kwargs: Any
+    ) -> requests.Response:
+        """
+        Send an HTTP request through the host's pooled session.
+
+        When a response cache is attached, successful GET responses from
+        configured sources are served from and stored in the cache, and any
+        other method invalidates the cached entries of its source. Stale
+        entries (or every entry in 'revalidate' mode) are revalidated before
+        reuse: with If-None-Match/If-Modified-Since when the server sent an
+        ETag or Last-Modified header, otherwise with the ``version`` probe.
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            url: Request URL
+            version: Optional callable returning the resource's server-side
+                version. Called with None it must do a cheap probe for the
+                current version; called with a downloaded response it returns
+                the version that response represents.
+            cacheable: Set to False to always go to the network (e.g. for probes)
+            **kwargs: Extra arguments passed to requests (auth, headers, params, json...)
+
+        Returns:
+            Response object
+        """
+        source = self.source_for(url) if self.cache is not None and cacheable else None
+        if source is None or self.cache_mode == ResponseCache.MODE_BYPASS:
+            return self._send(method, url, **kwargs)
+
+        if method.upper() != 'GET':
+            response = self._send(method, url, **kwargs)
+            self.cache.invalidate_source(source)
+            return response
+
+        key = ResponseCache.make_key(method, url, kwargs.get('params'), kwargs.get('headers'))
+        response = None
+        if self.cache_mode in (ResponseCache.MODE_USE, ResponseCache.MODE_REVALIDATE):
+            entry = self.cache.get(key)
+            if entry is not None and entry.is_fresh and self.cache_mode == ResponseCache.MODE_USE:
+                self.cache.record('hits')
+                return self.response_from_cache(entry)
+            if entry is not None:
+                cached_headers = CaseInsensitiveDict(entry.headers)
+                etag = cached_headers.get('ETag')
+                last_modified = cached_headers.get('Last-Modified')
+                if etag or last_modified:
+                    headers = dict(kwargs.get('headers') or {})
+                    if etag:
+                        headers['If-None-Match'] = etag
+                    if last_modified:
+                        headers['If-Modified-Since'] = last_modified
+                    response = self._send(method, url, **dict(kwargs, headers=headers))
+                    if response.status_code == 304:
+                        self.cache.renew(key, source)
+                        self.cache.record('hits')
+                        return self.response_from_cache(entry)
+                elif version is not None and entry.version is not None:
+                    if version(None) == entry.version:
+                        self.cache.renew(key, source)
+                        self.cache.record('hits')
+                        return self.response_from_cache(entry)
+            self.cache.record('misses')
+
+        if response is None:
+            response = self._send(method, url, **kwargs)
+        if response.status_code == 200:
+            self.cache.set(key, source, method, url, response.status_code,
+                           response.headers, response.content,
+                           version=version(response) if version is not None else None)
+        return response
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a GET request."""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a POST request."""
+        return self.request('POST', url, **kwargs)
+
+    def close(self):
+        """Close all pooled sessions."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+    def __enter__(self) -> 'HTTPTransport':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
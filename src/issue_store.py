@@ -0,0 +1,366 @@
+"""
+Local SQLite store of Jira issues, comments and links with incremental sync.
+"""
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+from src.config import Config
+from src import sqlite_util
+from src.jira_client import JiraClient
+
+
+class IssueStore:
+    """
+    Normalized local copy of Jira issues for offline and repeated analysis.
+
+    Issues, their comments and their links are kept in separate tables,
+    alongside the raw issue JSON so the analysis data can be rebuilt exactly
+    as the live client would. ``sync`` pulls only the issues updated since
+    the previous sync of the same JQL scope.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the store, creating the database if needed.
+
+        Args:
+            path: SQLite database path (default: ISSUE_STORE_PATH or <QA_CACHE_DIR>/issues.sqlite3)
+        """
+        self.path = path or Config.ISSUE_STORE_PATH or os.path.join(Config.QA_CACHE_DIR, 'issues.sqlite3')
+        self._lock = threading.Lock()
+
+        self._conn = sqlite_util.connect(self.path)
+        self._conn.execute('PRAGMA foreign_keys=ON')
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS issues (
+                key TEXT PRIMARY KEY,
+                id TEXT,
+                project TEXT,
+                summary TEXT,
+                description TEXT,
+                status TEXT,
+                priority TEXT,
+                issue_type TEXT,
+                assignee TEXT,
+                reporter TEXT,
+                parent TEXT,
+                created TEXT,
+                updated TEXT,
+                raw TEXT NOT NULL,
+                synced_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS comments (
+                issue_key TEXT NOT NULL REFERENCES issues (key) ON DELETE CASCADE,
+                id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                author TEXT,
+                created TEXT,
+                updated TEXT,
+                body TEXT,
+                raw TEXT NOT NULL,
+                PRIMARY KEY (issue_key, id)
+            );
+            CREATE TABLE IF NOT EXISTS links (
+                source TEXT NOT NULL,
+                type TEXT NOT NULL,
+                target TEXT NOT NULL,
+                PRIMARY KEY (source, type, target)
+            );
+            CREATE TABLE IF NOT EXISTS sync_state (
+                scope TEXT PRIMARY KEY,
+                last_sync REAL NOT NULL,
+                issues INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS issues_project ON issues (project);
+            CREATE INDEX IF NOT EXISTS issues_updated ON issues (updated);
+            CREATE INDEX IF NOT EXISTS comments_issue ON comments (issue_key, position);
+            CREATE INDEX IF NOT EXISTS links_target ON links (target);
+            CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5 (
+                key UNINDEXED, summary, description, comments,
+                tokenize = 'porter unicode61'
+            );
+            """
+        )
+        # Index issues stored before full-text search was added
+        issues, indexed = self._conn.execute(
+            'SELECT (SELECT COUNT(*) FROM issues), (SELECT COUNT(*) FROM issues_fts)'
+        ).fetchone()
+        if issues != indexed:
+            self._conn.execute(
+                'INSERT INTO issues_fts (key, summary, description, comments) '
+                'SELECT i.key, i.summary, i.description, '
+                '(SELECT group_concat(body, char(10)) FROM comments c WHERE c.issue_key = i.key) '
+                'FROM issues i WHERE i.key NOT IN (SELECT key FROM issues_fts)'
+            )
+
+    def save_issue(self, issue: Dict[str, Any], comments: Optional[List[Dict[str, Any]]] = None):
+        """
+        Insert or replace an issue with its links and (optionally) its comments.
+
+        Args:
+            issue: Jira issue as returned by the REST API
+            comments: Full comment list; when omitted the stored comments are kept
+        """
+        fields = issue.get('fields', {})
+        key = issue['key'].upper()
+        raw = dict(issue, fields={k: v for k, v in fields.items() if k != 'comment'})
+        links = set()
+        for link in JiraClient.parse_linked_tickets(issue):
+            if link['direction'] == 'outward':
+                links.add((key, link['outward'], link['key'].upper()))
+            else:
+                links.add((link['key'].upper(), link['outward'], key))
+
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.execute(
+                    'INSERT INTO issues (key, id, project, summary, description, status, priority, issue_type, '
+                    'assignee, reporter, parent, created, updated, raw, synced_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) '
+                    'ON CONFLICT (key) DO UPDATE SET id = excluded.id, project = excluded.project, '
+                    'summary = excluded.summary, description = excluded.description, status = excluded.status, '
+                    'priority = excluded.priority, issue_type = excluded.issue_type, assignee = excluded.assignee, '
+                    'reporter = excluded.reporter, parent = excluded.parent, created = excluded.created, '
+                    'updated = excluded.updated, raw = excluded.raw, synced_at = excluded.synced_at',
+                    (
+                        key, issue.get('id'), key.split('-')[0],
+                        fields.get('summary', ''), fields.get('description') or '',
+                        (fields.get('status') or {}).get('name', ''),
+                        (fields.get('priority') or {}).get('name', ''),
+                        (fields.get('issuetype') or {}).get('name', ''),
+                        (fields.get('assignee') or {}).get('displayName', 'Unassigned'),
+                        (fields.get('reporter') or {}).get('displayName', 'Unknown'),
+                        (fields.get('parent') or {}).get('key'),
+                        fields.get('created', ''), fields.get('updated', ''),
+                        json.dumps(raw), time.time()
+                    )
+                )
+                # Links are stored once per pair, in their outward direction; Jira
+                # lists each link on both issues, so the issue's own list is complete
+                self._conn.execute('DELETE FROM links WHERE source = ? OR target = ?', (key, key))
+                self._conn.executemany(
+                    'INSERT OR IGNORE INTO links (source, type, target) VALUES (?, ?, ?)', sorted(links)
+                )
+                if comments is not None:
+                    self._conn.execute('DELETE FROM comments WHERE issue_key = ?', (key,))
+                    self._conn.executemany(
+                        'INSERT OR REPLACE INTO comments (issue_key, id, position, author, created, updated, body, raw) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                        [
+                            (
+                                key, str(comment.get('id', position)), position,
+                                (comment.get('author') or {}).get('displayName', 'Unknown'),
+                                comment.get('created', ''), comment.get('updated', ''),
+                                comment.get('body', ''), json.dumps(comment)
+                            )
+                            for position, comment in enumerate(comments)
+                        ]
+                    )
+                self._conn.execute('DELETE FROM issues_fts WHERE key = ?', (key,))
+                self._conn.execute(
+                    'INSERT INTO issues_fts (key, summary, description, comments) '
+                    'SELECT key, summary, description, '
+                    '(SELECT group_concat(body, char(10)) FROM comments WHERE issue_key = ?) '
+                    'FROM issues WHERE key = ?',
+                    (key, key)
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def get_issue(self, ticket_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a stored issue in the REST API's shape.
+
+        Args:
+            ticket_key: Jira ticket key
+
+        Returns:
+            Issue dictionary, or None if the issue is not stored
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT raw FROM issues WHERE key = ?', (ticket_key.upper(),)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_comments(self, ticket_key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Load a stored issue's comments, oldest first.
+
+        Args:
+            ticket_key: Jira ticket key
+
+        Returns:
+            List of comment dictionaries, or None if the issue is not stored
+        """
+        with self._lock:
+            if self._conn.execute('SELECT 1 FROM issues WHERE key = ?', (ticket_key.upper(),)).fetchone() is None:
+                return None
+            rows = self._conn.execute(
+                'SELECT raw FROM comments WHERE issue_key = ? ORDER BY position', (ticket_key.upper(),)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def get_links(self, ticket_key: str) -> List[Dict[str, str]]:
+        """
+        List stored links touching an issue.
+
+        Args:
+            ticket_key: Jira ticket key
+
+        Returns:
+            List of {'from', 'type', 'to'} dictionaries in the link's outward direction
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT source, type, target FROM links WHERE source = ? OR target = ? ORDER BY source, target',
+                (ticket_key.upper(), ticket_key.upper())
+            ).fetchall()
+        return [{'from': source, 'type': link_type, 'to': target} for source, link_type, target in rows]
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Full-text search over stored summaries, descriptions and comments.
+
+        Args:
+            query: FTS5 query (words, "phrases", AND/OR/NOT, prefix*, summary:word...)
+            limit: Maximum number of results
+
+        Returns:
+            List of {'ticket_key', 'summary', 'status', 'snippet', 'rank'}
+            dictionaries, best match first
+
+        Raises:
+            ValueError: If the query is not valid FTS5 syntax
+        """
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT f.key, i.summary, i.status, "
+                    "snippet(issues_fts, -1, '[', ']', '...', 12), bm25(issues_fts, 5.0, 1.0, 0.5) AS rank "
+                    "FROM issues_fts f JOIN issues i ON i.key = f.key "
+                    "WHERE issues_fts MATCH ? ORDER BY rank LIMIT ?",
+                    (query, limit)
+                ).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search query '{query}': {e}")
+        return [
+            {'ticket_key': key, 'summary': summary, 'status': status, 'snippet': snippet, 'rank': rank}
+            for key, summary, status, snippet, rank in rows
+        ]
+
+    def documents(self, ticket_keys: Optional[List[str]] = None) -> Iterator[Tuple[str, str, str]]:
+        """
+        Iterate over the text of stored issues.
+
+        Args:
+            ticket_keys: Only these issues (default: every stored issue)
+
+        Yields:
+            (ticket key, summary, description and comment text) tuples
+        """
+        sql = 'SELECT key, summary, description, comments FROM issues_fts'
+        params = [key.upper() for key in ticket_keys or []]
+        if ticket_keys is not None:
+            sql += f" WHERE key IN ({', '.join('?' * len(params))})"
+        with self._lock:
+            rows = self._conn.execute(f'{sql} ORDER BY key', params).fetchall()
+        for key, summary, description, comments in rows:
+            yield key, summary or '', f"{description or ''}\n{comments or ''}"
+
+    def signature(self) -> str:
+        """Return a string that changes whenever stored issues change."""
+        with self._lock:
+            count, synced = self._conn.execute('SELECT COUNT(*), MAX(synced_at) FROM issues').fetchone()
+        return f"{count}:{synced}"
+
+    def last_sync(self, scope: str) -> Optional[float]:
+        """Return the start time of the last successful sync of a JQL scope."""
+        with self._lock:
+            row = self._conn.execute('SELECT last_sync FROM sync_state WHERE scope = ?', (scope,)).fetchone()
+        return row[0] if row else None
+
+    def sync(
+        self,
+        jira_client: JiraClient,
+        jql: str,
+        full: bool = False,
+        concurrent: bool = True
+    ) -> int:
+        """
+        Pull the issues of a JQL scope updated since its last sync.
+
+        The ``updated`` filter uses a relative JQL duration (``-Nm``), which
+        is independent of the Jira user's time zone, widened by
+        ISSUE_SYNC_OVERLAP_MINUTES. Comments come with the search results;
+        issues with more comments than the search returned get theirs
+        fetched separately.
+
+        Args:
+            jira_client: Client used to query Jira (should not read from this store)
+            jql: JQL selecting the issues to keep in the store
+            full: Ignore the last sync time and pull every matching issue
+            concurrent: Fetch search pages in parallel
+
+        Returns:
+            Number of issues stored
+        """
+        started = time.time()
+        last_sync = None if full else self.last_sync(jql)
+        query = f"({jql})"
+        if last_sync is not None:
+            minutes = math.ceil((started - last_sync) / 60) + Config.ISSUE_SYNC_OVERLAP_MINUTES
+            query += f" AND updated >= -{minutes}m"
+        # Ordered by fields that never change, so an issue edited during the
+        # sync does not shift the offsets of the pages still to be fetched
+        # (the overlap window picks up such edits on the next sync)
+        query += " ORDER BY created ASC, key ASC"
+
+        count = 0
+        for issue in jira_client.iter_search_issues(query, with_comments=True, concurrent=concurrent):
+            page = issue.get('fields', {}).get('comment') or {}
+            comments = page.get('comments', [])
+            if page.get('total', len(comments)) > len(comments):
+                comments = list(jira_client.iter_ticket_comments(issue['key'], concurrent=concurrent))
+            self.save_issue(issue, comments)
+            count += 1
+
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO sync_state (scope, last_sync, issues) VALUES (?, ?, '
+                'COALESCE((SELECT issues FROM sync_state WHERE scope = ?), 0) + ?)',
+                (jql, started, jql, count)
+            )
+        return count
+
+    def info(self) -> Dict[str, Any]:
+        """
+        Summarize the store contents.
+
+        Returns:
+            Dictionary with path, issue/comment/link counts and per-scope sync state
+        """
+        with self._lock:
+            counts = {
+                table: self._conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                for table in ('issues', 'comments', 'links')
+            }
+            scopes = self._conn.execute(
+                'SELECT scope, last_sync, issues FROM sync_state ORDER BY scope'
+            ).fetchall()
+        return dict(counts, path=self.path, scopes=[
+            {'jql': scope, 'last_sync': last_sync, 'issues': issues} for scope, last_sync, issues in scopes
+        ])
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
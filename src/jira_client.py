@@ -1,65 +1,694 @@
 """
 Jira API client for fetching ticket information.
 """
+import threading
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Dict, List, Any, Iterator, Optional, Tuple, Union
 import requests
-from typing import Dict, List, Any, Optional
 from requests.auth import HTTPBasicAuth
 from src.config import Config
+from src.http_transport import HTTPTransport
+from src.concurrency import run_concurrently, map_ordered
+
+if TYPE_CHECKING:
+    from src.issue_store import IssueStore
+
+
+# Fields requested in lean mode; everything the analysis output uses
+LEAN_FIELDS = [
+    'summary', 'description', 'status', 'priority', 'assignee', 'reporter',
+    'created', 'updated', 'issuetype', 'issuelinks'
+]
+
+# Named sets of extra fields that can be added to the lean projection
+FIELD_SETS = {
+    'planning': ['labels', 'components', 'fixVersions', 'parent', 'duedate'],
+    'qa': ['environment', 'labels', 'components', 'versions'],
+    'people': ['creator', 'watches']
+}
+
+# Fields requested for linked tickets found while crawling the link graph;
+# the last level drops 'issuelinks' since its links are not followed.
+CRAWL_FIELDS = ['summary', 'status', 'issuetype', 'priority', 'issuelinks']
 
 
 class JiraClient:
     """Client for interacting with Jira API."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        transport: Optional[HTTPTransport] = None,
+        lean: bool = False,
+        field_sets: Optional[List[str]] = None,
+        extra_fields: Optional[List[str]] = None,
+        include_full_data: Optional[bool] = None,
+        comments_since: Optional[Union[datetime, str]] = None,
+        max_comments: Optional[int] = None,
+        store: Optional['IssueStore'] = None
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            transport: Shared HTTP transport (a new one is created if omitted)
+            lean: Request only LEAN_FIELDS (plus extras) instead of every field
+            field_sets: Names of extra field sets to request in lean mode
+                (built-in FIELD_SETS plus any defined in JIRA_FIELD_SETS)
+            extra_fields: Additional individual field IDs to request in lean mode
+            include_full_data: Keep the raw issue as 'full_data' in analysis
+                data (default: only outside lean mode)
+            comments_since: Only keep comments created at or after this time
+                in analysis data (datetime or ISO 8601 string)
+            max_comments: Only keep the newest N comments in analysis data
+            store: Local issue store to read issues and comments from before
+                asking Jira (see sync_issues.py)
+        """
+        self.transport = transport or HTTPTransport()
+        self.lean = lean or bool(field_sets) or bool(extra_fields)
+        self.extra_fields = self.resolve_extra_fields(field_sets, extra_fields)
+        self.fields = LEAN_FIELDS + [f for f in self.extra_fields if f not in LEAN_FIELDS] if self.lean else None
+        self.include_full_data = (not self.lean) if include_full_data is None else include_full_data
+        self.comments_since = self.parse_datetime(comments_since) if comments_since else None
+        self.max_comments = max_comments
+        self.store = store
         self.base_url = Config.JIRA_URL.rstrip('/')
         self.auth = HTTPBasicAuth(Config.JIRA_EMAIL, Config.JIRA_API_TOKEN)
         self.headers = {
             'Accept': 'application/json',
             'Content-Type': 'application/json'
         }
+        # Per-run identity map so each issue is downloaded at most once
+        self._issues: Dict[str, Dict[str, Any]] = {}
+        self._issue_versions: Dict[str, Optional[str]] = {}
+        self._issue_locks: Dict[str, threading.Lock] = {}
+        self._issues_lock = threading.Lock()
+
+    @staticmethod
+    def resolve_extra_fields(
+        field_sets: Optional[List[str]] = None,
+        extra_fields: Optional[List[str]] = None
+    ) -> List[str]:
+        """
+        Expand named field sets and individual fields into a field ID list.
+
+        Args:
+            field_sets: Names of field sets (built-in or from JIRA_FIELD_SETS)
+            extra_fields: Individual field IDs
+
+        Returns:
+            Deduplicated list of field IDs, in request order
+
+        Raises:
+            ValueError: If a field set name is unknown
+        """
+        available = dict(FIELD_SETS)
+        available.update(Config.jira_field_sets())
+
+        fields = []
+        for name in field_sets or []:
+            if name not in available:
+                raise ValueError(
+                    f"Unknown Jira field set '{name}'. Available: {', '.join(sorted(available))}"
+                )
+            fields.extend(available[name])
+        fields.extend(extra_fields or [])
+        return list(dict.fromkeys(fields))
 
-    def get_ticket(self, ticket_key: str) -> Dict[str, Any]:
+    def _issue_lock(self, ticket_key: str) -> threading.Lock:
+        """Get the lock that serializes fetches of one issue key."""
+        with self._issues_lock:
+            return self._issue_locks.setdefault(ticket_key, threading.Lock())
+
+    def get_ticket(self, ticket_key: str, refresh: bool = False) -> Dict[str, Any]:
         """
         Fetch a Jira ticket by its key.
 
+        Issues are memoized for the lifetime of the client, so repeated and
+        concurrent lookups of the same key share one download. In lean mode
+        only the configured field projection is requested.
+
         Args:
             ticket_key: Jira ticket key (e.g., PROJ-123)
+            refresh: Ignore the memoized issue and download it again
 
         Returns:
             Dictionary containing ticket information
         """
+        ticket_key = ticket_key.upper()
+        with self._issue_lock(ticket_key):
+            if not refresh and ticket_key in self._issues:
+                return self._issues[ticket_key]
+
+            if not refresh and self.store is not None:
+                ticket = self.store.get_issue(ticket_key)
+                if ticket is not None:
+                    self.remember_ticket(ticket, ticket_key)
+                    return ticket
+
+            url = f"{self.base_url}/rest/api/2/issue/{ticket_key}"
+            params = {'fields': ','.join(self.fields)} if self.fields else None
+            response = self.transport.get(
+                url, auth=self.auth, headers=self.headers, params=params,
+                version=lambda r: self._ticket_version(ticket_key, r)
+            )
+            response.raise_for_status()
+            ticket = response.json()
+            self.remember_ticket(ticket, ticket_key)
+            return ticket
+
+    def _ticket_version(self, ticket_key: str, response=None) -> Optional[str]:
+        """
+        Get the issue's ``updated`` timestamp, used to revalidate cached responses.
+
+        Called with a downloaded issue response, the timestamp is read from it.
+        Otherwise it is taken from the issue if it was already fetched this
+        run, and only probed (once per run) with a ``fields=updated`` request,
+        which is far smaller than the full issue, when it is not.
+
+        Args:
+            ticket_key: Jira ticket key
+            response: Optional downloaded issue response
+
+        Returns:
+            The issue's last update timestamp, or None if unknown
+        """
+        ticket_key = ticket_key.upper()
+        if response is not None and ticket_key not in self._issue_versions:
+            updated = response.json().get('fields', {}).get('updated')
+            with self._issues_lock:
+                self._issue_versions[ticket_key] = updated
+            return updated
+
+        with self._issues_lock:
+            if ticket_key in self._issue_versions:
+                return self._issue_versions[ticket_key]
+            updated = (self._issues.get(ticket_key) or {}).get('fields', {}).get('updated')
+            if updated:
+                self._issue_versions[ticket_key] = updated
+                return updated
+
         url = f"{self.base_url}/rest/api/2/issue/{ticket_key}"
-        response = requests.get(url, auth=self.auth, headers=self.headers)
+        response = self.transport.get(
+            url, auth=self.auth, headers=self.headers,
+            params={'fields': 'updated'}, cacheable=False
+        )
+        updated = response.json().get('fields', {}).get('updated') if response.ok else None
+        with self._issues_lock:
+            self._issue_versions[ticket_key] = updated
+        return updated
+
+    def remember_ticket(self, ticket: Dict[str, Any], ticket_key: Optional[str] = None):
+        """
+        Store an already-fetched issue in the per-run identity map.
+
+        Args:
+            ticket: Jira issue as returned by the REST API
+            ticket_key: Key the issue was requested by (may differ for moved issues)
+        """
+        with self._issues_lock:
+            for key in {ticket_key, ticket.get('key')}:
+                if key:
+                    self._issues[key.upper()] = ticket
+
+    def clear_ticket_cache(self):
+        """Forget all memoized issues so the next lookups hit Jira again."""
+        with self._issues_lock:
+            self._issues.clear()
+            self._issue_versions.clear()
+
+    def _get_search_page(self, params: Dict[str, Any], start_at: int) -> Dict[str, Any]:
+        """Fetch one page of JQL search results."""
+        response = self.transport.get(
+            f"{self.base_url}/rest/api/2/search", auth=self.auth, headers=self.headers,
+            params=dict(params, startAt=start_at)
+        )
         response.raise_for_status()
         return response.json()
 
-    def get_ticket_comments(self, ticket_key: str) -> List[Dict[str, Any]]:
+    def iter_search_issues(
+        self,
+        jql: str,
+        fields: Optional[List[str]] = None,
+        expand: Optional[List[str]] = None,
+        with_comments: bool = False,
+        page_size: int = 100,
+        max_results: Optional[int] = None,
+        concurrent: bool = False,
+        max_workers: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
         """
-        Fetch all comments for a Jira ticket.
+        Stream the issues matching a JQL query, page by page.
+
+        The first page reports the total number of matches; the remaining
+        pages are then requested directly by offset (in parallel, with
+        bounded look-ahead, when ``concurrent`` is set) and yielded in order.
 
         Args:
-            ticket_key: Jira ticket key
+            jql: JQL query
+            fields: Field IDs to return (default: the client's projection, or all fields)
+            expand: Expansions to request, e.g. ['changelog']
+            with_comments: Also return each issue's comments in ``fields.comment``
+            page_size: Number of issues requested per page
+            max_results: Stop after this many issues
+            concurrent: Fetch the remaining pages in parallel
+            max_workers: Maximum number of parallel page fetches (default: Config.FETCH_MAX_WORKERS)
+
+        Yields:
+            Issue dictionaries
+        """
+        fields = list(fields or self.fields or ['*all'])
+        if with_comments and 'comment' not in fields and '*all' not in fields:
+            fields.append('comment')
+        if max_results is not None:
+            page_size = max(1, min(page_size, max_results))
+        params = {
+            'jql': jql,
+            'fields': ','.join(fields),
+            'maxResults': page_size,
+            'validateQuery': 'warn'
+        }
+        if expand:
+            params['expand'] = ','.join(expand)
+
+        first = self._get_search_page(params, 0)
+        issues = first.get('issues', [])
+        total = first.get('total', len(issues))
+        if max_results is not None:
+            total = min(total, max_results)
+        yield from issues[:total]
+        if not issues or len(issues) >= total:
+            return
+
+        # Servers may cap maxResults below the requested page size
+        page_size = len(issues)
+        pages = map_ordered(
+            lambda start_at: self._get_search_page(dict(params, maxResults=page_size), start_at),
+            range(page_size, total, page_size), max_workers=max_workers if concurrent else 1
+        )
+        yielded = page_size
+        for page in pages:
+            page_issues = page.get('issues', [])[:total - yielded]
+            yield from page_issues
+            yielded += len(page_issues)
+
+    def search_issues(
+        self,
+        jql: str,
+        fields: Optional[List[str]] = None,
+        page_size: int = 100,
+        concurrent: bool = False,
+        **kwargs: Any
+    ) -> List[Dict[str, Any]]:
+        """
+        Run a JQL search and collect every page of results.
+
+        Args:
+            jql: JQL query
+            fields: Field IDs to return (default: the client's projection, or all fields)
+            page_size: Number of issues requested per page
+            concurrent: Fetch pages in parallel once the total is known
+            **kwargs: Other options of iter_search_issues (expand, with_comments, max_results...)
+
+        Returns:
+            List of issue dictionaries
+        """
+        return list(self.iter_search_issues(
+            jql, fields=fields, page_size=page_size, concurrent=concurrent, **kwargs
+        ))
+
+    def get_tickets(
+        self,
+        ticket_keys: List[str],
+        batch_size: int = 100,
+        fields: Optional[List[str]] = None,
+        concurrent: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch many issues with batched ``key in (...)`` JQL searches.
+
+        Issues already in the per-run identity map are not fetched again, and
+        fetched issues are added to it unless a narrower ``fields`` projection
+        was requested. Moved issues are returned by the search under their
+        new key; when a search returns such unrequested keys, the requested
+        keys still missing are looked up one by one with get_ticket, which
+        follows the move, and mapped to the issue. Keys that do not exist or
+        are not visible are missing from the result.
+
+        Args:
+            ticket_keys: Jira ticket keys
+            batch_size: Maximum number of keys per JQL query
+            fields: Field IDs to request instead of the client's projection
+            concurrent: Run the batch queries in parallel
+
+        Returns:
+            Mapping of upper-cased ticket key to issue dictionary
+        """
+        keys = list(dict.fromkeys(key.upper() for key in ticket_keys))
+        with self._issues_lock:
+            found = {key: self._issues[key] for key in keys if key in self._issues}
+        missing = [key for key in keys if key not in found]
+
+        if self.store is not None:
+            for key in missing:
+                ticket = self.store.get_issue(key)
+                if ticket is not None:
+                    self.remember_ticket(ticket, key)
+                    found[key] = ticket
+            missing = [key for key in missing if key not in found]
+
+        batches = [missing[start:start + batch_size] for start in range(0, len(missing), batch_size)]
+        results = run_concurrently({
+            index: (lambda batch=batch: self.search_issues(
+                f"key in ({', '.join(batch)}) ORDER BY key", fields=fields, concurrent=concurrent
+            ))
+            for index, batch in enumerate(batches)
+        }, max_workers=None if concurrent else 1)
+        moved = False
+        for issues in results.values():
+            for issue in issues:
+                if fields is None:
+                    self.remember_ticket(issue)
+                moved |= issue['key'].upper() not in missing
+                found[issue['key'].upper()] = issue
+
+        leftovers = [key for key in missing if key not in found]
+        if moved and leftovers:
+            tickets = run_concurrently({
+                key: lambda key=key: self._get_ticket_if_exists(key) for key in leftovers
+            }, max_workers=None if concurrent else 1)
+            found.update({key: ticket for key, ticket in tickets.items() if ticket is not None})
+        return found
+
+    def _get_ticket_if_exists(self, ticket_key: str) -> Optional[Dict[str, Any]]:
+        """Fetch a ticket, or return None if it does not exist or is not visible."""
+        try:
+            return self.get_ticket(ticket_key)
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            raise
+
+    @staticmethod
+    def parse_datetime(value: Union[datetime, str]) -> datetime:
+        """
+        Parse a Jira timestamp or ISO 8601 string into an aware datetime.
+
+        Args:
+            value: datetime, Jira timestamp (2024-01-15T10:30:00.000+0000) or ISO date/time
 
         Returns:
-            List of comment dictionaries
+            Timezone-aware datetime (naive values are taken as UTC)
         """
+        if isinstance(value, str):
+            try:
+                value = datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f%z')
+            except ValueError:
+                value = datetime.fromisoformat(value)
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+    def _get_comment_page(self, ticket_key: str, start_at: int, page_size: int) -> Dict[str, Any]:
+        """Fetch one page of a ticket's comments."""
         url = f"{self.base_url}/rest/api/2/issue/{ticket_key}/comment"
-        response = requests.get(url, auth=self.auth, headers=self.headers)
+        response = self.transport.get(
+            url, auth=self.auth, headers=self.headers,
+            params={'startAt': start_at, 'maxResults': page_size},
+            version=lambda r: self._ticket_version(ticket_key)
+        )
         response.raise_for_status()
-        data = response.json()
-        return data.get('comments', [])
+        return response.json()
+
+    def iter_ticket_comments(
+        self,
+        ticket_key: str,
+        since: Optional[Union[datetime, str]] = None,
+        newest: Optional[int] = None,
+        page_size: int = 100,
+        concurrent: bool = False,
+        max_workers: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream a ticket's comments, oldest first, page by page.
+
+        The first page reports the total number of comments; the remaining
+        pages are then requested directly (in parallel when ``concurrent`` is
+        set) and yielded in order. With ``newest`` only the pages holding the
+        last N comments are downloaded.
+
+        Args:
+            ticket_key: Jira ticket key
+            since: Only yield comments created at or after this time
+            newest: Only yield the newest N comments
+            page_size: Number of comments requested per page
+            concurrent: Fetch the remaining pages in parallel
+            max_workers: Maximum number of parallel page fetches (default: Config.FETCH_MAX_WORKERS)
 
-    def get_linked_tickets(self, ticket_key: str) -> List[Dict[str, Any]]:
+        Yields:
+            Comment dictionaries
+        """
+        since = self.parse_datetime(since) if since is not None else None
+
+        first = self._get_comment_page(ticket_key, 0, page_size)
+        comments = first.get('comments', [])
+        total = first.get('total', len(comments))
+        # Servers may cap maxResults below the requested page size
+        page_size = len(comments) or page_size
+        first_wanted = max(0, total - newest) if newest is not None else 0
+
+        def wanted(page, offset):
+            for index, comment in enumerate(page, offset):
+                if index < first_wanted:
+                    continue
+                if since is not None and self.parse_datetime(comment['created']) < since:
+                    continue
+                yield comment
+
+        yield from wanted(comments, 0)
+        if not comments or len(comments) >= total or first_wanted >= total:
+            return
+
+        offsets = range(max(len(comments), first_wanted // page_size * page_size), total, page_size)
+        pages = map_ordered(
+            lambda offset: (offset, self._get_comment_page(ticket_key, offset, page_size)),
+            offsets, max_workers=max_workers if concurrent else 1
+        )
+        for offset, page in pages:
+            yield from wanted(page.get('comments', []), offset)
+
+    def get_ticket_comments(
+        self,
+        ticket_key: str,
+        since: Optional[Union[datetime, str]] = None,
+        newest: Optional[int] = None,
+        concurrent: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch all comments for a Jira ticket.
+
+        Args:
+            ticket_key: Jira ticket key
+            since: Only return comments created at or after this time
+            newest: Only return the newest N comments
+            concurrent: Fetch comment pages in parallel
+
+        Returns:
+            List of comment dictionaries, oldest first
+        """
+        stored = self.store.get_comments(ticket_key) if self.store is not None else None
+        if stored is None:
+            return list(self.iter_ticket_comments(ticket_key, since=since, newest=newest, concurrent=concurrent))
+
+        if since is not None:
+            since = self.parse_datetime(since)
+            stored = [c for c in stored if self.parse_datetime(c['created']) >= since]
+        if newest is not None:
+            stored = stored[max(0, len(stored) - newest):]
+        return stored
+
+    def get_linked_tickets(
+        self,
+        ticket_key: str,
+        ticket: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Fetch all linked tickets for a Jira ticket.
 
         Args:
             ticket_key: Jira ticket key
+            ticket: Already-fetched issue to read links from (skips the lookup)
+
+        Returns:
+            List of linked ticket information
+        """
+        if ticket is None:
+            ticket = self.get_ticket(ticket_key)
+        return self.parse_linked_tickets(ticket)
+
+    def crawl_link_graph(
+        self,
+        ticket_key: str,
+        max_depth: int = 2,
+        max_nodes: int = 50,
+        link_types: Optional[List[str]] = None,
+        level_fields: Optional[List[List[str]]] = None,
+        concurrent: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Walk the issue link graph breadth-first from a ticket.
+
+        Each level is fetched with one batched search (batches run in
+        parallel when ``concurrent`` is set). Visited keys are never fetched
+        twice, and the crawl stops at ``max_depth`` links from the root or
+        once ``max_nodes`` tickets have been collected.
+
+        Args:
+            ticket_key: Jira ticket key to start from
+            max_depth: Maximum number of links between the root and a ticket
+            max_nodes: Maximum number of tickets in the graph, root included
+            link_types: Only follow links whose type name or direction (e.g.
+                'Blocks', 'is blocked by', 'relates to') matches, case-insensitively
+            level_fields: Field IDs to request per depth, starting at depth 1;
+                the last entry is reused for deeper levels (default: CRAWL_FIELDS)
+            concurrent: Fetch each level's batches in parallel
+
+        Returns:
+            Dictionary with the root key, 'nodes' (key -> ticket summary with
+            its depth), deduplicated 'edges' (from, type, to) pointing in the
+            link's outward direction, and whether the crawl was 'truncated'
+        """
+        wanted_types = {t.strip().lower() for t in link_types} if link_types else None
+        root = self.get_ticket(ticket_key)
+        root_key = root['key']
+
+        nodes = {}
+        edges = {}
+        truncated = False
+        frontier = {root_key: root}
+        depth = 0
+
+        while frontier:
+            next_keys = []
+            for key, issue in frontier.items():
+                fields = issue.get('fields', {})
+                nodes[key] = {
+                    'key': key,
+                    'depth': depth,
+                    'summary': fields.get('summary', ''),
+                    'status': (fields.get('status') or {}).get('name', 'Unknown'),
+                    'issue_type': (fields.get('issuetype') or {}).get('name', 'Unknown'),
+                    'priority': (fields.get('priority') or {}).get('name', 'None')
+                }
+                if depth >= max_depth:
+                    continue
+                for link in self.parse_linked_tickets(issue):
+                    if wanted_types and not wanted_types & {
+                        link['type'].lower(), link['link_type'].lower()
+                    }:
+                        continue
+                    if link['direction'] == 'outward':
+                        edges[(key, link['outward'], link['key'])] = True
+                    else:
+                        edges[(link['key'], link['outward'], key)] = True
+                    if link['key'] not in nodes and link['key'] not in frontier and link['key'] not in next_keys:
+                        next_keys.append(link['key'])
+
+            depth += 1
+            room = max_nodes - len(nodes)
+            if len(next_keys) > room:
+                truncated = True
+                next_keys = next_keys[:max(room, 0)]
+            if not next_keys:
+                break
+
+            if level_fields:
+                fields = list(level_fields[min(depth, len(level_fields)) - 1])
+            else:
+                fields = list(CRAWL_FIELDS if depth < max_depth else CRAWL_FIELDS[:-1])
+            if depth < max_depth and 'issuelinks' not in fields:
+                fields.append('issuelinks')
+            fetched = self.get_tickets(next_keys, fields=fields, concurrent=concurrent)
+            frontier = {
+                fetched[key]['key']: fetched[key]
+                for key in next_keys
+                if key in fetched and fetched[key]['key'] not in nodes
+            }
+
+        # Edges to tickets dropped by the node limit are not part of the graph
+        return {
+            'root': root_key,
+            'nodes': nodes,
+            'edges': [
+                {'from': source, 'type': link_type, 'to': target}
+                for source, link_type, target in edges
+                if source in nodes and target in nodes
+            ],
+            'truncated': truncated
+        }
+
+    def get_remote_links(self, ticket_key: str) -> List[Dict[str, Any]]:
+        """
+        Fetch a ticket's remote links (web links, Confluence pages, MRs added by integrations).
+
+        Args:
+            ticket_key: Jira ticket key
+
+        Returns:
+            List of {'url', 'title'} dictionaries
+        """
+        url = f"{self.base_url}/rest/api/2/issue/{ticket_key}/remotelink"
+        response = self.transport.get(
+            url, auth=self.auth, headers=self.headers,
+            version=lambda r: self._ticket_version(ticket_key)
+        )
+        response.raise_for_status()
+        return [
+            {'url': link['object']['url'], 'title': link['object'].get('title', '')}
+            for link in response.json()
+            if (link.get('object') or {}).get('url')
+        ]
+
+    def get_development_merge_requests(self, issue_id: str) -> List[str]:
+        """
+        List the merge requests shown in a ticket's development panel.
+
+        Uses the dev-status endpoint for JIRA_DEV_STATUS_APPLICATION. Instances
+        without the integration answer 404, which yields an empty list.
+
+        Args:
+            issue_id: Numeric Jira issue ID (not the key)
+
+        Returns:
+            List of merge request URLs
+        """
+        if not Config.JIRA_DEV_STATUS_APPLICATION:
+            return []
+        url = f"{self.base_url}/rest/dev-status/latest/issue/detail"
+        params = {
+            'issueId': issue_id,
+            'applicationType': Config.JIRA_DEV_STATUS_APPLICATION,
+            'dataType': 'pullrequest'
+        }
+        response = self.transport.get(url, auth=self.auth, headers=self.headers, params=params)
+        if response.status_code in (400, 403, 404):
+            return []
+        response.raise_for_status()
+        return [
+            pull_request['url']
+            for detail in response.json().get('detail', [])
+            for pull_request in detail.get('pullRequests', [])
+            if pull_request.get('url')
+        ]
+
+    @staticmethod
+    def parse_linked_tickets(ticket: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Summarize the issue links embedded in a fetched ticket.
+
+        Args:
+            ticket: Jira issue as returned by the REST API
 
         Returns:
             List of linked ticket information
         """
-        ticket = self.get_ticket(ticket_key)
         issue_links = ticket.get('fields', {}).get('issuelinks', [])
 
         linked_tickets = []
@@ -68,6 +697,9 @@ class JiraClient:
                 linked_tickets.append({
                     'key': link['outwardIssue']['key'],
                     'type': link['type']['outward'],
+                    'link_type': link['type'].get('name', ''),
+                    'outward': link['type']['outward'],
+                    'direction': 'outward',
                     'summary': link['outwardIssue']['fields']['summary'],
                     'status': link['outwardIssue']['fields']['status']['name']
                 })
@@ -75,6 +707,9 @@ class JiraClient:
                 linked_tickets.append({
                     'key': link['inwardIssue']['key'],
                     'type': link['type']['inward'],
+                    'link_type': link['type'].get('name', ''),
+                    'outward': link['type']['outward'],
+                    'direction': 'inward',
                     'summary': link['inwardIssue']['fields']['summary'],
                     'status': link['inwardIssue']['fields']['status']['name']
                 })
@@ -99,12 +734,13 @@ class JiraClient:
                 return parts[idx + 1].split('?')[0]
         return None
 
-    def get_ticket_analysis_data(self, ticket_url: str) -> Dict[str, Any]:
+    def get_ticket_analysis_data(self, ticket_url: str, concurrent: bool = False) -> Dict[str, Any]:
         """
         Get comprehensive ticket data for analysis.
 
         Args:
             ticket_url: URL to Jira ticket
+            concurrent: Fetch the ticket and its comments in parallel
 
         Returns:
             Dictionary with ticket, comments, and linked tickets data
@@ -113,22 +749,240 @@ class JiraClient:
         if not ticket_key:
             raise ValueError(f"Could not extract ticket key from URL: {ticket_url}")
 
-        ticket = self.get_ticket(ticket_key)
-        comments = self.get_ticket_comments(ticket_key)
-        linked_tickets = self.get_linked_tickets(ticket_key)
+        results = run_concurrently({
+            'ticket': lambda: self.get_ticket(ticket_key),
+            'comments': lambda: self.get_ticket_comments(
+                ticket_key, since=self.comments_since, newest=self.max_comments, concurrent=concurrent
+            )
+        }, max_workers=None if concurrent else 1)
+        ticket = results['ticket']
+        comments = results['comments']
+        linked_tickets = self.get_linked_tickets(ticket_key, ticket=ticket)
+
+        return self.build_ticket_analysis_data(
+            ticket_key, ticket, comments, linked_tickets,
+            extra_fields=self.extra_fields,
+            include_full_data=self.include_full_data
+        )
+
+    def _get_comments_for(self, ticket_keys: List[str], concurrent: bool = False) -> Dict[str, Any]:
+        """
+        Fetch the comments of many tickets, applying the client's comment limits.
+
+        Args:
+            ticket_keys: Jira ticket keys
+            concurrent: Fetch the tickets' comments in parallel
+
+        Returns:
+            Mapping of ticket key to its comment list, or to the exception
+            raised while fetching it
+        """
+        def fetch_comments(ticket_key):
+            try:
+                return self.get_ticket_comments(
+                    ticket_key, since=self.comments_since, newest=self.max_comments, concurrent=concurrent
+                )
+            except Exception as e:
+                return e
+
+        return run_concurrently(
+            {key: (lambda k=key: fetch_comments(k)) for key in ticket_keys},
+            max_workers=None if concurrent else 1
+        )
+
+    def get_tickets_analysis_data(
+        self,
+        ticket_urls: List[str],
+        concurrent: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Get analysis data for many tickets using one batched search.
+
+        Issues are fetched with get_tickets; their comments are then fetched
+        in parallel when ``concurrent`` is set.
+
+        Args:
+            ticket_urls: URLs to Jira tickets
+            concurrent: Fetch the comments of all tickets in parallel
+
+        Returns:
+            List of analysis dictionaries in input order; tickets that could
+            not be fetched are returned as {'error': ..., 'url': ...} entries
+        """
+        keys = [(url, self.extract_ticket_key_from_url(url)) for url in ticket_urls]
+        tickets = self.get_tickets([key for _, key in keys if key])
+        comments = self._get_comments_for(list(tickets), concurrent)
+
+        results = []
+        for url, ticket_key in keys:
+            if not ticket_key:
+                results.append({'error': f"Could not extract ticket key from URL: {url}", 'url': url})
+                continue
+            ticket = tickets.get(ticket_key.upper())
+            if ticket is None:
+                results.append({'error': f"Ticket {ticket_key} does not exist or is not accessible", 'url': url})
+                continue
+            ticket_comments = comments[ticket_key.upper()]
+            if isinstance(ticket_comments, Exception):
+                results.append({'error': str(ticket_comments), 'url': url})
+                continue
+            results.append(self.build_ticket_analysis_data(
+                ticket_key, ticket, ticket_comments, self.parse_linked_tickets(ticket),
+                extra_fields=self.extra_fields,
+                include_full_data=self.include_full_data
+            ))
+        return results
+
+    def get_child_issues(
+        self,
+        ticket_key: str,
+        max_depth: int = 2,
+        max_children: int = 200,
+        concurrent: bool = False
+    ) -> Tuple[List[Tuple[Dict[str, Any], int]], bool]:
+        """
+        List an issue's children (epic issues, then their subtasks) level by level.
+
+        Each level is one paginated ``parent in (...)`` JQL search; the first
+        level also matches the classic epic link field (JIRA_EPIC_LINK_FIELD).
+
+        Args:
+            ticket_key: Key of the epic or parent issue
+            max_depth: Number of child levels to expand (1: children, 2: plus their subtasks)
+            max_children: Maximum number of child issues returned
+            concurrent: Run the batch queries of a level in parallel
+
+        Returns:
+            Tuple of ([(issue, depth), ...], whether max_children cut the list)
+        """
+        fields = list(dict.fromkeys((self.fields or LEAN_FIELDS) + ['parent']))
+        seen = {ticket_key.upper()}
+        parents = [ticket_key.upper()]
+        children = []
+        depth = 1
+
+        while parents and depth <= max_depth:
+            batches = [parents[start:start + 100] for start in range(0, len(parents), 100)]
+
+            def children_jql(batch, depth=depth):
+                keys = ', '.join(batch)
+                jql = f"parent in ({keys})"
+                if depth == 1 and Config.JIRA_EPIC_LINK_FIELD:
+                    jql += f' OR "{Config.JIRA_EPIC_LINK_FIELD}" in ({keys})'
+                return f"{jql} ORDER BY key"
+
+            results = run_concurrently({
+                index: (lambda batch=batch: self.search_issues(
+                    children_jql(batch), fields=fields, concurrent=concurrent
+                ))
+                for index, batch in enumerate(batches)
+            }, max_workers=None if concurrent else 1)
+
+            parents = []
+            for issues in results.values():
+                for issue in issues:
+                    if issue['key'].upper() in seen:
+                        continue
+                    if len(children) >= max_children:
+                        return children, True
+                    seen.add(issue['key'].upper())
+                    children.append((issue, depth))
+                    parents.append(issue['key'].upper())
+            depth += 1
+
+        return children, False
+
+    def get_children_analysis_data(
+        self,
+        ticket_key: str,
+        max_depth: int = 2,
+        max_children: int = 200,
+        concurrent: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Get analysis data for every child of an epic or parent issue.
+
+        Children are listed with get_child_issues and their comments are
+        fetched in parallel when ``concurrent`` is set.
+
+        Args:
+            ticket_key: Key of the epic or parent issue
+            max_depth: Number of child levels to expand
+            max_children: Maximum number of child issues included
+            concurrent: Fetch searches and comments in parallel
+
+        Returns:
+            Dictionary with the parent key, 'children' (ticket analysis data
+            plus 'parent' and 'depth'; {'error', 'ticket_key'} entries for
+            failed comment fetches) and whether the list was 'truncated'
+        """
+        issues, truncated = self.get_child_issues(ticket_key, max_depth, max_children, concurrent)
+        comments = self._get_comments_for([issue['key'] for issue, _ in issues], concurrent)
+
+        children = []
+        for issue, depth in issues:
+            parent = (issue.get('fields', {}).get('parent') or {}).get('key') or ticket_key.upper()
+            issue_comments = comments[issue['key']]
+            if isinstance(issue_comments, Exception):
+                children.append({'error': str(issue_comments), 'ticket_key': issue['key'],
+                                 'parent': parent, 'depth': depth})
+                continue
+            child = self.build_ticket_analysis_data(
+                issue['key'], issue, issue_comments, self.parse_linked_tickets(issue),
+                extra_fields=self.extra_fields, include_full_data=False
+            )
+            child['parent'] = parent
+            child['depth'] = depth
+            children.append(child)
 
         return {
+            'ticket_key': ticket_key.upper(),
+            'children': children,
+            'truncated': truncated
+        }
+
+    @staticmethod
+    def build_ticket_analysis_data(
+        ticket_key: str,
+        ticket: Dict[str, Any],
+        comments: List[Dict[str, Any]],
+        linked_tickets: List[Dict[str, Any]],
+        extra_fields: Optional[List[str]] = None,
+        include_full_data: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Shape fetched ticket data into the analysis dictionary.
+
+        Args:
+            ticket_key: Jira ticket key
+            ticket: Jira issue as returned by the REST API
+            comments: List of comment dictionaries
+            linked_tickets: List of linked ticket information
+            extra_fields: Field IDs to copy into 'extra_fields'
+            include_full_data: Keep the raw issue as 'full_data'
+
+        Returns:
+            Dictionary with ticket, comments, and linked tickets data
+        """
+        fields = ticket['fields']
+        data = {
             'ticket_key': ticket_key,
-            'summary': ticket['fields'].get('summary', ''),
-            'description': ticket['fields'].get('description', ''),
-            'status': ticket['fields'].get('status', {}).get('name', ''),
-            'priority': ticket['fields'].get('priority', {}).get('name', ''),
-            'assignee': ticket['fields'].get('assignee', {}).get('displayName', 'Unassigned'),
-            'reporter': ticket['fields'].get('reporter', {}).get('displayName', 'Unknown'),
-            'created': ticket['fields'].get('created', ''),
-            'updated': ticket['fields'].get('updated', ''),
-            'issue_type': ticket['fields'].get('issuetype', {}).get('name', ''),
+            'summary': fields.get('summary', ''),
+            'description': fields.get('description', ''),
+            'status': (fields.get('status') or {}).get('name', ''),
+            'priority': (fields.get('priority') or {}).get('name', ''),
+            'assignee': (fields.get('assignee') or {}).get('displayName', 'Unassigned'),
+            'reporter': (fields.get('reporter') or {}).get('displayName', 'Unknown'),
+            'created': fields.get('created', ''),
+            'updated': fields.get('updated', ''),
+            'issue_type': (fields.get('issuetype') or {}).get('name', ''),
             'comments': comments,
-            'linked_tickets': linked_tickets,
-            'full_data': ticket
+            'linked_tickets': linked_tickets
         }
+        if extra_fields:
+            data['extra_fields'] = {
+                name: fields[name] for name in extra_fields if fields.get(name) not in (None, '', [])
+            }
+        if include_full_data:
+            data['full_data'] = ticket
+        return data
@@ -0,0 +1,103 @@
+"""
+Persistent record of the last analysis of each merge request, for incremental re-analysis.
+"""
+import json
+import os
+import threading
+import time
+from typing import Dict, Any, Optional
+from src.config import Config
+from src import sqlite_util
+
+
+class MergeRequestStateStore:
+    """
+    SQLite table of the last analysis data fetched for each merge request.
+
+    Each row keeps the MR's head SHA and ``updated_at`` (its version), the
+    newest note timestamp seen and the full analysis data, so the next run
+    only needs what changed since then.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the store, creating the database if needed.
+
+        Args:
+            path: SQLite database path (default: <QA_CACHE_DIR>/mr_state.sqlite3)
+        """
+        self.path = path or os.path.join(Config.QA_CACHE_DIR, 'mr_state.sqlite3')
+        self._lock = threading.Lock()
+
+        self._conn = sqlite_util.connect(self.path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS merge_requests (
+                project TEXT NOT NULL,
+                iid TEXT NOT NULL,
+                head_sha TEXT,
+                updated_at TEXT,
+                last_note_at TEXT,
+                analyzed_at REAL NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (project, iid)
+            )
+            """
+        )
+
+    def get(self, project_path: str, mr_iid: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the last analysis of a merge request.
+
+        Args:
+            project_path: GitLab project path
+            mr_iid: Merge request IID
+
+        Returns:
+            Dictionary with 'head_sha', 'updated_at', 'last_note_at', 'analyzed_at'
+            and 'data', or None if the MR was never analyzed
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT head_sha, updated_at, last_note_at, analyzed_at, data '
+                'FROM merge_requests WHERE project = ? AND iid = ?',
+                (project_path, str(mr_iid))
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'head_sha': row[0],
+            'updated_at': row[1],
+            'last_note_at': row[2],
+            'analyzed_at': row[3],
+            'data': json.loads(row[4])
+        }
+
+    def save(self, project_path: str, mr_iid: str, data: Dict[str, Any]):
+        """
+        Record the analysis data of a merge request.
+
+        Args:
+            project_path: GitLab project path
+            mr_iid: Merge request IID
+            data: MR analysis data (see GitLabClient.build_merge_request_analysis_data)
+        """
+        mr = data.get('full_data') or {}
+        note_times = [
+            note.get('updated_at') or note.get('created_at') or ''
+            for discussion in data.get('discussions', [])
+            for note in discussion.get('notes', [])
+        ]
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO merge_requests '
+                '(project, iid, head_sha, updated_at, last_note_at, analyzed_at, data) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (project_path, str(mr_iid), mr.get('sha'), mr.get('updated_at'),
+                 max(note_times, default=None) or None, time.time(), json.dumps(data))
+            )
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,97 @@
+"""
+Persistent cache of finished GitLab pipeline summaries keyed by pipeline ID.
+"""
+import json
+import os
+import threading
+import time
+from typing import Dict, Any, Optional
+from src.config import Config
+from src import sqlite_util
+
+
+# Pipeline statuses that no longer change unless a job is retried (which bumps updated_at)
+FINISHED_PIPELINE_STATUSES = frozenset(['success', 'failed', 'canceled', 'skipped'])
+
+
+class PipelineCache:
+    """
+    SQLite table of pipeline summaries (jobs, test report, failing job log tails).
+
+    Only finished pipelines are stored. A finished pipeline does not change
+    again, except when one of its jobs is retried, which also changes its
+    ``updated_at``, so an entry is reused only while that timestamp matches.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the cache, creating the database if needed.
+
+        Args:
+            path: SQLite database path (default: <QA_CACHE_DIR>/pipelines.sqlite3)
+        """
+        self.path = path or os.path.join(Config.QA_CACHE_DIR, 'pipelines.sqlite3')
+        self._lock = threading.Lock()
+
+        self._conn = sqlite_util.connect(self.path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pipelines (
+                project TEXT NOT NULL,
+                pipeline_id INTEGER NOT NULL,
+                updated_at TEXT,
+                stored_at REAL NOT NULL,
+                summary TEXT NOT NULL,
+                PRIMARY KEY (project, pipeline_id)
+            )
+            """
+        )
+
+    def get(self, project_path: str, pipeline: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Look up the summary of a finished pipeline.
+
+        Args:
+            project_path: GitLab project path
+            pipeline: Pipeline as returned by the API (at least 'id', 'status' and 'updated_at')
+
+        Returns:
+            Pipeline summary, or None if not cached, not finished or retried since
+        """
+        if pipeline.get('status') not in FINISHED_PIPELINE_STATUSES:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT updated_at, summary FROM pipelines WHERE project = ? AND pipeline_id = ?',
+                (project_path, pipeline['id'])
+            ).fetchone()
+        if row is None or row[0] != pipeline.get('updated_at'):
+            return None
+        return json.loads(row[1])
+
+    def put(self, project_path: str, summary: Dict[str, Any]) -> bool:
+        """
+        Store a pipeline summary if the pipeline is finished.
+
+        Args:
+            project_path: GitLab project path
+            summary: Pipeline summary (see GitLabClient.get_pipeline_summary)
+
+        Returns:
+            Whether the summary was stored
+        """
+        pipeline = summary['pipeline']
+        if pipeline.get('status') not in FINISHED_PIPELINE_STATUSES:
+            return False
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO pipelines (project, pipeline_id, updated_at, stored_at, summary) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (project_path, pipeline['id'], pipeline.get('updated_at'), time.time(), json.dumps(summary))
+            )
+        return True
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,307 @@
+"""
+Persistent on-disk cache of API responses shared by all clients.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+from urllib.parse import urlencode
+from src.config import Config
+from src import sqlite_util
+
+# Request headers that change the response body, so they are part of the cache key
+KEY_HEADERS = frozenset(['accept', 'range'])
+
+
+@dataclass
+class CachedResponse:
+    """A response stored in the cache."""
+
+    key: str
+    source: str
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    created_at: float
+    expires_at: float
+    version: Optional[str] = None
+
+    @property
+    def is_fresh(self) -> bool:
+        """Whether the entry is still within its TTL."""
+        return time.time() < self.expires_at
+
+
+class ResponseCache:
+    """
+    SQLite-backed response cache with per-source TTLs and LRU eviction.
+
+    Entries are keyed by method + URL + query parameters. The database runs in
+    WAL mode with a busy timeout, so several CLI processes can read and write
+    the same cache concurrently. When the total body size exceeds the
+    configured cap, the least recently used entries are evicted.
+    """
+
+    # Modes controlling how the transport uses the cache
+    MODE_USE = 'use'                # read fresh entries, revalidate stale ones, store misses
+    MODE_REVALIDATE = 'revalidate'  # revalidate every entry with a cheap probe before reuse
+    MODE_REFRESH = 'refresh'        # never read, store every response
+    MODE_BYPASS = 'bypass'          # neither read nor store
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        ttls: Optional[Dict[str, int]] = None
+    ):
+        """
+        Initialize the cache, creating the database if needed.
+
+        Args:
+            path: SQLite database path (default: <QA_CACHE_DIR>/responses.sqlite3)
+            max_bytes: Total body size cap in bytes (default: CACHE_MAX_MB)
+            ttls: Mapping of source name to TTL in seconds (default: CACHE_TTL_* settings)
+        """
+        self.path = path or os.path.join(Config.QA_CACHE_DIR, 'responses.sqlite3')
+        self.max_bytes = max_bytes if max_bytes is not None else Config.CACHE_MAX_MB * 1024 * 1024
+        self.ttls = dict(Config.cache_ttls())
+        if ttls:
+            self.ttls.update(ttls)
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stores': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+
+        self._conn = sqlite_util.connect(self.path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                method TEXT NOT NULL,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                version TEXT
+            )
+            """
+        )
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(responses)')}
+        if 'version' not in columns:
+            try:
+                self._conn.execute('ALTER TABLE responses ADD COLUMN version TEXT')
+            except sqlite3.OperationalError:
+                pass  # another process added it concurrently
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_source ON responses (source)')
+
+    @staticmethod
+    def make_key(
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> str:
+        """
+        Build the cache key for a request.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            params: Query parameters (order-independent)
+            headers: Request headers; only those in KEY_HEADERS are part of the key
+
+        Returns:
+            Hex digest identifying the request
+        """
+        query = urlencode(sorted((params or {}).items()), doseq=True)
+        key = f"{method.upper()} {url}?{query}"
+        varying = sorted(
+            (name.lower(), str(value)) for name, value in (headers or {}).items() if name.lower() in KEY_HEADERS
+        )
+        if varying:
+            key += ' ' + urlencode(varying)
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def ttl_for(self, source: str) -> int:
+        """Return the TTL in seconds configured for a source."""
+        return self.ttls.get(source, 0)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Look up an entry, fresh or stale, and mark it as recently used.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached response, or None if the key is not cached
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT key, source, url, status, headers, body, created_at, expires_at, version '
+                'FROM responses WHERE key = ?',
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (time.time(), key))
+
+        return CachedResponse(
+            key=row[0], source=row[1], url=row[2], status=row[3],
+            headers=json.loads(row[4]), body=bytes(row[5]),
+            created_at=row[6], expires_at=row[7], version=row[8]
+        )
+
+    def record(self, outcome: str):
+        """
+        Count a lookup outcome in this process's statistics.
+
+        Args:
+            outcome: 'hits' or 'misses'
+        """
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def set(
+        self,
+        key: str,
+        source: str,
+        method: str,
+        url: str,
+        status: int,
+        headers: Dict[str, str],
+        body: bytes,
+        ttl: Optional[int] = None,
+        version: Optional[str] = None
+    ):
+        """
+        Store a response and evict least recently used entries over the size cap.
+
+        Args:
+            key: Cache key from make_key
+            source: Source name (jira, gitlab, confluence, testrail)
+            method: HTTP method
+            url: Request URL
+            status: HTTP status code
+            headers: Response headers
+            body: Raw response body
+            ttl: TTL in seconds (default: the source's configured TTL)
+            version: Server-side version of the resource, used to revalidate the entry later
+        """
+        ttl = self.ttl_for(source) if ttl is None else ttl
+        if ttl <= 0 or len(body) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses '
+                '(key, source, method, url, status, headers, body, size, created_at, expires_at, accessed_at, version) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, source, method.upper(), url, status, json.dumps(dict(headers)),
+                 sqlite3.Binary(body), len(body), now, now + ttl, now, version)
+            )
+            self.stats['stores'] += 1
+            self._evict()
+
+    def renew(self, key: str, source: str):
+        """
+        Restart the TTL of an entry that was revalidated as unchanged.
+
+        Args:
+            key: Cache key from make_key
+            source: Source name, used to look up the TTL
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'UPDATE responses SET expires_at = ?, accessed_at = ? WHERE key = ?',
+                (now + self.ttl_for(source), now, key)
+            )
+            self.stats['revalidated'] += 1
+
+    def _evict(self):
+        """Delete least recently used entries until the total size fits the cap."""
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            for key, size in self._conn.execute(
+                'SELECT key, size FROM responses ORDER BY accessed_at ASC'
+            ).fetchall():
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                total -= size
+                self.stats['evictions'] += 1
+            self._conn.execute('COMMIT')
+        except Exception:
+            self._conn.execute('ROLLBACK')
+            raise
+
+    def invalidate_source(self, source: str):
+        """
+        Drop every entry of a source (used after writes to that API).
+
+        Args:
+            source: Source name
+        """
+        with self._lock:
+            self._conn.execute('DELETE FROM responses WHERE source = ?', (source,))
+
+    def clear(self):
+        """Delete all cached entries."""
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.execute('VACUUM')
+
+    def info(self) -> Dict[str, Any]:
+        """
+        Summarize the cache contents.
+
+        Returns:
+            Dictionary with path, size cap, totals and per-source counts
+        """
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT source, COUNT(*), COALESCE(SUM(size), 0), SUM(expires_at > ?) '
+                'FROM responses GROUP BY source ORDER BY source',
+                (now,)
+            ).fetchall()
+        sources = {
+            source: {'entries': count, 'bytes': size, 'fresh': fresh or 0}
+            for source, count, size, fresh in rows
+        }
+        return {
+            'path': self.path,
+            'max_bytes': self.max_bytes,
+            'entries': sum(s['entries'] for s in sources.values()),
+            'bytes': sum(s['bytes'] for s in sources.values()),
+            'ttls': self.ttls,
+            'sources': sources
+        }
+
+    def format_stats(self) -> str:
+        """Return a one-line summary of this process's hit/miss statistics."""
+        lookups = self.stats['hits'] + self.stats['misses']
+        rate = (self.stats['hits'] / lookups * 100) if lookups else 0.0
+        return (
+            f"Cache: {self.stats['hits']} hits, {self.stats['misses']} misses "
+            f"({rate:.0f}% hit rate), {self.stats['revalidated']} revalidated, {self.stats['stores']} stored, "
+            f"{self.stats['evictions']} evicted"
+        )
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
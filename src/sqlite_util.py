@@ -0,0 +1,36 @@
+"""
+Shared connection setup for the local SQLite stores.
+"""
+import os
+import sqlite3
+import time
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """
+    Open (creating if needed) a SQLite database in WAL mode, tolerating other processes opening it at the same time.
+
+    Args:
+        path: Database file path; its directory is created if missing
+
+    Returns:
+        Autocommit SQLite connection usable from multiple threads
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+    conn.execute('PRAGMA busy_timeout=30000')
+    # Switching to WAL needs a brief exclusive lock that the busy handler
+    # does not cover, so retry while another process holds the database
+    # (e.g. a cron sync_issues.py run and a CLI run starting together).
+    for attempt in range(50):
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            break
+        except sqlite3.OperationalError:
+            if attempt == 49:
+                raise
+            time.sleep(0.1)
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
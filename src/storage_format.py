@@ -0,0 +1,383 @@
+"""
+Single-pass conversion of Confluence storage format (XHTML with macros) to compact Markdown.
+"""
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+
+# Maximum number of characters of Markdown produced for one page
+MAX_CONTENT_CHARS = 200_000
+
+# Input is fed to the parser in slices of this many characters, so parsing
+# can stop early once the output budget is used up
+FEED_CHUNK_CHARS = 64 * 1024
+
+# Maximum number of characters kept per table cell
+MAX_CELL_CHARS = 2000
+
+# Macros that only lay out or generate content (tables of contents, child page lists...)
+DROPPED_MACROS = frozenset([
+    'anchor', 'attachments', 'blog-posts', 'children', 'contentbylabel', 'content-report-table',
+    'gallery', 'include', 'excerpt-include', 'jirachart', 'livesearch', 'pagetree', 'pagetreesearch',
+    'profile', 'recently-updated', 'roadmap', 'space-details', 'toc', 'view-file', 'viewfile', 'widget'
+])
+
+# Macros whose plain-text body is rendered as a code block
+CODE_MACROS = frozenset(['code', 'noformat'])
+
+# Macros rendered as a labelled paragraph
+ADMONITION_MACROS = frozenset(['info', 'note', 'tip', 'warning'])
+
+# Elements dropped with their content
+DROPPED_ELEMENTS = frozenset([
+    'script', 'style', 'head', 'ac:image', 'ac:emoticon', 'ac:placeholder', 'ac:task-id', 'ac:inline-comment-marker-ref'
+])
+
+# Elements that start and end a paragraph
+BLOCK_ELEMENTS = frozenset([
+    'p', 'div', 'section', 'blockquote', 'hr', 'ac:layout-section', 'ac:layout-cell', 'ac:rich-text-body'
+])
+
+# Elements that never have an end tag in HTML
+VOID_ELEMENTS = frozenset(['br', 'hr', 'img', 'col', 'input', 'meta', 'link', 'wbr'])
+
+WHITESPACE = re.compile(r'\s+')
+
+
+class StorageFormatConverter(HTMLParser):
+    """
+    Incremental converter from Confluence storage format to Markdown.
+
+    Feed the page in pieces with ``feed`` and call ``close``, then read
+    ``text``. No document tree is built. The parser only keeps the stack of
+    open elements and the current table row, and writes everything else to
+    the output as soon as it is parsed. Output stops at ``max_chars``.
+
+    Headings, lists, task lists, tables and code blocks are kept as
+    Markdown. Layout and generated-content macros and macro parameters are
+    dropped, and inline formatting is reduced to its text.
+    """
+
+    def __init__(self, max_chars: Optional[int] = None):
+        """
+        Initialize the converter.
+
+        Args:
+            max_chars: Maximum number of output characters (default: no limit)
+        """
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.truncated = False
+        self._out: List[str] = []
+        self._size = 0
+        self._pending_breaks = 0
+        self._at_line_start = True
+        self._after_prefix = False
+        self._stack: List[Tuple[str, Optional[str]]] = []
+        self._skip_depth = 0
+        self._pre_depth = 0
+        self._lists: List[List] = []
+        self._table_depth = 0
+        self._row: Optional[List[str]] = None
+        self._rows = 0
+        self._cell: Optional[List[str]] = None
+        self._macros: List[Dict] = []
+        self._links: List[Dict] = []
+        self._capture: Optional[List[str]] = None
+
+    @property
+    def text(self) -> str:
+        """Return the Markdown produced so far."""
+        text = ''.join(self._out).strip()
+        return f"{text}\n[... truncated]" if self.truncated else text
+
+    def _emit(self, text: str):
+        """Append text to the output, within the size budget."""
+        if self.truncated or not text:
+            return
+        if self.max_chars is not None and self._size + len(text) > self.max_chars:
+            text = text[:self.max_chars - self._size]
+            self.truncated = True
+        self._out.append(text)
+        self._size += len(text)
+        self._at_line_start = text.endswith('\n')
+
+    def _break(self, lines: int = 2):
+        """Request a line break (1) or paragraph break (2) before the next text."""
+        if self._cell is not None:
+            self._cell.append(' ')
+        elif not self._after_prefix:
+            # Paragraphs inside list items stay on the item's lines
+            self._pending_breaks = max(self._pending_breaks, 1 if self._lists else lines)
+
+    def _flush_breaks(self, lines: int):
+        """Write the newlines of a break (none at the start of the output)."""
+        if self._size:
+            self._emit('\n' * max(0, lines - (1 if self._at_line_start else 0)))
+        self._pending_breaks = 0
+
+    def _write(self, text: str, raw: bool = False):
+        """
+        Write text, applying pending breaks, list indentation and whitespace collapsing.
+
+        Args:
+            text: Text to write
+            raw: Keep whitespace as is (code blocks)
+        """
+        if self._capture is not None:
+            self._capture.append(text)
+            return
+        if not raw:
+            text = WHITESPACE.sub(' ', text.replace('\xa0', ' '))
+        if self._cell is not None:
+            if sum(map(len, self._cell)) < MAX_CELL_CHARS:
+                self._cell.append(text)
+            return
+        if self._pending_breaks:
+            if not text.strip():
+                return
+            self._flush_breaks(self._pending_breaks)
+            self._emit('  ' * len(self._lists))
+            text = text.lstrip() if not raw else text
+        elif not raw and (self._at_line_start or (self._out and self._out[-1].endswith(' '))):
+            text = text.lstrip(' ')
+        if text.strip():
+            self._after_prefix = False
+        self._emit(text)
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        if tag not in VOID_ELEMENTS:
+            self._stack.append((tag, None))
+        if self._skip_depth:
+            if tag not in VOID_ELEMENTS:
+                self._skip_depth += 1
+            return
+        attributes = dict(attrs)
+
+        if tag in DROPPED_ELEMENTS:
+            self._skip_depth = 1
+        elif tag == 'ac:structured-macro' or tag == 'ac:macro':
+            name = (attributes.get('ac:name') or '').lower()
+            self._macros.append({'name': name, 'params': {}})
+            if name in DROPPED_MACROS:
+                self._skip_depth = 1
+            elif name in ADMONITION_MACROS:
+                self._break()
+                self._write_line_prefix(f"{name.capitalize()}: ", 2)
+        elif tag == 'ac:parameter':
+            # Parameters are kept for the macros rendered from them (code language, status...)
+            self._capture = []
+            self._stack[-1] = (tag, (attributes.get('ac:name') or '').lower())
+        elif tag == 'ac:plain-text-body':
+            self._stack[-1] = (tag, 'body')
+        elif tag in ('ac:task-status', 'ri:page', 'ri:attachment', 'ri:user', 'ri:space', 'ri:blog-post'):
+            if tag == 'ac:task-status':
+                self._capture = []
+            elif self._links:
+                self._links[-1]['title'] = (
+                    attributes.get('ri:content-title') or attributes.get('ri:filename') or attributes.get('ri:space-key')
+                )
+        elif tag == 'ac:link':
+            self._links.append({'title': None, 'has_body': False})
+        elif tag in ('ac:plain-text-link-body', 'ac:link-body'):
+            if self._links:
+                self._links[-1]['has_body'] = True
+        elif tag in ('h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
+            self._break()
+            self._write_line_prefix('#' * int(tag[1]) + ' ', 2)
+        elif tag in ('ul', 'ol', 'ac:task-list'):
+            self._break(1 if self._lists else 2)
+            self._lists.append([tag, 0, ''])
+        elif tag in ('li', 'ac:task'):
+            if self._cell is not None:
+                if ''.join(self._cell).strip():
+                    self._cell.append('; ')
+            elif self._lists:
+                self._lists[-1][1] += 1
+                if tag == 'li':
+                    ordered = self._lists[-1][0] == 'ol'
+                    self._write_list_marker(f"{self._lists[-1][1]}. " if ordered else '- ')
+        elif tag == 'ac:task-body':
+            self._write_list_marker('- [x] ' if self._lists and self._lists[-1][2] == 'complete' else '- [ ] ')
+        elif tag == 'table':
+            self._table_depth += 1
+            if self._table_depth == 1 and self._cell is None:
+                self._break()
+                self._rows = 0
+        elif tag == 'tr' and self._table_depth == 1:
+            self._row = []
+        elif tag in ('td', 'th') and self._table_depth == 1 and self._row is not None:
+            self._cell = []
+        elif tag == 'pre' or (tag == 'code' and self._pre_depth):
+            self._start_code_block('')
+        elif tag == 'code':
+            self._write('`')
+        elif tag == 'br':
+            self._break(1)
+        elif tag == 'time' and attributes.get('datetime'):
+            self._write(attributes['datetime'])
+        elif tag in BLOCK_ELEMENTS:
+            self._break()
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str):
+        if not any(open_tag == tag for open_tag, _ in self._stack):
+            return  # stray end tag
+        while self._stack:
+            open_tag, role = self._stack.pop()
+            self._close(open_tag, role)
+            if open_tag == tag:
+                break
+
+    def _close(self, tag: str, role: Optional[str]):
+        """Finish an element."""
+        if self._skip_depth:
+            self._skip_depth -= 1
+            if tag in ('ac:structured-macro', 'ac:macro') and self._skip_depth == 0:
+                self._macros.pop()
+            return
+
+        if tag == 'ac:parameter':
+            value = ''.join(self._capture or [])[:200].strip()
+            self._capture = None
+            if self._macros:
+                self._macros[-1]['params'][role or ''] = value
+        elif tag == 'ac:task-status':
+            status = ''.join(self._capture or []).strip()
+            self._capture = None
+            if self._lists:
+                self._lists[-1][2] = status
+        elif tag in ('ac:structured-macro', 'ac:macro'):
+            macro = self._macros.pop() if self._macros else {'name': '', 'params': {}}
+            params = macro['params']
+            if macro['name'] == 'status' and params.get('title'):
+                self._write(f" [{params['title']}] ")
+            elif macro['name'] == 'jira' and params.get('key'):
+                self._write(f" {params['key']} ")
+            elif macro['name'] in ADMONITION_MACROS:
+                self._break()
+        elif tag == 'ac:link':
+            link = self._links.pop() if self._links else {}
+            if not link.get('has_body') and link.get('title'):
+                self._write(link['title'])
+        elif tag in ('h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
+            self._break()
+        elif tag in ('ul', 'ol', 'ac:task-list'):
+            if self._lists:
+                self._lists.pop()
+            self._break(1 if self._lists else 2)
+        elif tag == 'table':
+            self._table_depth -= 1
+            if self._table_depth == 0:
+                self._break()
+        elif tag == 'tr' and self._table_depth == 1 and self._row is not None:
+            self._write_row(self._row)
+            self._row = None
+        elif tag in ('td', 'th') and self._table_depth == 1 and self._cell is not None:
+            cell = WHITESPACE.sub(' ', ''.join(self._cell)).strip().replace('|', '\\|')
+            self._cell = None
+            if self._row is not None:
+                self._row.append(cell)
+        elif tag == 'pre' or (tag == 'code' and self._pre_depth > 1):
+            self._end_code_block()
+        elif tag == 'code' and not self._pre_depth:
+            self._write('`')
+        elif tag in BLOCK_ELEMENTS:
+            self._break()
+
+    def _write_list_marker(self, marker: str):
+        """Start a list item line."""
+        if self._cell is not None:
+            return
+        self._write_line_prefix('  ' * (len(self._lists) - 1) + marker, 1)
+
+    def _write_line_prefix(self, prefix: str, lines: int):
+        """Start a new line with a heading or list marker; breaks requested right after it are ignored."""
+        if self._cell is not None:
+            return
+        self._flush_breaks(max(lines, self._pending_breaks))
+        self._emit(prefix)
+        self._after_prefix = True
+
+    def _write_row(self, cells: List[str]):
+        """Write a Markdown table row, followed by the header separator after the first row."""
+        if not cells:
+            return
+        self._write('| ' + ' | '.join(cells) + ' |', raw=True)
+        if self._rows == 0:
+            self._emit('\n| ' + ' | '.join('---' for _ in cells) + ' |')
+        self._rows += 1
+        self._break(1)
+
+    def _start_code_block(self, language: str):
+        """Open a fenced code block (an inline code span inside a table cell)."""
+        self._pre_depth += 1
+        if self._pre_depth > 1:
+            return
+        if self._cell is not None:
+            self._cell.append('`')
+            return
+        self._break()
+        self._write(f"```{language}\n", raw=True)
+
+    def _end_code_block(self):
+        """Close a fenced code block."""
+        self._pre_depth -= 1
+        if self._pre_depth > 0:
+            return
+        if self._cell is not None:
+            self._cell.append('`')
+            return
+        self._emit('\n```' if not self._at_line_start else '```')
+        self._break()
+
+    def handle_data(self, data: str):
+        if self._skip_depth:
+            return
+        self._write(data, raw=bool(self._pre_depth))
+
+    def unknown_decl(self, data: str):
+        if self._skip_depth or not data.startswith('CDATA['):
+            return
+        text = data[len('CDATA['):]
+        role = self._stack[-1][1] if self._stack else None
+        if role != 'body':
+            self._write(text)
+            return
+        macro = self._macros[-1] if self._macros else {'name': '', 'params': {}}
+        if macro['name'] in CODE_MACROS or macro['name'] == '':
+            self._start_code_block(macro['params'].get('language', ''))
+            self._write(text.strip('\n'), raw=True)
+            self._end_code_block()
+        else:
+            self._write(text)
+
+
+def storage_to_markdown(storage: str, max_chars: Optional[int] = MAX_CONTENT_CHARS) -> str:
+    """
+    Convert a Confluence page body in storage format (or view HTML) to compact Markdown.
+
+    The body is parsed in slices and parsing stops as soon as the output
+    budget is used up, so the rest of a very large page is never parsed.
+    The body itself is already fully in memory (it comes from the page's
+    JSON response); only the output and the parser state are bounded.
+
+    Args:
+        storage: Storage format XHTML
+        max_chars: Maximum number of output characters (None: no limit)
+
+    Returns:
+        Markdown text, ending with "[... truncated]" if it was cut
+    """
+    converter = StorageFormatConverter(max_chars=max_chars)
+    for start in range(0, len(storage or ''), FEED_CHUNK_CHARS):
+        converter.feed(storage[start:start + FEED_CHUNK_CHARS])
+        if converter.truncated:
+            return converter.text
+    converter.close()
+    return converter.text
@@ -5,12 +5,20 @@ import requests
 from typing import Dict, List, Any, Optional
 from requests.auth import HTTPBasicAuth
 from src.config import Config
+from src.http_transport import HTTPTransport
 
 
 class TestRailClient:
     """Client for interacting with TestRail API."""
 
-    def __init__(self):
+    def __init__(self, transport: Optional[HTTPTransport] = None):
+        """
+        Initialize the client.
+
+        Args:
+            transport: Shared HTTP transport (a new one is created if omitted)
+        """
+        self.transport = transport or HTTPTransport()
         self.base_url = Config.TESTRAIL_URL.rstrip('/')
         self.email = Config.TESTRAIL_EMAIL
         self.api_key = Config.TESTRAIL_API_KEY
@@ -35,11 +43,11 @@ class TestRailClient:
 
         try:
             if method == 'GET':
-                response = requests.get(url, auth=self.auth, headers=self.headers)
+                response = self.transport.get(url, auth=self.auth, headers=self.headers)
             elif method == 'POST':
-                response = requests.post(url, auth=self.auth, headers=self.headers, json=data)
+                response = self.transport.post(url, auth=self.auth, headers=self.headers, json=data)
             elif method == 'UPDATE':
-                response = requests.post(url, auth=self.auth, headers=self.headers, json=data)
+                response = self.transport.post(url, auth=self.auth, headers=self.headers, json=data)
             else:
                 raise ValueError(f"Unsupported HTTP method: {method}")
 
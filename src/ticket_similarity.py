@@ -0,0 +1,205 @@
+"""
+TF-IDF "similar tickets" lookup over the local issue store.
+"""
+import math
+import os
+import re
+import tempfile
+from collections import Counter
+from typing import Dict, List, Any, Iterable, Optional
+import numpy as np
+from src.issue_store import IssueStore
+
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9_]+')
+
+# Common words that carry no signal in ticket text
+STOP_WORDS = frozenset(
+    'the and for are but not you all any can has have had was were will with this that from they '
+    'there their what when which who would should could into than then them these those been being '
+    'does did its our out about also just only some such very more most other over under after before '
+    'please thanks thank need needs like get got use used using see one two new now how why where'.split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lower-case word tokens, dropping stop words and single characters."""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+class TicketSimilarity:
+    """
+    Cosine similarity between tickets over sublinear TF-IDF vectors.
+
+    The index holds one L2-normalized weight per (ticket, term) pair, sorted
+    by term, so scoring a query only touches the postings of its own terms.
+    It is saved next to the issue store and rebuilt only when the store
+    changes.
+    """
+
+    def __init__(
+        self,
+        store: IssueStore,
+        min_df: int = 2,
+        max_df: float = 0.5,
+        summary_weight: int = 3,
+        index_path: Optional[str] = None
+    ):
+        """
+        Initialize the index, loading or building it from the store.
+
+        Args:
+            store: Issue store to index
+            min_df: Ignore terms found in fewer tickets than this
+            max_df: Ignore terms found in more than this fraction of tickets
+            summary_weight: How many times the summary counts relative to the body
+            index_path: Saved index path (default: next to the store database)
+        """
+        self.store = store
+        self.min_df = min_df
+        self.max_df = max_df
+        self.summary_weight = summary_weight
+        self.index_path = index_path or f"{os.path.splitext(store.path)[0]}.tfidf.npz"
+        self._load_or_build()
+
+    def _load_or_build(self):
+        """Load the saved index if it matches the store, otherwise rebuild and save it."""
+        signature = f"{self.store.signature()}:{self.min_df}:{self.max_df}:{self.summary_weight}"
+        if os.path.exists(self.index_path):
+            try:
+                with np.load(self.index_path, allow_pickle=False) as saved:
+                    if str(saved['signature']) == signature:
+                        self.keys = saved['keys'].tolist()
+                        self.terms = {term: i for i, term in enumerate(saved['terms'].tolist())}
+                        self.idf = saved['idf']
+                        self.term_ptr = saved['term_ptr']
+                        self.doc_ids = saved['doc_ids']
+                        self.weights = saved['weights']
+                        return
+            except (OSError, KeyError, ValueError):
+                pass  # unreadable or outdated index; rebuild it
+
+        self._build(self.store.documents())
+        # A unique temporary file per writer, so concurrent runs never write
+        # into the same file; the last complete index wins the rename
+        tmp = tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(self.index_path) or '.', prefix='.similarity-', suffix='.npz', delete=False
+        )
+        try:
+            with tmp:
+                np.savez(
+                    tmp, signature=np.array(signature), keys=np.array(self.keys, dtype=str),
+                    terms=np.array(sorted(self.terms, key=self.terms.get), dtype=str), idf=self.idf,
+                    term_ptr=self.term_ptr, doc_ids=self.doc_ids, weights=self.weights
+                )
+            os.replace(tmp.name, self.index_path)
+        finally:
+            if os.path.exists(tmp.name):
+                os.unlink(tmp.name)
+
+    def _build(self, documents: Iterable[tuple]):
+        """
+        Build the TF-IDF postings from (key, summary, body) documents.
+
+        Args:
+            documents: Iterable of (ticket key, summary, body text) tuples
+        """
+        self.keys = []
+        counts = []
+        df = Counter()
+        for key, summary, body in documents:
+            tokens = Counter(tokenize(body))
+            for token in tokenize(summary):
+                tokens[token] += self.summary_weight
+            self.keys.append(key)
+            counts.append(tokens)
+            df.update(tokens.keys())
+
+        doc_count = len(self.keys)
+        max_df = max(self.min_df, int(self.max_df * doc_count))
+        vocabulary = sorted(term for term, freq in df.items() if self.min_df <= freq <= max_df)
+        self.terms = {term: i for i, term in enumerate(vocabulary)}
+        self.idf = np.array(
+            [math.log((1 + doc_count) / (1 + df[term])) + 1 for term in vocabulary], dtype=np.float32
+        )
+
+        doc_ids, term_ids, tfs = [], [], []
+        for doc_id, tokens in enumerate(counts):
+            for token, count in tokens.items():
+                term_id = self.terms.get(token)
+                if term_id is not None:
+                    doc_ids.append(doc_id)
+                    term_ids.append(term_id)
+                    tfs.append(count)
+
+        doc_ids = np.array(doc_ids, dtype=np.int32)
+        term_ids = np.array(term_ids, dtype=np.int32)
+        weights = (1 + np.log(np.array(tfs, dtype=np.float32))) * self.idf[term_ids]
+        norms = np.sqrt(np.bincount(doc_ids, weights=weights ** 2, minlength=doc_count))
+        weights /= np.where(norms > 0, norms, 1)[doc_ids]
+
+        order = np.argsort(term_ids, kind='stable')
+        self.doc_ids = doc_ids[order]
+        self.weights = weights[order].astype(np.float32)
+        self.term_ptr = np.searchsorted(term_ids[order], np.arange(len(vocabulary) + 1)).astype(np.int64)
+
+    def similar_to_text(
+        self,
+        summary: str,
+        body: str = '',
+        top_k: int = 5,
+        exclude: Iterable[str] = ()
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the stored tickets most similar to a piece of ticket text.
+
+        Args:
+            summary: Ticket summary (weighted like stored summaries)
+            body: Description and comment text
+            top_k: Number of tickets to return
+            exclude: Ticket keys to leave out (e.g. the ticket itself)
+
+        Returns:
+            List of {'ticket_key', 'score'} dictionaries, most similar first
+        """
+        tokens = Counter(tokenize(body))
+        for token in tokenize(summary):
+            tokens[token] += self.summary_weight
+        query = {self.terms[t]: c for t, c in tokens.items() if t in self.terms}
+        if not query or not self.keys:
+            return []
+
+        term_ids = np.fromiter(query.keys(), dtype=np.int64)
+        query_weights = (1 + np.log(np.fromiter(query.values(), dtype=np.float32))) * self.idf[term_ids]
+        query_weights /= np.linalg.norm(query_weights)
+
+        scores = np.zeros(len(self.keys), dtype=np.float32)
+        for term_id, query_weight in zip(term_ids, query_weights):
+            start, end = self.term_ptr[term_id], self.term_ptr[term_id + 1]
+            # Each document appears at most once per term, so plain indexing accumulates correctly
+            scores[self.doc_ids[start:end]] += self.weights[start:end] * query_weight
+
+        excluded = {key.upper() for key in exclude}
+        wanted = min(len(scores), top_k + len(excluded))
+        best = np.argpartition(-scores, wanted - 1)[:wanted]
+        best = best[np.argsort(-scores[best])]
+        return [
+            {'ticket_key': self.keys[i], 'score': float(scores[i])}
+            for i in best
+            if scores[i] > 0 and self.keys[i] not in excluded
+        ][:top_k]
+
+    def similar_to_ticket(self, ticket_key: str, top_k: int = 5) -> List[Dict[str, Any]]:
+        """
+        Find the stored tickets most similar to a stored ticket.
+
+        Args:
+            ticket_key: Key of a ticket in the store
+            top_k: Number of tickets to return
+
+        Returns:
+            List of {'ticket_key', 'score'} dictionaries, most similar first
+        """
+        for key, summary, body in self.store.documents([ticket_key]):
+            return self.similar_to_text(summary, body, top_k, exclude=[key])
+        return []
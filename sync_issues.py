@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Sync Jira issues into the local issue store.
+
+Only issues updated since the previous sync of the same JQL are fetched, so
+this is cheap to run from cron, e.g.:
+
+    */15 * * * * cd /path/to/qa-analysis-claude && python sync_issues.py --jql "project = PROJ"
+
+Analyses can then read tickets from the store with qa_analyze.py --from-store
+and add similar past tickets with --similar. The store can also be searched
+directly with --search and --similar.
+"""
+
+import argparse
+import sys
+import time
+from src.config import Config
+from src.jira_client import JiraClient
+from src.http_transport import HTTPTransport
+from src.issue_store import IssueStore
+from src.ticket_similarity import TicketSimilarity
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description='Sync Jira issues into the local issue store'
+    )
+
+    parser.add_argument(
+        '--jql',
+        action='append',
+        metavar='JQL',
+        help='JQL selecting the issues to keep in the store (repeatable)'
+    )
+
+    parser.add_argument(
+        '--full',
+        action='store_true',
+        help='Ignore the last sync time and fetch every matching issue'
+    )
+
+    parser.add_argument(
+        '--db',
+        help='Issue store path (default: ISSUE_STORE_PATH or <QA_CACHE_DIR>/issues.sqlite3)'
+    )
+
+    parser.add_argument(
+        '--info',
+        action='store_true',
+        help='Print a summary of the issue store and exit'
+    )
+
+    parser.add_argument(
+        '--search',
+        metavar='QUERY',
+        help='Full-text search the stored tickets (FTS5 syntax) and exit'
+    )
+
+    parser.add_argument(
+        '--similar',
+        metavar='KEY',
+        help='List the stored tickets most similar to KEY and exit'
+    )
+
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=10,
+        help='Number of results for --search and --similar (default: 10)'
+    )
+
+    args = parser.parse_args()
+    if not args.jql and not (args.info or args.search or args.similar):
+        parser.error('the following arguments are required: --jql')
+    return args
+
+
+def print_store_info(store: IssueStore):
+    """Print a summary of the issue store contents."""
+    info = store.info()
+    print(f"Issue store: {info['path']}")
+    print(f"Issues: {info['issues']}, comments: {info['comments']}, links: {info['links']}")
+    for scope in info['scopes']:
+        last_sync = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(scope['last_sync']))
+        print(f"  {scope['jql']}: last sync {last_sync}, {scope['issues']} issues synced in total")
+
+
+def main():
+    """Main execution function."""
+    args = parse_arguments()
+    store = IssueStore(args.db)
+
+    if args.info:
+        print_store_info(store)
+        return
+
+    if args.search:
+        try:
+            results = store.search(args.search, args.limit)
+        except ValueError as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            sys.exit(1)
+        for result in results:
+            print(f"{result['ticket_key']} [{result['status']}] {result['summary']}")
+            print(f"    {result['snippet']}")
+        return
+
+    if args.similar:
+        for result in TicketSimilarity(store).similar_to_ticket(args.similar, args.limit):
+            issue = store.get_issue(result['ticket_key'])
+            print(f"{result['score']:.2f}  {result['ticket_key']}  {issue['fields'].get('summary', '')}")
+        return
+
+    is_valid, missing = Config.validate()
+    if not is_valid:
+        print("ERROR: Missing required configuration values:", file=sys.stderr)
+        for field in missing:
+            print(f"  - {field}", file=sys.stderr)
+        sys.exit(1)
+
+    # Sync responses must not be served from the response cache
+    jira_client = JiraClient(transport=HTTPTransport())
+    failed = False
+    for jql in args.jql:
+        started = time.time()
+        try:
+            count = store.sync(jira_client, jql, full=args.full)
+        except Exception as e:
+            print(f"ERROR: Failed to sync '{jql}': {e}", file=sys.stderr)
+            failed = True
+            continue
+        print(f"Synced {count} issues for '{jql}' in {time.time() - started:.1f}s")
+
+    store.close()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
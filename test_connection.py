@@ -17,8 +17,7 @@ def test_jira():
     try:
         client = JiraClient()
         # Just test the connection by trying to access the API
-        import requests
-        response = requests.get(
+        response = client.transport.get(
             f"{client.base_url}/rest/api/2/myself",
             auth=client.auth,
             headers=client.headers
@@ -37,8 +36,7 @@ def test_gitlab():
     print("Testing GitLab connection...")
     try:
         client = GitLabClient()
-        import requests
-        response = requests.get(
+        response = client.transport.get(
             f"{client.base_url}/api/v4/user",
             headers=client.headers
         )
@@ -56,8 +54,7 @@ def test_confluence():
     print("Testing Confluence connection...")
     try:
         client = ConfluenceClient()
-        import requests
-        response = requests.get(
+        response = client.transport.get(
             f"{client.base_url}/rest/api/user/current",
             auth=client.auth,
             headers=client.headers
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Make the top-level src package importable when running plain `pytest`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
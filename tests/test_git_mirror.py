@@ -0,0 +1,160 @@
+"""
+Tests for GitMirror against a local bare repository.
+"""
+import subprocess
+
+import pytest
+
+from src import git_mirror
+from src.git_mirror import GitMirror
+
+FAKE_PATCH = (
+    "Apply with git am\n"
+    "\n"
+    "diff --git a/fake.py b/fake.py\n"
+    "--- a/fake.py\n"
+    "+++ b/fake.py\n"
+    "@@ -1 +1 @@\n"
+    "-old\n"
+    "+new\n"
+)
+RENAMED = ''.join(f"line {i}\n" for i in range(20))
+
+
+def git(cwd, *args) -> str:
+    result = subprocess.run(
+        ['git', '-c', 'user.name=QA', '-c', 'user.email=qa@example.com', '-c', 'init.defaultBranch=main']
+        + list(args),
+        cwd=cwd, capture_output=True, check=True
+    )
+    return result.stdout.decode('utf-8').strip()
+
+
+def commit(work, files, message) -> str:
+    for name, content in files.items():
+        path = work / name
+        if content is None:
+            git(work, 'rm', '-q', name)
+        elif isinstance(content, bytes):
+            path.write_bytes(content)
+        else:
+            path.write_text(content)
+    git(work, 'add', '-A')
+    git(work, 'commit', '-q', '-m', message)
+    return git(work, 'rev-parse', 'HEAD')
+
+
+@pytest.fixture
+def repo(tmp_path):
+    work = tmp_path / 'work'
+    work.mkdir()
+    git(work, 'init', '-q')
+    base = commit(work, {
+        'keep.py': "a = 1\nb = 2\n",
+        'old_name.py': RENAMED,
+        'gone.py': "removed\n",
+        'image.bin': b'\x00\x01\x02' * 100,
+        'notes.patch': FAKE_PATCH,
+        'zz_after.py': "first\n"
+    }, 'base')
+    head = commit(work, {
+        'keep.py': "a = 1\nb = 3\n",
+        'old_name.py': None,
+        'new_name.py': RENAMED + "line 20\n",
+        'gone.py': None,
+        'added.txt': "new file\n",
+        'image.bin': b'\x00\x03\x02' * 100,
+        'notes.patch': FAKE_PATCH + FAKE_PATCH.replace('fake.py', 'other.py'),
+        'zz_after.py': "second\n"
+    }, 'head')
+
+    remote = tmp_path / 'remote'
+    (remote / 'grp').mkdir(parents=True)
+    git(tmp_path, 'clone', '-q', '--bare', str(work), str(remote / 'grp' / 'proj.git'))
+    mirror = GitMirror(cache_dir=str(tmp_path / 'cache'), remote_url=str(remote), projects=[], token='')
+    return {'work': work, 'remote': remote, 'mirror': mirror, 'base': base, 'head': head}
+
+
+def expected_diff(repo, *paths) -> str:
+    """Hunks of `git diff` for the given paths, as the changes API returns them."""
+    patch = git(repo['work'], 'diff', '-M', repo['base'], repo['head'], '--', *paths) + '\n'
+    start = patch.find('\n@@')
+    return patch[start + 1:] if start >= 0 else ''
+
+
+def test_diff_has_changes_api_shape(repo):
+    mirror = repo['mirror']
+    mirror.sync('grp/proj', [repo['base'], repo['head']])
+    changes = {change['new_path']: change for change in mirror.diff('grp/proj', repo['base'], repo['head'])}
+
+    assert set(changes) == {'added.txt', 'gone.py', 'image.bin', 'keep.py', 'new_name.py', 'notes.patch', 'zz_after.py'}
+    for change in changes.values():
+        assert set(change) == {'old_path', 'new_path', 'new_file', 'deleted_file', 'renamed_file', 'diff'}
+
+    assert changes['new_name.py']['old_path'] == 'old_name.py'
+    assert changes['new_name.py']['renamed_file'] is True
+    assert changes['new_name.py']['diff'] == expected_diff(repo, 'old_name.py', 'new_name.py')
+    assert changes['new_name.py']['diff'].endswith('+line 20\n')
+
+    assert changes['gone.py']['deleted_file'] is True
+    assert changes['gone.py']['diff'] == '@@ -1 +0,0 @@\n-removed\n'
+    assert changes['added.txt']['new_file'] is True
+    assert changes['added.txt']['diff'] == '@@ -0,0 +1 @@\n+new file\n'
+    assert changes['image.bin']['diff'] == ''
+
+    assert changes['keep.py']['diff'] == expected_diff(repo, 'keep.py')
+    assert changes['keep.py']['new_file'] is False
+
+
+def test_diff_keeps_patch_file_contents_with_their_file(repo):
+    mirror = repo['mirror']
+    mirror.sync('grp/proj', [repo['base'], repo['head']])
+    changes = {change['new_path']: change for change in mirror.diff('grp/proj', repo['base'], repo['head'])}
+
+    assert '+diff --git a/other.py b/other.py\n' in changes['notes.patch']['diff']
+    assert changes['notes.patch']['diff'] == expected_diff(repo, 'notes.patch')
+    # The file after the .patch file still gets its own diff
+    assert changes['zz_after.py']['diff'] == '@@ -1 +1 @@\n-first\n+second\n'
+
+
+def test_diff_stats(repo):
+    mirror = repo['mirror']
+    mirror.sync('grp/proj', [repo['head']])
+
+    stats = mirror.diff_stats('grp/proj', repo['base'], repo['head'])
+
+    # Binary files count as changed files without lines
+    assert stats == {'files': 7, 'additions': 12, 'deletions': 3}
+
+
+def test_sync_fetches_missing_commits(repo):
+    mirror = repo['mirror']
+    git_dir = mirror.sync('grp/proj', [repo['head']])
+
+    newer = commit(repo['work'], {'keep.py': "a = 2\nb = 3\n"}, 'newer')
+    git(repo['work'], 'push', '-q', str(repo['remote'] / 'grp' / 'proj.git'), 'main')
+    assert not mirror._has_commit(git_dir, newer)
+
+    assert mirror.sync('grp/proj', [repo['head'], newer]) == git_dir
+    assert mirror._has_commit(git_dir, newer)
+    assert [c['new_path'] for c in mirror.diff('grp/proj', repo['head'], newer)] == ['keep.py']
+
+
+def test_token_is_not_passed_on_the_command_line(monkeypatch):
+    calls = []
+
+    def run(command, **kwargs):
+        calls.append((command, kwargs['env']))
+        return subprocess.CompletedProcess(command, 0, b'', b'')
+
+    monkeypatch.setattr(git_mirror.subprocess, 'run', run)
+    monkeypatch.delenv('GIT_CONFIG_COUNT', raising=False)
+    mirror = GitMirror(cache_dir='/nonexistent', remote_url='https://gitlab.example.com', token='s3cret')
+
+    mirror._git(['fetch', 'origin'], '/nonexistent/grp/proj.git', remote=True)
+
+    command, env = calls[0]
+    assert not any('s3cret' in arg or 'Authorization' in arg for arg in command)
+    assert env['GIT_CONFIG_COUNT'] == '1'
+    assert env['GIT_CONFIG_KEY_0'] == 'http.extraHeader'
+    assert env['GIT_CONFIG_VALUE_0'].startswith('Authorization: Basic ')
@@ -0,0 +1,164 @@
+"""
+Tests for incremental merge request re-analysis against a local fake GitLab API.
+"""
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import pytest
+
+from src.config import Config
+from src.gitlab_client import GitLabClient
+from src.http_transport import HTTPTransport
+from src.mr_state import MergeRequestStateStore
+
+
+class FakeGitLab(BaseHTTPRequestHandler):
+    """Serves one merge request (!3 of grp/proj) from the server's ``state``."""
+
+    def do_GET(self):
+        state = self.server.state
+        path = urlparse(self.path).path
+        state['requests'].append(path)
+        match = re.match(r'/api/v4/projects/[^/]+/(.*)$', path)
+        resource = match.group(1) if match else ''
+        mr = state['mr']
+        if resource == 'merge_requests/3':
+            return self.send(mr)
+        if resource == 'merge_requests/3/changes':
+            return self.send(dict(mr, changes=state['changes']))
+        if resource == 'merge_requests/3/commits':
+            return self.send(state['commits'])
+        if resource == 'merge_requests/3/discussions':
+            return self.send(state['discussions'])
+        if resource == 'merge_requests/3/notes':
+            return self.send([])
+        if resource == 'repository/compare':
+            return self.send(state['compare'])
+        self.send_response(404)
+        self.end_headers()
+
+    def send(self, body):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        if isinstance(body, list):
+            self.send_header('X-Total-Pages', '1')
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def change(path, diff, **flags):
+    return dict({'old_path': path, 'new_path': path, 'new_file': False, 'deleted_file': False,
+                 'renamed_file': False, 'diff': diff}, **flags)
+
+
+def commit(sha, *parents):
+    return {'id': sha, 'short_id': sha, 'title': f"commit {sha}", 'parent_ids': list(parents)}
+
+
+@pytest.fixture
+def gitlab(tmp_path, monkeypatch):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeGitLab)
+    server.state = {
+        'requests': [],
+        'mr': {'iid': 3, 'project_id': 100, 'title': 'Feature', 'sha': 'c1', 'updated_at': '2026-01-01T00:00:00Z',
+               'diff_refs': {'base_sha': 'base', 'start_sha': 'base', 'head_sha': 'c1'}},
+        'changes': [
+            change('a.py', '@@ -1 +1 @@\n-a = 1\n+a = 2\n'),
+            change('b.py', '@@ -1 +1 @@\n-b = 1\n+b = 2\n')
+        ],
+        'commits': [commit('c1', 'base')],
+        'discussions': [],
+        'compare': {'commits': [], 'diffs': []}
+    }
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(Config, 'GITLAB_URL', f"http://127.0.0.1:{server.server_port}")
+    store = MergeRequestStateStore(str(tmp_path / 'mr_state.sqlite3'))
+    client = GitLabClient(transport=HTTPTransport(), state_store=store)
+    yield client, server.state
+    server.shutdown()
+
+
+def push(state, sha, changes, compare_diffs, parents=None):
+    """Simulate a push: new head, MR changes against the base and the interdiff."""
+    previous = state['mr']['sha']
+    state['mr'] = dict(state['mr'], sha=sha, updated_at='2026-01-02T00:00:00Z',
+                       diff_refs=dict(state['mr']['diff_refs'], head_sha=sha))
+    state['commits'] = [commit(sha, *(parents or [previous]))] + state['commits']
+    state['changes'] = changes
+    state['compare'] = {'commits': [commit(sha, *(parents or [previous]))], 'diffs': compare_diffs}
+    state['requests'].clear()
+
+
+def test_fixup_push_replaces_touched_and_drops_reverted_files(gitlab):
+    client, state = gitlab
+    url = f"{Config.GITLAB_URL}/grp/proj/-/merge_requests/3"
+    client.get_merge_request_analysis_data(url)
+
+    # The fixup reverts a.py, changes b.py again and adds c.py
+    push(state, 'c2', [
+        change('b.py', '@@ -1 +1 @@\n-b = 1\n+b = 3\n'),
+        change('c.py', '@@ -0,0 +1 @@\n+c = 1\n', new_file=True)
+    ], [
+        change('a.py', '@@ -1 +1 @@\n-a = 2\n+a = 1\n'),
+        change('b.py', '@@ -1 +1 @@\n-b = 2\n+b = 3\n'),
+        change('c.py', '@@ -0,0 +1 @@\n+c = 1\n', new_file=True)
+    ])
+    data = client.get_merge_request_analysis_data(url)
+
+    assert {c['new_path']: c['diff'] for c in data['changes']} == {
+        'b.py': '@@ -1 +1 @@\n-b = 1\n+b = 3\n',
+        'c.py': '@@ -0,0 +1 @@\n+c = 1\n'
+    }
+    assert data['files_changed'] == 2
+    assert [c['id'] for c in data['commits']] == ['c2', 'c1']
+    assert data['since_last_analysis']['new_commits'] == ['c2']
+    assert data['since_last_analysis']['changed_files'] == ['a.py', 'b.py', 'c.py']
+    # Only the changes are fetched again, discussions stay incremental
+    assert not any(path.endswith('/discussions') for path in state['requests'])
+
+
+def test_push_of_new_files_only_appends_interdiff_and_keeps_stats(gitlab):
+    client, state = gitlab
+    previous = {
+        'head_sha': 'c1',
+        'updated_at': state['mr']['updated_at'],
+        'last_note_at': None,
+        'analyzed_at': 0,
+        'data': GitLabClient.build_merge_request_analysis_data(
+            state['mr'],
+            {'changes': state['changes'], 'files_total': 2, 'diff_stats': {'files': 2, 'additions': 2, 'deletions': 2}},
+            [], state['commits']
+        )
+    }
+    push(state, 'c2', [], [change('c.py', '@@ -0,0 +1,2 @@\n+c = 1\n+d = 2\n', new_file=True)])
+
+    data = client.update_merge_request_analysis_data('grp/proj', '3', previous)
+
+    assert [c['new_path'] for c in data['changes']] == ['a.py', 'b.py', 'c.py']
+    assert data['files_changed'] == 3
+    assert data['diff_stats'] == {'files': 3, 'additions': 4, 'deletions': 2}
+    assert not any(path.endswith('/changes') for path in state['requests'])
+
+
+def test_push_with_merge_commit_fetches_everything_again(gitlab):
+    client, state = gitlab
+    url = f"{Config.GITLAB_URL}/grp/proj/-/merge_requests/3"
+    client.get_merge_request_analysis_data(url)
+
+    # Merging the target branch brings its changes into the interdiff
+    push(state, 'm1', [change('b.py', '@@ -1 +1 @@\n-b = 1\n+b = 2\n')],
+         [change('upstream.py', '@@ -0,0 +1 @@\n+x\n', new_file=True)], parents=['c1', 'main'])
+    data = client.get_merge_request_analysis_data(url)
+
+    assert [c['new_path'] for c in data['changes']] == ['b.py']
+    assert 'since_last_analysis' not in data
+    assert any(path.endswith('/discussions') for path in state['requests'])